@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+SPECTER Audio Pipeline
+Script markdown → TTS clips → compiled timeline → mixed recording, as one
+build graph where only stale steps re-run.
+
+Usage:
+    python3 scripts/audio-pipeline.py [SCRIPT.md ...] [--voice ROLE=ID ...] [--plan] [--profile]
+
+With no scripts given, every scripts/audio/*-script.md is built. For each
+script the graph has three nodes:
+    <name>:tts       generate changed voice lines (one API call per changed line)
+    <name>:timeline  write scripts/audio/<name>.timeline.json from the script
+    <name>:mix       re-render the mix when the timeline or any clip changed
+
+Voice IDs are given per role (chen, elderly, young, ...) with --voice or
+ELEVENLABS_VOICE_<ROLE>; clips already generated remember the voice they
+were made with, so IDs are only needed for roles with new lines.
+--plan lists stale nodes without running anything; --profile profiles the
+build (see pipeline/telemetry.py).
+
+Requirements:
+    pip install requests numpy scipy pydub  (and ffmpeg on PATH)
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from pipeline import telemetry
+from pipeline.cache import AUDIO_CACHE_VERSION, Manifest, cache_key, file_hash
+from pipeline.dag import Graph, Node
+from pipeline.script_parser import find_scripts, parse_script, timeline_path
+from pipeline.tts import (
+    CLIPS_DIR,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RATE_PER_MINUTE,
+    MANIFEST_PATH,
+    clip_key,
+    generate_batch,
+    make_downloader,
+    voice_for,
+)
+
+
+def parse_voices(pairs):
+    voices = {
+        key[len("ELEVENLABS_VOICE_"):].lower(): value
+        for key, value in os.environ.items() if key.startswith("ELEVENLABS_VOICE_")
+    }
+    for pair in pairs:
+        role, _, voice_id = pair.partition("=")
+        if not voice_id:
+            raise SystemExit(f"--voice expects ROLE=ID, got {pair!r}")
+        voices[role.lower()] = voice_id
+    return voices
+
+
+def build_graph(script_paths, voices, args) -> Graph:
+    graph = Graph()
+    for script_path in script_paths:
+        parsed = parse_script(script_path)
+        name = parsed.name
+        compiled_path = timeline_path(parsed)
+        document = {"_generated_from": parsed.path.name, **parsed.timeline}
+        clip_paths = [CLIPS_DIR / job["filename"] for job in parsed.jobs]
+
+        def tts_fingerprint(jobs=parsed.jobs):
+            manifest = Manifest(MANIFEST_PATH)
+            return cache_key(clips=[clip_key(job, voice_for(job, voices, manifest) or "") for job in jobs])
+
+        def tts_run(jobs=parsed.jobs):
+            generated, cached, failed = generate_batch(make_downloader, jobs, voices, args.concurrency, args.rate)
+            if failed:
+                raise RuntimeError(f"{failed} clips failed")
+
+        def timeline_run(document=document, compiled_path=compiled_path):
+            text = json.dumps(document, indent=2, ensure_ascii=False) + "\n"
+            if not compiled_path.exists() or compiled_path.read_text() != text:
+                compiled_path.write_text(text)
+
+        def mix_fingerprint(document=document, clip_paths=clip_paths):
+            return cache_key(timeline=document, audio_version=AUDIO_CACHE_VERSION,
+                             clips={p.name: file_hash(p) if p.exists() else None for p in clip_paths})
+
+        def mix_run(compiled_path=compiled_path):
+            # Heavy imports (numpy, scipy, pydub) only when a mix actually runs
+            from pipeline.audio_cache import AudioCache
+            from pipeline.streaming import stream_timeline
+            from pipeline.timeline import ClipLoader, load_timeline
+
+            outputs, duration_ms = stream_timeline(load_timeline(compiled_path), ClipLoader(AudioCache()))
+            print(f"  ✓ Mixed {compiled_path.name}: {duration_ms / 1000:.1f}s → {len(outputs)} outputs")
+
+        outputs = [compiled_path.parent / output for output in parsed.timeline.get("outputs", [])]
+        graph.add(Node(f"{name}:tts", tts_fingerprint, tts_run, outputs=clip_paths))
+        graph.add(Node(f"{name}:timeline", lambda document=document: cache_key(timeline=document),
+                       timeline_run, outputs=[compiled_path]))
+        graph.add(Node(f"{name}:mix", mix_fingerprint, mix_run,
+                       deps=[f"{name}:tts", f"{name}:timeline"], outputs=outputs))
+    return graph
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build SPECTER audio from annotated scripts")
+    parser.add_argument("scripts", nargs="*", type=Path, help="script markdown files (default: all)")
+    parser.add_argument("--voice", action="append", default=[], metavar="ROLE=ID",
+                        help="ElevenLabs voice ID for a role, e.g. chen=abc123")
+    parser.add_argument("--plan", action="store_true", help="list stale nodes without running them")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"clips generated in parallel (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_PER_MINUTE,
+                        help=f"max TTS requests per minute (default: {DEFAULT_RATE_PER_MINUTE})")
+    parser.add_argument("--base-url", help="ElevenLabs-compatible API base URL, e.g. fake-services.py "
+                                           "(default: $ELEVENLABS_BASE_URL)")
+    parser.add_argument("--profile", action="store_true", help="profile the build")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    telemetry.start_run()
+    if args.base_url:
+        os.environ["ELEVENLABS_BASE_URL"] = args.base_url
+    script_paths = args.scripts or find_scripts()
+    voices = parse_voices(args.voice)
+
+    print("=" * 60)
+    print("SPECTER Audio Pipeline")
+    print("=" * 60)
+    print(f"Scripts: {', '.join(p.name for p in script_paths)}")
+    if args.plan:
+        print("Mode: plan (nothing will be run)")
+    print()
+
+    symbols = {"fresh": "·", "ran": "✓", "stale": "○", "failed": "✗", "blocked": "⏭"}
+
+    def on_status(name, result, error):
+        suffix = f": {error}" if error else ""
+        print(f"  {symbols[result]} {name} ({result}){suffix}")
+
+    graph = build_graph(script_paths, voices, args)
+    with telemetry.profile("build", args.profile and not args.plan):
+        status = graph.run(dry_run=args.plan, on_status=on_status)
+
+    counts = {}
+    for result in status.values():
+        counts[result] = counts.get(result, 0) + 1
+
+    print("\n" + "=" * 60)
+    print("PLAN" if args.plan else "PIPELINE COMPLETE")
+    print("=" * 60)
+    for result in ("ran", "stale", "fresh", "failed", "blocked"):
+        if counts.get(result):
+            print(f"{result.capitalize()}: {counts[result]}")
+
+    if counts.get("failed") or counts.get("blocked"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
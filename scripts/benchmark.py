@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+SPECTER Pipeline Benchmarks
+Times the asset pipeline stages on synthetic fixtures.
+
+Usage:
+    python3 scripts/benchmark.py [NAME ...] [--repeat N]
+    python3 scripts/benchmark.py --save-baseline      # record this machine's numbers
+    python3 scripts/benchmark.py --check              # exit 1 on a regression
+    python3 scripts/benchmark.py --list
+
+Benchmarks:
+    mix-small, mix-large  render + encode a timeline of generated voice-like
+                          clips (decode / effects / mix / encode stages)
+    bed-30min             stream 30 minutes of pink + hum ambient bed
+    stream-match          render a short timeline in memory and block by
+                          block; fails if the two differ
+    clips-load            decode mix-large's clips into the audio cache (cold),
+                          then open them again as memory maps (warm)
+    variants              responsive WebP/AVIF variants of synthetic PNGs
+    sync                  evidence fetch / plan / bulk upsert against an
+                          in-process fake Supabase (pipeline/fakes.py)
+    downloads             image generation + PNG download and TTS through
+                          Downloader.fetch against the fake services, with
+                          throttling so the retry path runs too
+    cli-status            `specter.py status` startup
+
+Each run happens in a fresh subprocess, so the reported peak RSS belongs to
+that benchmark alone; fixtures are generated once (untimed) under
+scripts/.cache/benchmarks/fixtures/. The best wall time of --repeat runs is
+kept. Results go to scripts/.cache/benchmarks/latest.json and are compared
+with the baseline (--baseline, default scripts/.cache/benchmarks/baseline.json);
+wall time or peak RSS more than --tolerance above it counts as a regression.
+Benchmarks whose packages are not installed are skipped.
+"""
+
+import argparse
+import importlib.util
+import json
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from pipeline.cache import CACHE_ROOT
+
+SCRIPTS_DIR = Path(__file__).parent
+RESULTS_DIR = CACHE_ROOT / "benchmarks"
+FIXTURES_DIR = RESULTS_DIR / "fixtures"
+BASELINE_PATH = RESULTS_DIR / "baseline.json"
+LATEST_PATH = RESULTS_DIR / "latest.json"
+
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25  # fraction above baseline that counts as a regression
+
+MIX_CASES = {
+    # name: (cue count, clip seconds)
+    "mix-small": (12, 4.0),
+    "mix-large": (96, 8.0),
+}
+STREAM_MATCH_CASE = (6, 2.0)
+STREAM_MATCH_BEDS = [{"generator": "hum"}, {"generator": "pink"}, {"generator": "static"}]
+STREAM_MATCH_TOLERANCE = 1e-5  # max absolute sample difference
+VARIANT_IMAGES = 6
+SYNC_CASES = 3
+SYNC_ROWS_PER_CASE = 200
+DOWNLOAD_FILES = 24
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_THROTTLE_RATE = 0.2  # fraction of fake requests answered with a 429
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Stages:
+    """Per-stage wall time and peak RSS for one benchmark run."""
+
+    def __init__(self):
+        self.stages = {}
+        self.metrics = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {"seconds": 0.0})
+            entry["seconds"] += time.perf_counter() - start
+            entry["peak_rss_mb"] = round(peak_rss_mb(), 1)
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, requires=(), setup=None):
+    def register(run):
+        BENCHMARKS[name] = {"run": run, "setup": setup, "requires": requires}
+        return run
+    return register
+
+
+def missing_packages(name: str):
+    return [module for module in BENCHMARKS[name]["requires"] if importlib.util.find_spec(module) is None]
+
+
+# --- audio -----------------------------------------------------------------
+
+def write_wav(path: Path, audio, sample_rate: int):
+    import wave
+
+    from pipeline.mixer import to_pcm16
+
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(audio.shape[1])
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(to_pcm16(audio).tobytes())
+
+
+def setup_mix(workdir: Path, cues: int, seconds: float, beds=None):
+    """Voice-like clips (harmonics under a syllable envelope) plus a timeline using them."""
+    from pipeline.mixer import SAMPLE_RATE, np
+
+    clips_dir = workdir / "clips"
+    clips_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(0)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    for i in range(cues):
+        f0 = 100 + 60 * rng.random()
+        voice = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+        envelope = np.clip(np.sin(2 * np.pi * (2 + 2 * rng.random()) * t), 0, None)
+        audio = 0.3 * voice * envelope + 0.01 * rng.standard_normal(n)
+        write_wav(clips_dir / f"clip_{i:03d}.wav", audio.astype(np.float32)[:, None], SAMPLE_RATE)
+
+    document = {
+        "name": workdir.name,
+        "clips_dir": "clips",
+        "outputs": ["out/mix.mp3"],
+        "beds": beds or [{"generator": "hum", "volume": -40}],
+        "cues": [],
+    }
+    for i in range(cues):
+        cue = {"clip": f"clip_{i:03d}.wav", "gap_ms": 250}
+        if i % 3 == 0:
+            cue["effects"] = [{"type": "convolution_reverb", "rt60_s": 1.5, "wet": 0.3}]
+        elif i % 3 == 1:
+            cue["effects"] = [{"type": "pitch_shift", "semitones": -3}, {"type": "saturate", "drive_db": 9}]
+        document["cues"].append(cue)
+    with open(workdir / "mix.timeline.json", "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def run_mix(workdir: Path, stages: Stages):
+    """The steps of streaming.stream_timeline, timed separately."""
+    from pipeline.mixer import db_to_gain, ms_to_samples, np
+    from pipeline.streaming import Encoder, iter_blocks, open_beds
+    from pipeline.timeline import ClipLoader, layout, load_timeline, prepare_cue
+
+    timeline = load_timeline(workdir / "mix.timeline.json")
+    with stages.stage("decode"):
+        placed, end = layout(timeline, ClipLoader())
+    with stages.stage("effects"):
+        cues = sorted(((prepare_cue(cue, source, key), ms_to_samples(start))
+                       for cue, source, key, start in placed), key=lambda c: c[1])
+
+    total = ms_to_samples(end)
+    with stages.stage("mix"):
+        peak = 0.0
+        for block in iter_blocks(cues, open_beds(timeline, end), total):
+            peak = max(peak, float(np.max(np.abs(block))))
+
+    if shutil.which("ffmpeg"):
+        gain = db_to_gain(-0.1) / peak if peak else 1.0
+        with stages.stage("encode"):
+            encoder = Encoder(timeline.outputs, "mp3", timeline.bitrate)
+            for block in iter_blocks(cues, open_beds(timeline, end), total, gain=gain):
+                encoder.write(block)
+            encoder.close()
+            stages.metrics["encoded_bytes"] = encoder.bytes_written
+    stages.metrics["audio_seconds"] = round(end / 1000, 1)
+
+
+for _name, (_cues, _seconds) in MIX_CASES.items():
+    benchmark(_name, requires=("numpy", "scipy", "pydub"),
+              setup=lambda workdir, c=_cues, s=_seconds: setup_mix(workdir, c, s))(run_mix)
+
+
+@benchmark("clips-load", requires=("numpy", "scipy", "pydub"),
+           setup=lambda workdir: setup_mix(workdir, *MIX_CASES["mix-large"]))
+def run_clips_load(workdir: Path, stages: Stages):
+    from pipeline.audio_cache import AudioCache
+    from pipeline.timeline import ClipLoader, layout, load_timeline
+
+    cache_dir = workdir / "audio-cache"
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    timeline = load_timeline(workdir / "mix.timeline.json")
+    with stages.stage("cold"):
+        layout(timeline, ClipLoader(AudioCache(cache_dir)))
+    with stages.stage("warm"):
+        placed, _ = layout(timeline, ClipLoader(AudioCache(cache_dir)))
+    stages.metrics["clips"] = len(placed)
+    stages.metrics["decoded_mb"] = round(sum(source.nbytes for _, source, _, _ in placed) / 1e6, 1)
+
+
+@benchmark("stream-match", requires=("numpy", "scipy", "pydub"),
+           setup=lambda workdir: setup_mix(workdir, *STREAM_MATCH_CASE, beds=STREAM_MATCH_BEDS))
+def run_stream_match(workdir: Path, stages: Stages):
+    """stream_timeline's blocks against render_timeline, beds at their default levels."""
+    from pipeline.mixer import db_to_gain, ms_to_samples, np
+    from pipeline.streaming import iter_blocks, open_beds
+    from pipeline.timeline import ClipLoader, layout, load_timeline, prepare_cue, render_timeline
+
+    timeline = load_timeline(workdir / "mix.timeline.json")
+    loader = ClipLoader()
+    with stages.stage("render"):
+        rendered = render_timeline(timeline, loader)
+    with stages.stage("stream"):
+        placed, end = layout(timeline, loader)
+        cues = sorted(((prepare_cue(cue, source, key), ms_to_samples(start))
+                       for cue, source, key, start in placed), key=lambda c: c[1])
+        total = ms_to_samples(end)
+        blocks = iter_blocks(cues, open_beds(timeline, end), total)
+        peak = max(float(np.max(np.abs(block))) for block in blocks)
+        streamed = np.concatenate(list(iter_blocks(cues, open_beds(timeline, end), total,
+                                                   gain=db_to_gain(-0.1) / peak)))
+
+    if streamed.shape != rendered.shape:
+        raise AssertionError(f"streamed {streamed.shape} samples, rendered {rendered.shape}")
+    difference = float(np.max(np.abs(streamed - rendered)))
+    stages.metrics["max_difference"] = difference
+    if difference > STREAM_MATCH_TOLERANCE:
+        raise AssertionError(f"streamed and rendered mixes differ by up to {difference:.2e}")
+
+
+@benchmark("bed-30min", requires=("numpy", "scipy"))
+def run_bed(workdir: Path, stages: Stages):
+    from pipeline.mixer import ms_to_samples
+    from pipeline.noise import HumNoise, PinkNoise
+    from pipeline.streaming import BLOCK_SAMPLES
+
+    beds = [PinkNoise(volume=-45, seed=1), HumNoise(volume=-40, mains_hz=60, seed=2)]
+    remaining = ms_to_samples(30 * 60 * 1000)
+    with stages.stage("generate"):
+        while remaining > 0:
+            n = min(BLOCK_SAMPLES, remaining)
+            block = beds[0].read(n)
+            for bed in beds[1:]:
+                block += bed.read(n)
+            remaining -= n
+
+
+# --- images ----------------------------------------------------------------
+
+def setup_variants(workdir: Path):
+    """Noisy gradient PNGs the size DALL-E returns."""
+    from PIL import Image
+
+    workdir.mkdir(parents=True, exist_ok=True)
+    size = (1024, 1024)
+    gradient = Image.linear_gradient("L").resize(size)
+    for i in range(VARIANT_IMAGES):
+        noise = Image.effect_noise(size, 40 + 10 * i)
+        Image.merge("RGB", (gradient, noise, gradient.rotate(90 * (i % 4)))).save(workdir / f"image-{i}.png")
+
+
+@benchmark("variants", requires=("PIL",), setup=setup_variants)
+def run_variants(workdir: Path, stages: Stages):
+    from pipeline.cache import file_hash
+    from pipeline.variants import build_variants, output_formats
+
+    formats = output_formats()
+    output_dir = workdir / "variants"
+    count = 0
+    for source in sorted(workdir.glob("*.png")):
+        with stages.stage("hash"):
+            source_hash = file_hash(source)
+        with stages.stage("encode"):
+            entry = build_variants(str(source), source_hash, formats, output_dir=str(output_dir))
+        count += sum(len(v) for v in entry["sources"].values())
+    stages.metrics["variants"] = count
+
+
+# --- database --------------------------------------------------------------
+
+@benchmark("sync", requires=("supabase",))
+def run_sync(workdir: Path, stages: Stages):
+    """update-evidence-images.py's fetch / plan / upsert against a fake Supabase."""
+    from supabase import create_client
+
+    from pipeline.evidence_sync import EVIDENCE_COLUMNS, compute_plan
+    from pipeline.fakes import FAKE_SERVICE_KEY, FakeServices
+
+    cases = [{"id": f"case-{c}", "case_number": f"{c:04d}"} for c in range(1, SYNC_CASES + 1)]
+    records = [
+        {"id": f"ev-{c}-{i}", "case_id": f"case-{c}", "type": "document", "title": f"Evidence {i}",
+         "sort_order": i, "image_url": None, "metadata": {"notes": "x" * 200}}
+        for c in range(1, SYNC_CASES + 1) for i in range(1, SYNC_ROWS_PER_CASE + 1)
+    ]
+    image_map = {(f"{c:04d}", f"EV-{i:03d}"): f"case{c}-ev{i}.png"
+                 for c in range(1, SYNC_CASES + 1) for i in range(1, SYNC_ROWS_PER_CASE + 1)}
+    image_meta = {"image": {"width": 1024, "height": 1024, "placeholder": "data:image/webp;base64," + "A" * 300}}
+
+    with FakeServices({"cases": cases, "evidence": records}) as fake:
+        client = create_client(fake.url, FAKE_SERVICE_KEY)
+        with stages.stage("fetch"):
+            fetched_cases = client.table("cases").select("id, case_number").execute().data
+            fetched = client.table("evidence").select(EVIDENCE_COLUMNS).execute().data
+        with stages.stage("plan"):
+            plan = compute_plan(fetched_cases, fetched, image_map, set(image_map.values()),
+                                lambda filename: image_meta, "/evidence")
+        with stages.stage("upsert"):
+            for changes in plan.by_case().values():
+                client.table("evidence").upsert([c.row() for c in changes], on_conflict="id").execute()
+        stages.metrics.update(rows=len(fetched), changed=len(plan.changes), **fake.stats)
+
+
+@benchmark("downloads", requires=("requests",))
+def run_downloads(workdir: Path, stages: Stages):
+    """The image and TTS download paths of the generate scripts against the fake services."""
+    from pipeline.downloads import Downloader
+    from pipeline.fakes import FAKE_API_KEY, Faults, FakeServices
+    from pipeline.ratelimit import with_retries
+
+    output_dir = workdir / "downloads"
+    shutil.rmtree(output_dir, ignore_errors=True)
+    faults = Faults(throttle_rate=DOWNLOAD_THROTTLE_RATE, retry_after=0.01, seed=1)
+    headers = {"Authorization": f"Bearer {FAKE_API_KEY}"}
+
+    with FakeServices(faults=faults) as fake, \
+            Downloader(pool_size=DOWNLOAD_WORKERS, headers=headers) as downloader, \
+            ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        def fetch(url, output, **kwargs):
+            return with_retries(lambda: downloader.fetch(url, output, **kwargs), base=0.01)
+
+        def image(i):
+            generation = fetch(f"{fake.url}/v1/images/generations", output_dir / f"image-{i}.json",
+                               method="POST", validate=False, operation="images.generate",
+                               json={"prompt": f"evidence {i}", "size": "256x256"})
+            url = json.loads(generation.read_text())["data"][0]["url"]
+            return fetch(url, output_dir / f"image-{i}.png", operation="image.download")
+
+        def speech(i):
+            return fetch(f"{fake.url}/v1/text-to-speech/fake-chen", output_dir / f"clip-{i}.mp3",
+                         method="POST", operation="text_to_speech.convert",
+                         json={"text": f"Evidence log entry {i}."})
+
+        with stages.stage("images"):
+            images = list(pool.map(image, range(DOWNLOAD_FILES)))
+        with stages.stage("speech"):
+            clips = list(pool.map(speech, range(DOWNLOAD_FILES)))
+        stages.metrics.update(files=len(images) + len(clips), throttled=fake.stats["throttled"],
+                              **downloader.stats)
+
+
+# --- CLI -------------------------------------------------------------------
+
+@benchmark("cli-status")
+def run_cli_status(workdir: Path, stages: Stages):
+    with stages.stage("startup"):
+        subprocess.run([sys.executable, str(SCRIPTS_DIR / "specter.py"), "status"],
+                       check=True, stdout=subprocess.DEVNULL)
+    stages.metrics["child_peak_rss_mb"] = round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1)
+
+
+# --- runner ----------------------------------------------------------------
+
+def child_main(mode: str, name: str, workdir: Path):
+    """Runs inside the per-benchmark subprocess; prints one JSON line."""
+    spec = BENCHMARKS[name]
+    if mode == "setup":
+        if spec["setup"]:
+            spec["setup"](workdir)
+        print(json.dumps({"ok": True}))
+        return
+    stages = Stages()
+    start = time.perf_counter()
+    spec["run"](workdir, stages)
+    wall = time.perf_counter() - start
+    print(json.dumps({
+        "wall_s": round(wall, 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "stages": {k: {"seconds": round(v["seconds"], 4), "peak_rss_mb": v["peak_rss_mb"]}
+                   for k, v in stages.stages.items()},
+        "metrics": stages.metrics,
+    }))
+
+
+def run_child(mode: str, name: str, workdir: Path) -> dict:
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), f"--{mode}", name, "--workdir", str(workdir)],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else f"exited with status {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(name: str, repeat: int) -> dict:
+    missing = missing_packages(name)
+    if missing:
+        return {"skipped": f"needs {', '.join(missing)}"}
+
+    workdir = FIXTURES_DIR / name
+    marker = workdir / ".ready"
+    if BENCHMARKS[name]["setup"] and not marker.exists():
+        shutil.rmtree(workdir, ignore_errors=True)
+        run_child("setup", name, workdir)
+        marker.touch()
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    runs = [run_child("run", name, workdir) for _ in range(max(1, repeat))]
+    best = min(runs, key=lambda r: r["wall_s"])
+    best["peak_rss_mb"] = max(r["peak_rss_mb"] for r in runs)
+    best["runs"] = [r["wall_s"] for r in runs]
+    return best
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """[(name, metric, baseline value, current value)] for metrics over tolerance."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "skipped" in result or "skipped" in base or "error" in result or "error" in base:
+            continue
+        for metric in ("wall_s", "peak_rss_mb"):
+            if base.get(metric) and result[metric] > base[metric] * (1 + tolerance):
+                regressions.append((name, metric, base[metric], result[metric]))
+    return regressions
+
+
+def print_results(results: dict, baseline: dict):
+    base_results = baseline.get("results", {})
+    print(f"{'benchmark':<12} {'wall':>9} {'Δ':>7} {'peak RSS':>10} {'Δ':>7}  stages")
+    for name, result in results.items():
+        if "skipped" in result or "error" in result:
+            print(f"{name:<12} {'-':>9} {'':>7} {'-':>10} {'':>7}  {result.get('skipped') or result['error']}")
+            continue
+        base = base_results.get(name, {})
+
+        def delta(metric):
+            if not base.get(metric):
+                return ""
+            return f"{(result[metric] / base[metric] - 1) * 100:+.0f}%"
+
+        stages = ", ".join(f"{k} {v['seconds']:.2f}s" for k, v in result["stages"].items())
+        print(f"{name:<12} {result['wall_s']:>8.3f}s {delta('wall_s'):>7} "
+              f"{result['peak_rss_mb']:>8.1f}MB {delta('peak_rss_mb'):>7}  {stages}")
+        if result.get("metrics"):
+            print(f"{'':<12} {', '.join(f'{k}={v}' for k, v in result['metrics'].items())}")
+
+
+def machine() -> dict:
+    return {"node": platform.node(), "python": platform.python_version(), "machine": platform.machine()}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the SPECTER asset pipeline")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"runs per benchmark; the fastest is kept (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed slowdown/growth over baseline (default: {DEFAULT_TOLERANCE * 100:.0f}%%)")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    parser.add_argument("--setup", metavar="NAME", help=argparse.SUPPRESS)
+    parser.add_argument("--run", metavar="NAME", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", type=Path, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.setup or args.run:
+        child_main("setup" if args.setup else "run", args.setup or args.run, args.workdir)
+        return
+
+    if args.list:
+        for name in BENCHMARKS:
+            missing = missing_packages(name)
+            print(f"{name:<12} skipped: needs {', '.join(missing)}" if missing else name)
+        return
+
+    names = args.names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(unknown)} (see --list)")
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("machine") != machine():
+            print(f"Note: baseline was recorded on {baseline.get('machine')}\n")
+
+    print("=" * 60)
+    print("SPECTER Pipeline Benchmarks")
+    print("=" * 60)
+    results = {}
+    for name in names:
+        print(f"  running {name}...", flush=True)
+        try:
+            results[name] = run_benchmark(name, args.repeat)
+        except Exception as e:
+            results[name] = {"error": str(e)}
+    print()
+    print_results(results, baseline)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    report = {"machine": machine(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    with open(LATEST_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        if args.names and baseline:
+            report["results"] = {**baseline.get("results", {}), **results}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved: {args.baseline}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions (over {args.tolerance:.0%} above baseline):")
+        for name, metric, before, after in regressions:
+            print(f"  ✗ {name} {metric}: {before} → {after}")
+    errors = [name for name, result in results.items() if "error" in result]
+    if args.check and (regressions or errors):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
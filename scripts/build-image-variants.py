@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+SPECTER Evidence Image Variant Builder
+Post-processes public/evidence/*.png into responsive WebP/AVIF variants.
+
+Run after generate-evidence-images.py or render-templates.js:
+    python3 scripts/build-image-variants.py [--workers N] [--force]
+
+Each PNG gets several widths plus a tiny blur placeholder; everything is
+recorded in public/evidence/.variants.json, which update-evidence-images.py
+pushes into evidence.metadata. Sources whose hash is unchanged (and whose
+variants are all present and valid) are skipped; variant files the
+manifest no longer lists are deleted.
+
+Requirements:
+    pip install Pillow  (AVIF output needs Pillow >= 11.2 or pillow-avif-plugin)
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pipeline import telemetry
+from pipeline.cache import file_hash, sweep_partials
+from pipeline.variants import (
+    EVIDENCE_DIR,
+    VARIANTS_DIR,
+    VARIANTS_MANIFEST,
+    build_variants,
+    load_manifest,
+    output_formats,
+    prune_variants,
+    save_manifest,
+    variants_exist,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build responsive evidence image variants")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if sources are unchanged")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    telemetry.start_run()
+
+    print("=" * 60)
+    print("SPECTER Evidence Image Variant Builder")
+    print("=" * 60)
+    print(f"Sources: {EVIDENCE_DIR}")
+    print(f"Output: {VARIANTS_DIR}")
+
+    formats = output_formats()
+    print(f"Formats: {', '.join(formats)}")
+    if "avif" not in formats:
+        print("  (AVIF unavailable - install pillow-avif-plugin or Pillow >= 11.2)")
+    print()
+
+    manifest = load_manifest()
+    sources = sorted(EVIDENCE_DIR.glob("*.png"))
+    sweep_partials(VARIANTS_DIR)
+
+    # Drop manifest entries for sources that no longer exist
+    for name in set(manifest) - {p.name for p in sources}:
+        del manifest[name]
+
+    pending = []
+    skipped = 0
+    for source in sources:
+        source_hash = file_hash(source)
+        entry = manifest.get(source.name)
+        if (not args.force and entry and entry["source_hash"] == source_hash
+                and set(entry["sources"]) == set(formats) and variants_exist(entry)):
+            telemetry.cache("variants", True, file=source.name)
+            skipped += 1
+            continue
+        telemetry.cache("variants", False, file=source.name)
+        pending.append((source, source_hash))
+
+    print(f"Found {len(sources)} images, {skipped} unchanged, {len(pending)} to build\n")
+
+    built = 0
+    failed = 0
+    if pending:
+        with telemetry.span("variants", images=len(pending)), \
+                ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = {
+                pool.submit(build_variants, str(source), source_hash, formats): source
+                for source, source_hash in pending
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    print(f"  ✗ {source.name}: {e}")
+                    failed += 1
+                    continue
+                manifest[source.name] = entry
+                count = sum(len(v) for v in entry["sources"].values())
+                print(f"  ✓ {source.name} → {count} variants")
+                built += 1
+
+    save_manifest(manifest)
+    pruned = prune_variants(manifest)
+
+    print("\n" + "=" * 60)
+    print("VARIANTS COMPLETE")
+    print("=" * 60)
+    print(f"Built: {built}")
+    print(f"Unchanged: {skipped}")
+    print(f"Failed: {failed}")
+    print(f"Pruned: {len(pruned)} stale variant files")
+    print(f"Manifest: {VARIANTS_MANIFEST}")
+
+    if built > 0:
+        print("\nNext steps:")
+        print("1. Run update-evidence-images.py to push variants into evidence.metadata")
+        print("2. Deploy to Vercel: vercel --prod")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+SPECTER Fake Services
+Runs local stand-ins for OpenAI images, ElevenLabs TTS and Supabase REST
+(see pipeline/fakes.py) so the generators and the updater can be exercised
+offline, including their concurrency and retry paths.
+
+Usage:
+    python3 scripts/fake-services.py [--port 8787] [--latency-ms 300] [--jitter-ms 100]
+        [--error-rate 0.05] [--throttle-rate 0.1] [--rate-limit 5] [--seed 0]
+
+It prints the variables that point the scripts at it, e.g.:
+    eval "$(python3 scripts/fake-services.py --print-env)"   # in another shell
+    python3 scripts/generate-evidence-images.py --yes
+    python3 scripts/generate-audio.py --generate fake-chen fake-elderly fake-young
+    python3 scripts/update-evidence-images.py
+
+The in-memory `cases` and `evidence` tables mirror the asset registry's
+cases, one row per evidence item; --extra-rows pads each case with more.
+Payloads are deterministic: PNGs are gradients seeded by the prompt, MP3s
+are silence whose length follows the text.
+"""
+
+import argparse
+import time
+
+from pipeline.fakes import Faults, FakeServices
+from pipeline.registry import load_registry
+
+DEFAULT_PORT = 8787
+
+
+def seed_tables(extra_rows: int = 0) -> dict:
+    """cases/evidence rows matching the asset registry."""
+    registry = load_registry()
+    cases = [{"id": f"00000000-0000-0000-0000-{int(c['case_number']):012d}", "case_number": c["case_number"]}
+             for c in registry.cases]
+
+    evidence = []
+    for case in cases:
+        items = registry.case(case["case_number"])
+        numbers = [int(ev.number.split("-")[1]) for ev in items]
+        titles = {int(ev.number.split("-")[1]): ev.title for ev in items}
+        for sort_order in numbers + list(range(max(numbers) + 1, max(numbers) + 1 + extra_rows)):
+            evidence.append({
+                "id": f"00000000-0000-0000-{int(case['case_number']):04d}-{sort_order:012d}",
+                "case_id": case["id"],
+                "type": "document",
+                "title": titles.get(sort_order, f"Case {case['case_number']} evidence {sort_order}"),
+                "sort_order": sort_order,
+                "image_url": None,
+                "metadata": {},
+            })
+    return {"cases": cases, "evidence": evidence}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run local stand-ins for OpenAI, ElevenLabs and Supabase")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"default: {DEFAULT_PORT}")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="± random spread on the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="requests/second per service before 429s (default: unlimited)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429s")
+    parser.add_argument("--seed", type=int, default=0, help="seed for latency and fault rolls")
+    parser.add_argument("--extra-rows", type=int, default=0, help="unmapped evidence rows added per case")
+    parser.add_argument("--print-env", action="store_true", help="print export lines only (for eval)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    faults = Faults(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                    throttle_rate=args.throttle_rate, rate_limit=args.rate_limit,
+                    retry_after=args.retry_after, seed=args.seed)
+    fake = FakeServices(seed_tables(args.extra_rows), faults, host=args.host, port=args.port)
+    exports = "\n".join(f"export {name}={value}" for name, value in fake.environment().items())
+
+    if args.print_env:
+        print(exports)
+        fake.server.server_close()
+        return
+
+    print("=" * 60)
+    print("SPECTER Fake Services")
+    print("=" * 60)
+    print(f"Listening on {fake.url}")
+    print(f"Faults: {faults}")
+    print("Tables: " + ", ".join(f"{name} ({len(rows)} rows)" for name, rows in fake.tables.items()))
+    print("\nPoint the scripts here with:\n")
+    print(exports)
+    print("\nCtrl-C to stop.")
+
+    fake.start()
+    try:
+        while True:
+            time.sleep(10)
+            print(f"  {fake.stats}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.stop()
+        print(f"\nFinal: {fake.stats}")
+
+
+if __name__ == "__main__":
+    main()
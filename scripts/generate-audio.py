@@ -2,41 +2,37 @@
 """
 SPECTER Audio Generation Script
 Uses ElevenLabs API to generate voice clips for the Blackwood Recording
+
+Usage:
+    python generate-audio.py                     # list available voices
+    python generate-audio.py --generate <chen_id> <elderly_id> <young_id>
+        [--concurrency N] [--rate N] [--force] [--adopt] [--profile] [--base-url URL]
+
+The lines are read from scripts/audio/blackwood-script.md. Clips are cached by
+(text, voice_id, model_id, stability, similarity); unchanged lines are skipped
+without an API call and changed ones are fetched in parallel. Set
+ELEVENLABS_BASE_URL (or --base-url) to point at a local stand-in such as
+scripts/fake-services.py.
 """
 
+import argparse
 import os
-import sys
 from pathlib import Path
 
-# Check for API key
-ELEVENLABS_API_KEY = os.environ.get('ELEVENLABS_API_KEY')
-
-if not ELEVENLABS_API_KEY:
-    print("=" * 60)
-    print("ELEVENLABS_API_KEY not set!")
-    print("")
-    print("Please run:")
-    print("  export ELEVENLABS_API_KEY='your-api-key-here'")
-    print("")
-    print("Then run this script again.")
-    print("=" * 60)
-    sys.exit(1)
-
-try:
-    from elevenlabs.client import ElevenLabs
-    from elevenlabs import VoiceSettings
-except ImportError:
-    print("Installing elevenlabs package...")
-    os.system("pip3 install elevenlabs")
-    from elevenlabs.client import ElevenLabs
-    from elevenlabs import VoiceSettings
+from pipeline import telemetry
+from pipeline.script_parser import parse_script
+from pipeline.tts import (
+    CLIPS_DIR,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RATE_PER_MINUTE,
+    generate_batch,
+    make_client,
+    make_downloader,
+)
 
-# Initialize client
-client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
+# Voice lines come from the annotated script (see pipeline/script_parser.py)
+SCRIPT_PATH = Path(__file__).parent / "audio" / "blackwood-script.md"
 
-# Output directory
-OUTPUT_DIR = Path(__file__).parent / "audio" / "clips"
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 def list_available_voices():
     """List all available voices"""
@@ -44,7 +40,7 @@ def list_available_voices():
     print("AVAILABLE VOICES")
     print("=" * 60)
 
-    response = client.voices.get_all()
+    response = make_client().voices.get_all()
     voices = response.voices
 
     for voice in voices:
@@ -56,32 +52,6 @@ def list_available_voices():
 
     return voices
 
-def generate_clip(text: str, voice_id: str, filename: str, stability: float = 0.5, similarity: float = 0.75):
-    """Generate a single audio clip"""
-    print(f"\nGenerating: {filename}")
-    print(f"  Text: {text[:50]}...")
-
-    audio_generator = client.text_to_speech.convert(
-        text=text,
-        voice_id=voice_id,
-        model_id="eleven_multilingual_v2",
-        voice_settings=VoiceSettings(
-            stability=stability,
-            similarity_boost=similarity,
-            style=0.0,
-            use_speaker_boost=True
-        )
-    )
-
-    # Save audio - handle generator
-    output_path = OUTPUT_DIR / filename
-    with open(output_path, 'wb') as f:
-        for chunk in audio_generator:
-            f.write(chunk)
-
-    print(f"  ✓ Saved: {output_path}")
-    return output_path
-
 def main():
     print("=" * 60)
     print("SPECTER Audio Generation")
@@ -112,66 +82,46 @@ Run this script with voice IDs to generate:
   python generate-audio.py --generate <chen_id> <elderly_id> <young_id>
 """)
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == "--generate":
-        if len(sys.argv) < 5:
-            print("Usage: python generate-audio.py --generate <chen_id> <elderly_id> <young_id>")
-            sys.exit(1)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate Blackwood Recording voice clips")
+    parser.add_argument("--generate", nargs=3, metavar=("CHEN_ID", "ELDERLY_ID", "YOUNG_ID"),
+                        help="generate all clips with these voice IDs")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"clips generated in parallel (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_PER_MINUTE,
+                        help=f"max TTS requests per minute (default: {DEFAULT_RATE_PER_MINUTE})")
+    parser.add_argument("--force", action="store_true", help="regenerate clips even if unchanged")
+    parser.add_argument("--adopt", action="store_true",
+                        help="record existing untracked clips in the manifest without regenerating")
+    parser.add_argument("--base-url", help="ElevenLabs-compatible API base URL, e.g. fake-services.py "
+                                           "(default: $ELEVENLABS_BASE_URL)")
+    parser.add_argument("--profile", action="store_true", help="profile the generation stage")
+    return parser.parse_args()
 
-        chen_voice = sys.argv[2]
-        elderly_voice = sys.argv[3]
-        young_voice = sys.argv[4]
 
-        print("Generating Blackwood Recording clips...")
+if __name__ == "__main__":
+    args = parse_args()
+    telemetry.start_run()
+    if args.base_url:
+        os.environ["ELEVENLABS_BASE_URL"] = args.base_url
+    if args.generate:
+        chen_voice, elderly_voice, young_voice = args.generate
+        voices = {"chen": chen_voice, "elderly": elderly_voice, "young": young_voice}
 
-        # Chen's lines
-        chen_lines = [
-            ("chen_01_intro.mp3", "Testing, testing. Marcus Chen, solo investigation of Blackwood Sanitarium. Time is 11:47 PM. Alright, let's do this."),
-            ("chen_02_entering.mp3", "Entering the main hall now. Place is... wow, completely trashed. Graffiti everywhere. Smells like mold and... something else."),
-            ("chen_03_ward.mp3", "Found the old patient ward. Beds still here, rusted to hell. This is where they kept them. Hundreds of people."),
-            ("chen_04_hello.mp3", "What the— Hello? Is someone there?"),
-            ("chen_05_footsteps.mp3", "Okay, I definitely heard that. There's... there's someone else here."),
-            ("chen_06_whothere.mp3", "Who's there? This isn't funny!"),
-            ("chen_07_coordinates.mp3", "Did you guys hear that? She just said coordinates. I'm writing this down..."),
-            ("chen_08_emf.mp3", "This is insane. The EMF reader is going crazy. Temperature just dropped like twenty degrees. I need to find the source of—"),
-            ("chen_09_reaction.mp3", "I didn't say that. I didn't— What is happening to me?!"),
-        ]
-
-        for filename, text in chen_lines:
-            generate_clip(text, chen_voice, filename, stability=0.6, similarity=0.8)
-
-        # Elderly female voice (whispered)
-        generate_clip(
-            "Marcus... David... Chen...",
-            elderly_voice,
-            "elderly_whisper.mp3",
-            stability=0.3,  # Lower for more variation
-            similarity=0.5
-        )
-
-        # Young female voice (coordinates)
-        generate_clip(
-            "Forty-one point four zero three two north. Two point one seven four three west.",
-            young_voice,
-            "young_coordinates.mp3",
-            stability=0.8,  # Higher for robotic feel
-            similarity=0.9
-        )
-
-        # Chen's possessed voice (we'll distort this in post)
-        generate_clip(
-            "They buried us in the garden. Mother is still waiting.",
-            chen_voice,
-            "chen_possessed.mp3",
-            stability=0.3,
-            similarity=0.5
-        )
+        print("Generating Blackwood Recording clips...")
+        jobs = parse_script(SCRIPT_PATH).jobs
+        with telemetry.span("generate", clips=len(jobs)), telemetry.profile("generate", args.profile):
+            generated, cached, failed = generate_batch(make_downloader, jobs, voices, args.concurrency, args.rate,
+                                                       force=args.force, adopt=args.adopt)
 
         print("\n" + "=" * 60)
         print("GENERATION COMPLETE!")
         print("=" * 60)
-        print(f"Clips saved to: {OUTPUT_DIR}")
-        print("\nNext: Mix these clips with sound effects in Audacity or similar.")
+        print(f"Generated: {generated}")
+        print(f"Unchanged: {cached}")
+        print(f"Failed: {failed}")
+        print(f"Clips saved to: {CLIPS_DIR}")
+        print("\nNext: run mix-blackwood-audio.py to rebuild the mix.")
 
     else:
         main()
@@ -7,251 +7,359 @@ Usage:
     1. Set your OpenAI API key: export OPENAI_API_KEY="your-key-here"
     2. Run: python3 scripts/generate-evidence-images.py
 
+Options:
+    --concurrency N     Images generated in parallel (default: 4)
+    --rate N            Max image requests per minute (default: 15)
+    --base-url URL      Use an OpenAI-compatible endpoint (e.g. a local fake)
+    --yes               Skip the confirmation prompt
+    --adopt             Record existing untracked images in the manifest as-is
+    --case CASE         Only this case, by number or name (e.g. 0002, blackwood)
+    --profile           Profile the generation stage (see pipeline/telemetry.py)
+    --candidates N      Generate N takes per prompt and write contact sheets
+    --select FILE       Promote the picks in a selection file (no API calls)
+
+The prompts live in the asset registry (scripts/evidence-registry.json).
+Images are cached by a hash of prompt, model, size and quality. Editing a
+prompt regenerates just that image; unchanged or duplicate prompts are
+served from the local cache (scripts/.cache/images/) without an API call.
+
+Downloads go through one pooled, keep-alive session (pipeline/downloads.py)
+and are streamed to a partial file that is only renamed into the cache once
+its size, checksum and PNG structure check out; a broken-off download
+resumes with a Range request. Every job's progress is kept in a journal
+(pipeline/journal.py). If a run is killed, run it again: it picks up
+exactly where it stopped, re-downloading already generated images from
+their URL instead of paying for them twice.
+
+To choose between several takes of an image, run with --candidates 4
+(usually with --case): the missing candidates are generated concurrently
+into the cache, and scripts/.cache/contact-sheets/<case>.html shows them
+all side by side. Pick one per image, save the selection file the page
+offers, and run with --select selection-<case>.json to copy the picks
+into public/evidence. Nothing is regenerated, and the picks stick until
+the prompt changes (see pipeline/images.py).
+
 Requirements:
     pip install openai requests
 """
 
+import argparse
 import os
-import requests
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-try:
-    from openai import OpenAI
-except ImportError:
-    print("Error: openai package not installed.")
-    print("Run: pip install openai requests")
-    exit(1)
+from pipeline import telemetry
+from pipeline.cache import ContentCache, InvalidAsset, Manifest, sweep_partials
+from pipeline.contact_sheet import load_selection, write_contact_sheets
+from pipeline.downloads import Downloader, sweep_downloads
+from pipeline.images import (
+    IMAGE_CACHE_DIR,
+    IMAGE_QUALITY,
+    IMAGE_SIZE,
+    MANIFEST_PATH,
+    MODEL,
+    OUTPUT_DIR,
+    candidate_key,
+    candidate_jobs,
+    image_key,
+    plan,
+    selected_key,
+    selection_fields,
+)
+from pipeline.journal import JobJournal
+from pipeline.ratelimit import TokenBucket, with_retries
+from pipeline.registry import RegistryError, load_registry
 
 # Configuration
-OUTPUT_DIR = Path(__file__).parent.parent / "public" / "evidence"
-IMAGE_SIZE = "1024x1024"  # Options: 1024x1024, 1792x1024, 1024x1792
-IMAGE_QUALITY = "standard"  # Options: standard, hd
-MODEL = "dall-e-3"
-
-# All evidence image prompts organized by case
-EVIDENCE_IMAGES = [
-    # Case #1: The Hartwell Incident
-    {
-        "filename": "hartwell-police-report.png",
-        "case": "Hartwell",
-        "evidence": "Initial Police Report",
-        "prompt": "A scanned police incident report from a small town police department, dated 2024. The document shows typed text about 'unexplained disturbances' at a residential address. Official letterhead, case number visible, some coffee stains on the paper. Dark moody lighting, vintage document aesthetic. Photorealistic style."
-    },
-    {
-        "filename": "hartwell-property-records.png",
-        "case": "Hartwell",
-        "evidence": "Property Records",
-        "prompt": "An old property deed document from the 1940s, yellowed paper with official stamps and seals. Shows a hand-drawn property map in the corner. Text mentions previous owners of an old estate. Aged paper texture, some water damage on edges. Photorealistic vintage document."
-    },
-    {
-        "filename": "hartwell-emma-drawing.png",
-        "case": "Hartwell",
-        "evidence": "Emma's Drawing",
-        "prompt": "A child's crayon drawing on white paper, depicting a house with a dark shadowy figure standing near a window. The figure is drawn in black crayon with glowing red eyes. Innocent childlike art style but unsettling subject matter. Simple stick figures of a family nearby. Crumpled paper texture."
-    },
-    {
-        "filename": "hartwell-thermal.png",
-        "case": "Hartwell",
-        "evidence": "Thermal Imaging",
-        "prompt": "A thermal camera image of a house interior showing heat signatures. Most of the room is normal blue/green temperatures, but there's an unexplained cold spot (deep purple/black) in a humanoid shape near a doorway. Technical readout data visible on the edges. Scientific paranormal investigation style."
-    },
-    {
-        "filename": "hartwell-missing-person.png",
-        "case": "Hartwell",
-        "evidence": "Missing Person Report",
-        "prompt": "A weathered missing person flyer from 2013, showing a faded photo of a middle-aged man. 'MISSING' in bold red letters at top. Details include height, weight, last seen location. The paper is torn and faded, found posted on a telephone pole. Eerie, unsettling atmosphere."
-    },
-
-    # Case #2: The Blackwood Recording
-    {
-        "filename": "blackwood-waveform.png",
-        "case": "Blackwood",
-        "evidence": "Audio Waveform",
-        "prompt": "A dark computer screen displaying an audio waveform visualization. The waveform shows normal speech patterns with one section highlighted in red showing an anomalous spike - an unexplained voice. Timestamp visible. Professional audio editing software interface. Dark moody tech aesthetic."
-    },
-    {
-        "filename": "blackwood-sanitarium.png",
-        "case": "Blackwood",
-        "evidence": "Sanitarium Photo",
-        "prompt": "A black and white photograph from the 1920s showing an abandoned Victorian-era sanitarium building. Gothic architecture, broken windows, overgrown with vines. Fog surrounds the building. The photo has damaged edges and age spots. Creepy, atmospheric, historical photography style."
-    },
-    {
-        "filename": "blackwood-chen-id.png",
-        "case": "Blackwood",
-        "evidence": "Chen Background",
-        "prompt": "A government security clearance document with an ID badge photo of a professional man in his 30s wearing a collared shirt. The document has 'CLASSIFIED' partially visible and official stamps. Government document aesthetic, slightly grainy photo quality. No specific ethnicity shown."
-    },
-    {
-        "filename": "blackwood-coordinates-map.png",
-        "case": "Blackwood",
-        "evidence": "Coordinates Map",
-        "prompt": "A topographic map with several locations marked with red pins connected by lines. Handwritten notes in the margins. One location is circled multiple times with question marks written next to it. Coffee-stained, well-used research map aesthetic. Military/investigation style."
-    },
-    {
-        "filename": "blackwood-cia-memo.png",
-        "case": "Blackwood",
-        "evidence": "CIA Memo",
-        "prompt": "A partially redacted government document with official agency letterhead. Many lines blacked out with marker. Visible text mentions a classified project and 'acoustic phenomena'. Official stamps, classification markings. Conspiracy document aesthetic."
-    },
-    {
-        "filename": "blackwood-hypnotherapy-notes.png",
-        "case": "Blackwood",
-        "evidence": "Hypnotherapy Notes",
-        "prompt": "Handwritten notes on a yellow legal pad from a psychiatrist. Messy doctor's handwriting describing a patient's hypnosis session. Phrases like 'subject recalls bright light' and 'missing time' visible. Some diagrams of brain waves. Clinical but unsettling notes aesthetic."
-    },
-
-    # Case #3: The Millbrook Disappearances
-    {
-        "filename": "millbrook-timeline.png",
-        "case": "Millbrook",
-        "evidence": "Victim Timeline",
-        "prompt": "A detective's evidence board showing a timeline spanning decades. Photos connected by red string, dates marked, pattern emerging at regular intervals. Polaroid-style photos pinned to corkboard. Dark investigation room lighting. True crime investigation aesthetic."
-    },
-    {
-        "filename": "millbrook-newspaper-1923.png",
-        "case": "Millbrook",
-        "evidence": "1923 Newspaper",
-        "prompt": "A vintage newspaper clipping from 1923 with a headline about people vanishing without trace in a small town. Black and white photo of a forest area. Yellowed, brittle paper with torn edges. Old-fashioned newspaper typography. Historical document aesthetic."
-    },
-    {
-        "filename": "millbrook-carver-notes.png",
-        "case": "Millbrook",
-        "evidence": "Carver's Notes",
-        "prompt": "Pages from a researcher's notebook filled with obsessive notes and diagrams. Drawings of geometric symbols, maps with lines, calculations. 'THE PATTERN REPEATS' written and circled multiple times. Coffee stains, frantic handwriting. Paranoid investigator aesthetic."
-    },
-    {
-        "filename": "millbrook-ward-journal.png",
-        "case": "Millbrook",
-        "evidence": "Ward's Journal",
-        "prompt": "An open antique leather journal from the 1920s with handwritten entries in elegant cursive. The visible page describes strange occurrences in the woods. Pressed flowers between pages, ribbon bookmark. Aged paper, ink slightly faded. Gothic Victorian diary aesthetic."
-    },
-    {
-        "filename": "millbrook-1973-case-file.png",
-        "case": "Millbrook",
-        "evidence": "1973 Case File",
-        "prompt": "A typed police report from 1973 on an old typewriter. Carbon copy paper, official police department header. Reports of unusual disappearances and no evidence of foul play despite extensive search. Yellowed paper, official stamps. 1970s law enforcement document aesthetic."
-    },
-    {
-        "filename": "millbrook-threshold-charter.png",
-        "case": "Millbrook",
-        "evidence": "Threshold Charter",
-        "prompt": "An aged parchment document from the 1800s with ornate calligraphy. Gothic border decorations, strange symbols in the corners. Text establishes a secret society with a mission to guard boundaries. Wax seal at bottom. Ancient secret society document aesthetic."
-    },
-]
-
-
-def generate_image(client: OpenAI, prompt: str, filename: str) -> bool:
-    """Generate a single image using DALL-E and save it."""
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE_PER_MINUTE = 15
+MAX_ATTEMPTS = 5
+IMAGE_URL_TTL = 50 * 60  # DALL-E result URLs expire after an hour
+
+
+_print_lock = threading.Lock()
+
+
+def log(message: str):
+    """Print from worker threads without interleaving lines."""
+    with _print_lock:
+        print(message, flush=True)
+
+
+def generate_image(client: "OpenAI", downloader: Downloader, bucket: TokenBucket, journal: JobJournal,
+                   key: str, prompt: str, filename: str, output_path: Path) -> bool:
+    """Generate a single image using DALL-E and save it to output_path.
+
+    A URL journaled by an interrupted run is downloaded instead of
+    generating the image again.
+    """
+    def on_retry(attempt, error, delay):
+        log(f"  ↻ Retry {attempt} for {filename} in {delay:.1f}s ({error})")
+
+    def request_image():
+        bucket.acquire()
+        with telemetry.api_call("openai", "images.generate", file=filename, model=MODEL):
+            response = client.images.generate(
+                model=MODEL,
+                prompt=prompt,
+                size=IMAGE_SIZE,
+                quality=IMAGE_QUALITY,
+                n=1,
+            )
+        return response.data[0].url
+
     try:
-        print(f"  Generating: {filename}")
-
-        response = client.images.generate(
-            model=MODEL,
-            prompt=prompt,
-            size=IMAGE_SIZE,
-            quality=IMAGE_QUALITY,
-            n=1,
-        )
-
-        image_url = response.data[0].url
-
-        # Download the image
-        image_response = requests.get(image_url)
-        if image_response.status_code == 200:
-            output_path = OUTPUT_DIR / filename
-            with open(output_path, 'wb') as f:
-                f.write(image_response.content)
-            print(f"  ✓ Saved: {filename}")
-            return True
+        image_url = journal.fresh_result(key, "url", IMAGE_URL_TTL)
+        if image_url:
+            log(f"  Resuming: {filename} (already generated)")
         else:
-            print(f"  ✗ Failed to download: {filename}")
-            return False
+            log(f"  Generating: {filename}")
+            journal.record(key, "started", file=filename)
+            image_url = with_retries(request_image, attempts=MAX_ATTEMPTS, on_retry=on_retry)
+            journal.record(key, "generated", file=filename, url=image_url)
+
+        with_retries(lambda: downloader.fetch(image_url, output_path, operation="image.download"),
+                     attempts=MAX_ATTEMPTS, on_retry=on_retry)
+        journal.done(key, output_path, file=filename)
+        log(f"  ✓ Saved: {filename}")
+        return True
 
     except Exception as e:
-        print(f"  ✗ Error generating {filename}: {str(e)}")
+        journal.record(key, "failed", file=filename, error=str(e)[:300])
+        log(f"  ✗ Error generating {filename}: {str(e)}")
         return False
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate SPECTER evidence images")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"images generated in parallel (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_PER_MINUTE,
+                        help=f"max image requests per minute (default: {DEFAULT_RATE_PER_MINUTE})")
+    parser.add_argument("--base-url", default=os.environ.get("OPENAI_BASE_URL"),
+                        help="OpenAI-compatible API base URL (default: $OPENAI_BASE_URL)")
+    parser.add_argument("--yes", "-y", action="store_true", help="skip the confirmation prompt")
+    parser.add_argument("--adopt", action="store_true",
+                        help="record existing untracked images in the manifest without regenerating")
+    parser.add_argument("--case", help="only generate this case's images (number or name)")
+    parser.add_argument("--profile", action="store_true", help="profile the generation stage")
+    parser.add_argument("--candidates", type=int, default=1, metavar="N",
+                        help="generate N candidates per prompt and write contact sheets instead of outputs")
+    parser.add_argument("--select", type=Path, metavar="FILE",
+                        help="promote the candidates chosen in a contact-sheet selection file")
+    return parser.parse_args()
+
+
+def promote_selection(selection: dict, registry, cache: ContentCache, manifest: Manifest) -> int:
+    """Copy each selected cached candidate to its output; returns the number of failures."""
+    failed = 0
+    for filename, index in sorted(selection.items()):
+        img = registry.by_filename.get(filename)
+        if img is None or not img.prompt:
+            print(f"  ✗ {filename}: not a generated evidence image")
+            failed += 1
+            continue
+        key = candidate_key(img.prompt, index)
+        if not cache.has(key):
+            print(f"  ✗ {filename}: candidate #{index} isn't cached (run with --candidates {index + 1})")
+            failed += 1
+            continue
+        output = cache.materialize(key, OUTPUT_DIR / filename)
+        fields = {"candidate": index, "prompt_key": image_key(img.prompt)} if index else {}
+        manifest.record(filename, key, output, source="selected", **fields)
+        print(f"  ✓ {filename} ← candidate #{index}")
+    manifest.save()
+    return failed
+
+
+def sync_outputs(manifest: Manifest, cache: ContentCache, evidence, adopt: bool) -> dict:
+    """Bring outputs up to date from the cache (and adopt untracked files); returns the jobs left."""
+    current, from_cache, untracked, jobs = plan(manifest, cache, evidence)
+    for img in current:
+        telemetry.cache("images", True, file=img.filename, source="output")
+    for img in from_cache:
+        telemetry.cache("images", True, file=img.filename, source="cache")
+    for imgs in jobs.values():
+        for img in imgs:
+            telemetry.cache("images", False, file=img.filename)
+
+    if current:
+        print(f"Up to date: {len(current)} images")
+
+    if untracked:
+        if adopt:
+            adopted = rejected = 0
+            for img in untracked:
+                key = image_key(img.prompt)
+                try:
+                    cache.store(key, OUTPUT_DIR / img.filename)
+                except InvalidAsset as e:
+                    print(f"  Not adopting {e}")
+                    rejected += 1
+                    continue
+                manifest.record(img.filename, key, OUTPUT_DIR / img.filename, source="adopted")
+                adopted += 1
+            print(f"Adopted {adopted} untracked images into the manifest")
+            if rejected:
+                print(f"Rejected {rejected} invalid images (left untracked)")
+        else:
+            print(f"Skipping {len(untracked)} untracked images (run with --adopt to track them)")
+
+    for img in from_cache:
+        key = selected_key(img, manifest)
+        output = cache.materialize(key, OUTPUT_DIR / img.filename)
+        manifest.record(img.filename, key, output, source="cache", **selection_fields(img, manifest))
+    if from_cache:
+        print(f"Restored {len(from_cache)} images from cache")
+
+    manifest.save()
+    return jobs
+
+
 def main():
-    # Check for API key
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        print("=" * 60)
-        print("ERROR: OPENAI_API_KEY environment variable not set")
-        print("=" * 60)
-        print("\nTo set your API key, run:")
-        print('  export OPENAI_API_KEY="your-api-key-here"')
-        print("\nGet your API key from: https://platform.openai.com/api-keys")
-        print()
+    args = parse_args()
+    telemetry.start_run()
+
+    registry = load_registry()
+    try:
+        evidence = registry.select(args.case)
+    except RegistryError as e:
+        print(f"Error: {e}")
         exit(1)
 
     # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    manifest = Manifest(MANIFEST_PATH)
+    cache = ContentCache(IMAGE_CACHE_DIR, suffix=".png")
+    journal = JobJournal("images")
+    sweep_partials(IMAGE_CACHE_DIR)
+    sweep_partials(OUTPUT_DIR)
+    # Partial downloads outlive a run, but not the URL they were fetched from
+    sweep_downloads(IMAGE_CACHE_DIR, IMAGE_URL_TTL)
 
     print("=" * 60)
     print("SPECTER Evidence Image Generator")
     print("=" * 60)
     print(f"Output directory: {OUTPUT_DIR}")
-    print(f"Total images to generate: {len(EVIDENCE_IMAGES)}")
+    print(f"Total evidence images: {len(evidence)}" + (f" (case {args.case})" if args.case else ""))
     print(f"Model: {MODEL}")
     print(f"Size: {IMAGE_SIZE}")
     print(f"Quality: {IMAGE_QUALITY}")
+    print(f"Concurrency: {args.concurrency} (max {args.rate:g} requests/min)")
+    if args.base_url:
+        print(f"API base URL: {args.base_url}")
     print()
 
-    # Check which images already exist
-    existing = [img for img in EVIDENCE_IMAGES if (OUTPUT_DIR / img["filename"]).exists()]
-    to_generate = [img for img in EVIDENCE_IMAGES if not (OUTPUT_DIR / img["filename"]).exists()]
+    if args.select:
+        try:
+            selection = load_selection(args.select)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            exit(1)
+        print(f"Promoting {len(selection)} selected candidates from {args.select}")
+        if promote_selection(selection, registry, cache, manifest):
+            exit(1)
+        return
 
-    if existing:
-        print(f"Skipping {len(existing)} existing images")
+    if args.candidates > 1:
+        jobs, indices = candidate_jobs(cache, evidence, args.candidates)
+        print(f"Candidates: {args.candidates} per prompt, {len(jobs)} not generated yet")
+        if not jobs:
+            for path in write_contact_sheets(registry, {img.case_number for img in evidence}, cache, manifest,
+                                             args.candidates):
+                print(f"Contact sheet: {path}")
+            return
+    else:
+        indices = {}
+        jobs = sync_outputs(manifest, cache, evidence, args.adopt)
+        if not jobs:
+            print("\nAll images are up to date! Nothing to generate.")
+            print("Edit a prompt in scripts/evidence-registry.json to regenerate that image.")
+            return
 
-    if not to_generate:
-        print("\nAll images already exist! Nothing to generate.")
-        print("Delete images from public/evidence/ to regenerate them.")
-        return
+    # Check for API key
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        print("=" * 60)
+        print("ERROR: OPENAI_API_KEY environment variable not set")
+        print("=" * 60)
+        print("\nTo set your API key, run:")
+        print('  export OPENAI_API_KEY="your-api-key-here"')
+        print("\nGet your API key from: https://platform.openai.com/api-keys")
+        print()
+        exit(1)
+
+    # The SDKs are only imported once there is something to generate
+    try:
+        import requests  # noqa: F401  (used by the Downloader)
+        from openai import OpenAI
+    except ImportError:
+        print("Error: openai package not installed.")
+        print("Run: pip install openai requests")
+        exit(1)
 
-    print(f"Generating {len(to_generate)} new images...\n")
+    # Initialize OpenAI client (retries are handled by with_retries)
+    client = OpenAI(api_key=api_key, base_url=args.base_url, max_retries=0)
+    downloader = Downloader(pool_size=max(1, args.concurrency), service="openai")
+    bucket = TokenBucket.per_minute(args.rate, burst=max(1, args.concurrency))
+
+    image_count = sum(len(imgs) for imgs in jobs.values())
+    print(f"Generating {len(jobs)} new images for {image_count} evidence files...")
+    resumed = journal.interrupted(jobs)
+    if resumed:
+        print(f"Resuming {len(resumed)} jobs interrupted in a previous run")
+    print()
 
     # Estimate cost
     # DALL-E 3 pricing: $0.040 per image (standard), $0.080 per image (HD)
     cost_per_image = 0.080 if IMAGE_QUALITY == "hd" else 0.040
-    estimated_cost = len(to_generate) * cost_per_image
+    to_pay = sum(1 for key in jobs if not journal.fresh_result(key, "url", IMAGE_URL_TTL))
+    estimated_cost = to_pay * cost_per_image
     print(f"Estimated cost: ${estimated_cost:.2f}")
     print()
 
     # Confirm before proceeding
-    response = input("Proceed with image generation? (y/n): ").strip().lower()
-    if response != 'y':
-        print("Aborted.")
-        return
+    if not args.yes:
+        response = input("Proceed with image generation? (y/n): ").strip().lower()
+        if response != 'y':
+            print("Aborted.")
+            return
 
     print()
 
-    # Generate images
+    # Generate each distinct prompt once into the cache; the token bucket paces the API calls
+    IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
     success_count = 0
     fail_count = 0
-    current_case = None
 
-    for i, img in enumerate(to_generate, 1):
-        # Print case header
-        if img["case"] != current_case:
-            current_case = img["case"]
-            print(f"\n[Case: {current_case}]")
-
-        print(f"({i}/{len(to_generate)}) {img['evidence']}")
-
-        if generate_image(client, img["prompt"], img["filename"]):
-            success_count += 1
-        else:
-            fail_count += 1
-
-        # Rate limiting - wait between requests
-        if i < len(to_generate):
-            time.sleep(2)
+    generate = telemetry.profiled(generate_image)
+    with telemetry.span("generate", images=len(jobs)), telemetry.profile("generate", args.profile), \
+            ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        futures = {
+            pool.submit(generate, client, downloader, bucket, journal, key, imgs[0].prompt,
+                        f"{imgs[0].filename} #{indices[key]}" if key in indices else imgs[0].filename,
+                        cache.path(key)): key
+            for key, imgs in jobs.items()
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            imgs = jobs[key]
+            if future.result():
+                if not indices:
+                    for img in imgs:
+                        fields = selection_fields(img, manifest)
+                        output = cache.materialize(key, OUTPUT_DIR / img.filename)
+                        manifest.record(img.filename, key, output, source="generated", **fields)
+                    manifest.save()
+                success_count += len(imgs)
+            else:
+                fail_count += len(imgs)
+            names = ", ".join(f"[{img.case_name}] {img.label}" for img in imgs)
+            log(f"({i}/{len(jobs)}) {names}")
+    journal.compact()
+    downloader.close()
 
     # Summary
     print("\n" + "=" * 60)
@@ -259,8 +367,17 @@ def main():
     print("=" * 60)
     print(f"Success: {success_count}")
     print(f"Failed: {fail_count}")
+    print(f"Downloads: {downloader.stats['requests']} requests, {downloader.stats['resumed']} resumed, "
+          f"{downloader.stats['bytes'] / 1024 / 1024:.1f} MB")
     print(f"Output: {OUTPUT_DIR}")
 
+    if indices:
+        for path in write_contact_sheets(registry, {img.case_number for img in evidence}, cache, manifest,
+                                         args.candidates):
+            print(f"Contact sheet: {path}")
+        print("\nPick one candidate per image there, then run with --select <selection file>.")
+        return
+
     if success_count > 0:
         print("\nNext steps:")
         print("1. Review the generated images in public/evidence/")
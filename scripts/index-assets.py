@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+SPECTER Asset Index
+Indexes the published media and checks it for corruption, duplicates and
+orphans (see pipeline/assets.py).
+
+Usage:
+    python3 scripts/index-assets.py [--full] [--verify-db] [--base-url URL]
+
+Scans public/evidence, public/audio and scripts/audio/clips into
+scripts/.cache/assets.json (hash, dimensions, duration, codec, validity).
+Only files whose size or mtime changed are re-read, so re-running it is
+near-instant; --full rehashes everything.
+
+--verify-db also fetches every evidence row from Supabase (credentials as
+for update-evidence-images.py) and checks that each image_url, audio_url
+and responsive-variant URL resolves to a valid indexed file. URLs served
+from the database count as references when looking for orphans.
+
+Each scan also refreshes public/asset-versions.json (site URL → URL with a
+?v=<content hash>, the form update-evidence-images.py stores) and checks
+that vercel.json has the matching cache rules; --write-vercel adds them.
+
+Exits with status 1 if any file is invalid or any evidence URL is broken.
+"""
+
+import argparse
+import os
+
+from pipeline import telemetry
+from pipeline.assets import (
+    VERCEL_CONFIG,
+    VERSIONS_PATH,
+    AssetIndex,
+    local_references,
+    missing_cache_rules,
+    row_urls,
+    write_cache_rules,
+)
+from pipeline.evidence_sync import EVIDENCE_COLUMNS, evidence_number, load_env_local
+
+
+def fetch_rows(base_url: str = None):
+    """Every case and evidence row, or exit if Supabase isn't reachable."""
+    load_env_local()
+    supabase_url = base_url or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    supabase_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+    if not supabase_url or not supabase_key:
+        print("Error: Supabase credentials not found.")
+        print("Make sure .env.local contains NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY")
+        exit(1)
+    try:
+        from supabase import create_client
+    except ImportError:
+        print("Error: supabase package not installed.")
+        print("Run: pip install supabase")
+        exit(1)
+    supabase = create_client(supabase_url, supabase_key)
+    with telemetry.api_call("supabase", "select cases"):
+        cases = supabase.table("cases").select("id, case_number").execute().data
+    with telemetry.api_call("supabase", "select evidence") as call:
+        rows = supabase.table("evidence").select(EVIDENCE_COLUMNS).execute().data
+        call["rows"] = len(rows)
+    return cases, rows
+
+
+def verify_rows(index: AssetIndex, cases, rows):
+    """Check every URL on every evidence row; returns (referenced paths, problems)."""
+    case_numbers = {case["id"]: case["case_number"] for case in cases}
+    referenced, problems = set(), []
+    for row in sorted(rows, key=lambda r: (case_numbers.get(r["case_id"]) or "", r.get("sort_order") or 0)):
+        label = f"{case_numbers.get(row['case_id'])}/{evidence_number(row)} {row.get('title', '')}"
+        for field, url in row_urls(row):
+            rel, entry = index.resolve(url)
+            if rel is None:
+                continue  # external URL, not ours to check
+            referenced.add(rel)
+            if entry is None:
+                problems.append(f"{label}: {field} {url} → no such file")
+            elif not entry.get("valid", True):
+                problems.append(f"{label}: {field} {url} → {entry.get('error')}")
+    return referenced, problems
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Index and verify SPECTER media assets")
+    parser.add_argument("--full", action="store_true", help="rehash every file, not just changed ones")
+    parser.add_argument("--verify-db", action="store_true",
+                        help="check that every evidence row's URLs resolve to valid files")
+    parser.add_argument("--base-url", help="Supabase-compatible URL (default: NEXT_PUBLIC_SUPABASE_URL)")
+    parser.add_argument("--write-vercel", action="store_true",
+                        help="add the immutable/revalidate cache rules to vercel.json if missing")
+    return parser.parse_args()
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.0f} KB"
+
+
+def main():
+    args = parse_args()
+    telemetry.start_run()
+
+    print("=" * 60)
+    print("SPECTER Asset Index")
+    print("=" * 60)
+
+    with telemetry.span("scan") as span:
+        index = AssetIndex().scan(full=args.full)
+        span.update(files=len(index.files), rescanned=index.rescanned)
+    total = sum(entry["size"] for entry in index.files.values())
+    print(f"Indexed {len(index.files)} files ({format_size(total)}), {index.rescanned} re-read")
+    print(f"Index: {index.path}")
+    if index.write_versions():
+        print(f"Updated {VERSIONS_PATH.relative_to(VERSIONS_PATH.parent.parent)}")
+    if args.write_vercel:
+        added = write_cache_rules()
+        print(f"Added {added} cache rules to vercel.json" if added else "vercel.json cache rules up to date")
+    elif missing_cache_rules():
+        print(f"⚠ {VERCEL_CONFIG.name} is missing the versioned-asset cache rules (run with --write-vercel)")
+
+    referenced = local_references()
+    problems = []
+    if args.verify_db:
+        cases, rows = fetch_rows(args.base_url)
+        db_referenced, problems = verify_rows(index, cases, rows)
+        referenced |= db_referenced
+        print(f"Checked {len(rows)} evidence rows")
+
+    invalid = index.invalid()
+    print(f"\nInvalid files: {len(invalid)}")
+    for rel, error in invalid:
+        print(f"  ✗ {rel}: {error}")
+
+    duplicates = index.duplicates()
+    wasted = sum(index.files[paths[0]]["size"] * (len(paths) - 1) for _, paths in duplicates)
+    print(f"\nDuplicate groups: {len(duplicates)}" + (f" ({format_size(wasted)} redundant)" if wasted else ""))
+    for digest, paths in duplicates:
+        print(f"  {digest[:12]}  " + "\n                ".join(paths))
+
+    orphans = index.orphans(referenced)
+    print(f"\nOrphans: {len(orphans)}" + ("" if args.verify_db else " (without --verify-db, DB-only references are unknown)"))
+    for rel in orphans:
+        print(f"  ? {rel}")
+
+    if args.verify_db:
+        print(f"\nBroken evidence URLs: {len(problems)}")
+        for problem in problems:
+            print(f"  ✗ {problem}")
+
+    if invalid or problems:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
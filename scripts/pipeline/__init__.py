@@ -0,0 +1,7 @@
+"""
+SPECTER asset pipeline helpers
+Shared building blocks for the Python scripts in scripts/.
+
+The scripts are run directly (python3 scripts/<name>.py), which puts this
+directory on sys.path, so they can simply `from pipeline import ...`.
+"""
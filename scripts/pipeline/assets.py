@@ -0,0 +1,372 @@
+"""
+Integrity and dedup index of the published media.
+
+scan() walks public/evidence, public/audio and scripts/audio/clips and
+records, per file: size, mtime, sha256, kind and codec, image dimensions
+or audio duration/sample rate/channels/bitrate, and whether the file passes
+validate_asset(). Probing uses only the file headers (stdlib, no Pillow or
+ffmpeg), and the index is kept in scripts/.cache/assets.json; a file whose
+size and mtime are unchanged is not re-read, so a re-scan of an unchanged
+tree is a handful of stat() calls.
+
+On top of the index:
+
+    duplicates()  groups of byte-identical files
+    orphans()     files nothing refers to (asset registry, variants
+                  manifest, audio scripts, timeline outputs, DB URLs)
+    resolve(url)  the indexed file a site URL like /evidence/x.png serves
+
+Cache busting: files keep their stable names, and versioned(url) appends
+the first HASH_LENGTH hex digits of the content hash as ?v=. Those are the
+URLs stored in the database and listed in public/asset-versions.json, and
+cache_rules() are the matching vercel.json headers: versioned URLs are
+immutable for a year, bare ones always revalidate. A regenerated file gets
+a new ?v=, so clients fetch it once and never re-download unchanged ones.
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+from urllib.parse import urlencode, urlparse
+
+from pipeline.cache import CACHE_ROOT, InvalidAsset, file_hash, validate_asset
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+PUBLIC_DIR = REPO_ROOT / "public"
+AUDIO_DIR = Path(__file__).parent.parent / "audio"
+SCAN_ROOTS = (PUBLIC_DIR / "evidence", PUBLIC_DIR / "audio", AUDIO_DIR / "clips")
+INDEX_PATH = CACHE_ROOT / "assets.json"
+VERSIONS_PATH = PUBLIC_DIR / "asset-versions.json"
+VERCEL_CONFIG = REPO_ROOT / "vercel.json"
+
+VERSION_PARAM = "v"
+HASH_LENGTH = 10
+VERSIONED_SOURCE = "/(evidence|audio)/(.*)"
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=0, must-revalidate"
+
+KINDS = {
+    ".png": "image", ".jpg": "image", ".jpeg": "image", ".webp": "image", ".avif": "image",
+    ".mp3": "audio", ".wav": "audio", ".m4a": "audio", ".aac": "audio", ".ogg": "audio", ".opus": "audio",
+    ".m3u8": "playlist", ".ts": "audio", ".json": "data",
+}
+
+# MPEG audio: bitrate (kbps) by [version is MPEG-1][index], sample rate by version
+MP3_BITRATES = {
+    True: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    False: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+# --- probing -----------------------------------------------------------------
+
+def probe_png(data: bytes) -> dict:
+    width, height = struct.unpack(">II", data[16:24])
+    return {"codec": "png", "width": width, "height": height}
+
+
+def probe_jpeg(data: bytes) -> dict:
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return {"codec": "jpeg", "width": width, "height": height}
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+    return {"codec": "jpeg"}
+
+
+def probe_webp(data: bytes) -> dict:
+    chunk = data[12:16]
+    if chunk == b"VP8X":
+        width = 1 + int.from_bytes(data[24:27], "little")
+        height = 1 + int.from_bytes(data[27:30], "little")
+    elif chunk == b"VP8L":
+        bits = int.from_bytes(data[21:25], "little")
+        width, height = 1 + (bits & 0x3FFF), 1 + ((bits >> 14) & 0x3FFF)
+    elif chunk == b"VP8 ":
+        width, height = (v & 0x3FFF for v in struct.unpack("<HH", data[26:30]))
+    else:
+        return {"codec": "webp"}
+    return {"codec": "webp", "width": width, "height": height}
+
+
+def probe_wav(data: bytes) -> dict:
+    info = {"codec": "wav"}
+    i = 12
+    while i + 8 <= len(data):
+        chunk, size = data[i:i + 4], struct.unpack("<I", data[i + 4:i + 8])[0]
+        if chunk == b"fmt ":
+            fmt, channels, rate, byte_rate = struct.unpack("<HHII", data[i + 8:i + 20])
+            info.update(codec="pcm" if fmt == 1 else f"wav-{fmt}", channels=channels,
+                        sample_rate=rate, bitrate=byte_rate * 8)
+        elif chunk == b"data" and info.get("bitrate"):
+            info["duration"] = round(size * 8 / info["bitrate"], 3)
+            break
+        i += 8 + size + (size & 1)
+    return info
+
+
+def probe_mp3(data: bytes) -> dict:
+    """Walk the MPEG frames (after any ID3v2 tag) for an exact duration."""
+    i = 0
+    if data[:3] == b"ID3":
+        i = 10 + ((data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9])
+    frames = samples = bits = 0
+    info = {"codec": "mp3"}
+    while i + 4 <= len(data):
+        b1, b2, b3 = data[i + 1], data[i + 2], data[i + 3]
+        if data[i] != 0xFF or b1 & 0xE0 != 0xE0:
+            if frames:
+                break  # trailing ID3v1/APE tag
+            i += 1
+            continue
+        version, layer = (b1 >> 3) & 3, (b1 >> 1) & 3
+        bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 3
+        if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+            if frames:
+                break
+            i += 1
+            continue
+        mpeg1 = version == 3
+        bitrate = MP3_BITRATES[mpeg1][bitrate_index] * 1000
+        rate = MP3_SAMPLE_RATES[version][rate_index]
+        frame_samples = 1152 if mpeg1 else 576
+        size = frame_samples // 8 * bitrate // rate + ((b2 >> 1) & 1)
+        if not frames:
+            info.update(sample_rate=rate, channels=1 if b3 >> 6 == 3 else 2)
+        frames += 1
+        samples += frame_samples
+        bits += bitrate
+        i += size
+    if frames:
+        info.update(duration=round(samples / info["sample_rate"], 3), bitrate=bits // frames, frames=frames)
+    return info
+
+
+PROBES = {".png": probe_png, ".jpg": probe_jpeg, ".jpeg": probe_jpeg, ".webp": probe_webp,
+          ".wav": probe_wav, ".mp3": probe_mp3}
+
+
+def probe(path: Path) -> dict:
+    """Kind, codec and dimensions/duration of one file, plus its validity."""
+    suffix = path.suffix.lower()
+    info = {"kind": KINDS.get(suffix, "other")}
+    try:
+        validate_asset(path)
+        info["valid"] = True
+    except InvalidAsset as e:
+        info.update(valid=False, error=str(e))
+    probe_fn = PROBES.get(suffix)
+    if probe_fn:
+        with open(path, "rb") as f:
+            # Headers are enough for images; MP3 duration needs every frame header
+            data = f.read() if suffix == ".mp3" else f.read(64 * 1024)
+        try:
+            info.update(probe_fn(data))
+        except (struct.error, IndexError, KeyError):
+            info.update(valid=False, error=info.get("error") or f"{path.name}: unreadable header")
+    return info
+
+
+# --- index -------------------------------------------------------------------
+
+def relative(path: Path) -> str:
+    return Path(os.path.relpath(os.path.normpath(os.path.abspath(path)), REPO_ROOT)).as_posix()
+
+
+class AssetIndex:
+    """Index entries keyed by repo-relative path, persisted to INDEX_PATH."""
+
+    VERSION = 1
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = Path(path)
+        self.files = {}
+        self.rescanned = 0
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION:
+                    self.files = data.get("files", {})
+            except json.JSONDecodeError:
+                pass
+
+    def scan(self, roots=SCAN_ROOTS, full: bool = False):
+        """Bring the index up to date; unchanged (size, mtime) files are not re-read."""
+        seen = {}
+        self.rescanned = 0
+        for root in roots:
+            for directory, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if name.startswith(".") or name.endswith((".part", ".tmp")):
+                        continue
+                    path = Path(directory) / name
+                    stat = path.stat()
+                    rel = relative(path)
+                    entry = self.files.get(rel)
+                    if full or not entry or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                 "sha256": file_hash(path), **probe(path)}
+                        self.rescanned += 1
+                    seen[rel] = entry
+        changed = self.rescanned or seen.keys() != self.files.keys()
+        self.files = seen
+        if changed:
+            self.save()
+        return self
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": self.VERSION, "files": self.files}, f, indent=1, sort_keys=True)
+            f.write("\n")
+        tmp.replace(self.path)
+
+    def by_hash(self) -> dict:
+        groups = {}
+        for rel, entry in self.files.items():
+            groups.setdefault(entry["sha256"], []).append(rel)
+        return groups
+
+    def duplicates(self) -> list:
+        """[(sha256, [paths...])] for content stored more than once."""
+        return sorted((digest, sorted(paths)) for digest, paths in self.by_hash().items() if len(paths) > 1)
+
+    def invalid(self) -> list:
+        return sorted((rel, entry.get("error", "")) for rel, entry in self.files.items() if not entry.get("valid", True))
+
+    def orphans(self, referenced) -> list:
+        """Indexed paths not in `referenced` (repo-relative paths)."""
+        return sorted(rel for rel in self.files if rel not in referenced)
+
+    def resolve(self, url: str):
+        """(repo-relative path, entry or None) for a site URL; None for external URLs."""
+        parsed = urlparse(url)
+        if parsed.scheme or parsed.netloc or not parsed.path.startswith("/"):
+            return None, None
+        rel = relative(PUBLIC_DIR / parsed.path.lstrip("/"))
+        return rel, self.files.get(rel)
+
+    def versioned(self, url: str) -> str:
+        """`url` with ?v=<content hash prefix>; unchanged if it isn't an indexed file."""
+        path = urlparse(url).path
+        rel, entry = self.resolve(path)
+        if entry is None:
+            return url
+        return f"{path}?{urlencode({VERSION_PARAM: entry['sha256'][:HASH_LENGTH]})}"
+
+    def versions(self) -> dict:
+        """{site URL: versioned URL} for every indexed file under public/."""
+        public = relative(PUBLIC_DIR) + "/"
+        return {
+            f"/{rel[len(public):]}": f"/{rel[len(public):]}?{VERSION_PARAM}={entry['sha256'][:HASH_LENGTH]}"
+            for rel, entry in sorted(self.files.items()) if rel.startswith(public)
+        }
+
+    def write_versions(self, path: Path = VERSIONS_PATH) -> bool:
+        """Write versions() as JSON; returns True if the file changed."""
+        text = json.dumps(self.versions(), indent=2) + "\n"
+        if path.exists() and path.read_text() == text:
+            return False
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(text)
+        tmp.replace(path)
+        return True
+
+
+# --- caching headers ---------------------------------------------------------
+
+def cache_rules() -> list:
+    """vercel.json header rules matching versioned()'s URLs."""
+    def rule(condition: str, value: str) -> dict:
+        return {
+            "source": VERSIONED_SOURCE,
+            condition: [{"type": "query", "key": VERSION_PARAM}],
+            "headers": [{"key": "Cache-Control", "value": value}],
+        }
+    return [rule("has", IMMUTABLE), rule("missing", REVALIDATE)]
+
+
+def missing_cache_rules(config_path: Path = VERCEL_CONFIG) -> list:
+    with open(config_path) as f:
+        headers = json.load(f).get("headers", [])
+    return [rule for rule in cache_rules() if rule not in headers]
+
+
+def write_cache_rules(config_path: Path = VERCEL_CONFIG) -> int:
+    """Add any missing cache_rules() to vercel.json; returns how many were added."""
+    missing = missing_cache_rules(config_path)
+    if missing:
+        with open(config_path) as f:
+            config = json.load(f)
+        config.setdefault("headers", []).extend(missing)
+        with open(config_path, "w") as f:
+            json.dump(config, f, indent=2)
+            f.write("\n")
+    return len(missing)
+
+
+# --- references --------------------------------------------------------------
+
+def timeline_references(audio_dir: Path = AUDIO_DIR):
+    """Files the compiled timelines write: outputs, peaks, HLS segments and ladder renditions."""
+    refs = set()
+    for path in sorted(Path(audio_dir).glob("*.timeline.json")):
+        with open(path) as f:
+            data = json.load(f)
+        base = path.parent
+        refs.update(base / output for output in data.get("outputs", []))
+        if data.get("peaks"):
+            refs.add(base / data["peaks"])
+        if data.get("hls") and (base / data["hls"]).is_dir():
+            refs.update(p for p in (base / data["hls"]).rglob("*") if p.is_file())
+        name = data.get("name", path.name.split(".")[0])
+        ladder_manifest = base / data["ladder"] / f"{name}.json" if data.get("ladder") else None
+        if ladder_manifest and ladder_manifest.exists():
+            refs.add(ladder_manifest)
+            with open(ladder_manifest) as f:
+                refs.update(PUBLIC_DIR / r["url"].split("?")[0].lstrip("/") for r in json.load(f)["renditions"])
+    return refs
+
+
+def local_references():
+    """Repo-relative paths the pipeline itself declares: registry outputs, variants, clips, timelines."""
+    from pipeline.images import OUTPUT_DIR
+    from pipeline.registry import load_registry
+    from pipeline.script_parser import find_scripts, parse_script
+    from pipeline.tts import CLIPS_DIR
+    from pipeline.variants import load_manifest
+
+    evidence = load_registry().evidence
+    refs = {OUTPUT_DIR / ev.filename for ev in evidence}
+    refs.update(PUBLIC_DIR / "audio" / ev.audio for ev in evidence if ev.audio)
+    for entry in load_manifest().values():
+        for variants in entry.get("sources", {}).values():
+            refs.update(PUBLIC_DIR / v["url"].lstrip("/") for v in variants)
+    for script_path in find_scripts():
+        refs.update(CLIPS_DIR / job["filename"] for job in parse_script(script_path).jobs)
+    refs.update(timeline_references())
+    return {relative(path) for path in refs}
+
+
+def row_urls(row: dict):
+    """(field, url) pairs an evidence row points at, including image variants."""
+    for name in ("image_url", "audio_url", "video_url", "file_url"):
+        if row.get(name):
+            yield name, row[name]
+    image = (row.get("metadata") or {}).get("image") or {}
+    for fmt, variants in (image.get("sources") or {}).items():
+        for variant in variants:
+            yield f"metadata.image.{fmt}", variant["url"]
@@ -0,0 +1,101 @@
+"""
+On-disk cache of decoded and processed audio.
+
+Arrays are stored as .npy files under scripts/.cache/audio/, named by a key
+that hashes everything they depend on: the source file contents for decoded
+clips, plus gain and effect parameters for processed cues. Re-rendering a
+timeline after changing one gap or effect reloads every other cue from
+disk instead of decoding and processing it again. Every key also includes
+cache.AUDIO_CACHE_VERSION, which is bumped when the DSP code changes.
+
+Hits are opened with np.load(mmap_mode="r"): an .npy file is the raw
+float32 samples behind a small header, so the array is an np.memmap over
+the page cache rather than a copy. Loading dozens of clips costs a few
+page-table entries, not a decode or a read, and concurrent renders (or
+benchmark workers) share the same physical pages. The arrays are
+read-only; every mixer and effect operation already returns a new array.
+
+Source files are keyed by content hash. The hash is remembered per
+(path, size, mtime) in sources.json, so a warm run doesn't even re-read
+the MP3s.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from pipeline import telemetry
+from pipeline.cache import AUDIO_CACHE_VERSION, CACHE_ROOT, cache_key, file_hash
+from pipeline.mixer import np
+
+AUDIO_CACHE_DIR = CACHE_ROOT / "audio"
+
+
+class AudioCache:
+    """Key -> float32 array store backed by .npy files."""
+
+    def __init__(self, directory: Path = AUDIO_CACHE_DIR, mmap: bool = True):
+        self.directory = Path(directory)
+        self.mmap = mmap
+        self.hits = 0
+        self.misses = 0
+        self._file_hashes = None
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def get_or_build(self, key: str, build):
+        """Return the cached array for key, calling build() and storing it on a miss."""
+        path = self.path(key)
+        if path.exists():
+            self.hits += 1
+            telemetry.cache("audio", True, key=key[:12])
+            return self._load(path)
+        self.misses += 1
+        telemetry.cache("audio", False, key=key[:12])
+        audio = build()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, audio)
+        tmp.replace(path)
+        # Hand back the mapped file, so a fresh build doesn't stay on the heap either
+        return self._load(path) if self.mmap else audio
+
+    def _load(self, path: Path):
+        try:
+            return np.load(path, mmap_mode="r" if self.mmap else None)
+        except ValueError:
+            return np.load(path)  # zero-length arrays can't be mapped
+
+    @property
+    def sources_path(self) -> Path:
+        return self.directory / "sources.json"
+
+    def _source_hash(self, path: Path) -> str:
+        """Content hash of a source file, reused while its size and mtime are unchanged."""
+        if self._file_hashes is None:
+            try:
+                with open(self.sources_path) as f:
+                    self._file_hashes = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._file_hashes = {}
+        stat = path.stat()
+        known = self._file_hashes.get(str(path))
+        if known and known[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return known[2]
+        digest = file_hash(path)
+        self._file_hashes[str(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.sources_path.with_name(f"sources.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._file_hashes, f, indent=1, sort_keys=True)
+        tmp.replace(self.sources_path)
+        return digest
+
+    def source_key(self, path: Path, **params) -> str:
+        """Key for a source file: its content hash plus decode parameters."""
+        return cache_key(kind="source", version=AUDIO_CACHE_VERSION,
+                         sha256=self._source_hash(Path(path).resolve()), **params)
+
+    def stats(self) -> str:
+        return f"{self.hits} cached, {self.misses} rebuilt"
@@ -0,0 +1,265 @@
+"""
+Content-addressed cache and output manifest.
+
+Generated assets are keyed by a hash of everything that determines their
+content (prompt, model, size, ...). Blobs live in a local cache directory
+named by key; a manifest next to the published outputs records which key
+each output file was built from, so only outputs whose key changed need to
+be rebuilt.
+
+Every blob and output is written through atomic_write(): the bytes go to a
+`.part` file next to the target, are checked by validate_asset() (size and
+format), and only then renamed into place. A killed run therefore leaves
+either the previous file or a stray `.part`, never a truncated asset that
+a later "already exists" check would accept.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+CACHE_ROOT = Path(__file__).parent.parent / ".cache"
+
+# Smallest plausible size per format; anything shorter is a failed write
+MIN_ASSET_BYTES = {".png": 67, ".jpg": 125, ".webp": 26, ".mp3": 417, ".wav": 44}
+
+
+class InvalidAsset(ValueError):
+    """A written file is empty, truncated or not in the format its name claims."""
+
+
+def _check_png(head: bytes, tail: bytes, size: int):
+    if head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        raise InvalidAsset("missing PNG signature")
+    if tail[-8:-4] != b"IEND":
+        raise InvalidAsset("PNG is truncated (no IEND chunk)")
+
+
+def _check_jpeg(head: bytes, tail: bytes, size: int):
+    if head[:3] != b"\xff\xd8\xff":
+        raise InvalidAsset("missing JPEG signature")
+    if b"\xff\xd9" not in tail[-16:]:
+        raise InvalidAsset("JPEG is truncated (no EOI marker)")
+
+
+def _check_riff(form: bytes):
+    def check(head: bytes, tail: bytes, size: int):
+        if head[:4] != b"RIFF" or head[8:12] != form:
+            raise InvalidAsset(f"missing RIFF/{form.decode()} header")
+        declared = struct.unpack("<I", head[4:8])[0] + 8
+        if declared > size:
+            raise InvalidAsset(f"{form.decode().strip()} is truncated ({size} of {declared} bytes)")
+    return check
+
+
+def _check_mp3(head: bytes, tail: bytes, size: int):
+    if head[:3] != b"ID3" and not (head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        raise InvalidAsset("missing ID3 tag or MPEG frame sync")
+
+
+def _check_ogg(head: bytes, tail: bytes, size: int):
+    if head[:4] != b"OggS":
+        raise InvalidAsset("missing Ogg page header")
+
+
+def _check_mp4(head: bytes, tail: bytes, size: int):
+    if head[4:8] != b"ftyp":
+        raise InvalidAsset("missing ISO-BMFF ftyp box")
+
+
+FORMAT_CHECKS = {
+    ".png": _check_png,
+    ".jpg": _check_jpeg,
+    ".jpeg": _check_jpeg,
+    ".webp": _check_riff(b"WEBP"),
+    ".wav": _check_riff(b"WAVE"),
+    ".mp3": _check_mp3,
+    ".ogg": _check_ogg,
+    ".opus": _check_ogg,
+    ".m4a": _check_mp4,
+    ".avif": _check_mp4,
+}
+
+
+def validate_asset(path: Path, suffix: str = None, expected_size: int = None, name: str = None):
+    """Raise InvalidAsset unless `path` looks like a complete file of its type.
+
+    The format is taken from `suffix` (default: the path's own suffix); only
+    the first and last few bytes are read, so this is cheap enough to run on
+    every cache hit. Unknown formats only have to be non-empty.
+    """
+    path = Path(path)
+    suffix = (suffix or path.suffix).lower()
+    name = name or path.name
+    size = path.stat().st_size
+    if expected_size is not None and size != expected_size:
+        raise InvalidAsset(f"{name}: {size} bytes, expected {expected_size}")
+    if size < MIN_ASSET_BYTES.get(suffix, 1):
+        raise InvalidAsset(f"{name}: only {size} bytes")
+    check = FORMAT_CHECKS.get(suffix)
+    if check:
+        with open(path, "rb") as f:
+            head = f.read(16)
+            f.seek(max(0, size - 16))
+            tail = f.read(16)
+        try:
+            check(head, tail, size)
+        except InvalidAsset as e:
+            raise InvalidAsset(f"{name}: {e}") from None
+
+
+def is_valid_asset(path: Path, suffix: str = None) -> bool:
+    try:
+        validate_asset(path, suffix)
+    except (InvalidAsset, OSError):
+        return False
+    return True
+
+
+def partial_path(path: Path) -> Path:
+    """Per-writer temp name next to `path`, so concurrent writers never collide."""
+    path = Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.part")
+
+
+@contextmanager
+def atomic_write(path: Path, validate: bool = True, expected_size: int = None):
+    """Write `path` via a temp file that is validated, fsynced and renamed into place.
+
+        with atomic_write(output_path) as f:
+            for chunk in stream:
+                f.write(chunk)
+
+    On any error (including InvalidAsset) the temp file is removed and the
+    previous contents of `path`, if any, are left untouched.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = partial_path(path)
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if validate:
+            validate_asset(tmp, path.suffix, expected_size, name=path.name)
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_copy(source: Path, destination: Path, validate: bool = True) -> Path:
+    with open(source, "rb") as src, atomic_write(destination, validate) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    return Path(destination)
+
+
+def sweep_partials(directory: Path) -> int:
+    """Delete `.part` files left behind by killed writers; returns how many."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    for part in directory.glob("*.part"):
+        part.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+# Part of every audio cache key (decoded clips, SFX, processed cues, beds)
+# and of the mix fingerprint. Bump it whenever decoding, a generator or an
+# effect changes what it produces for the same parameters, so audio built
+# by the old code is never served again.
+#   2: seeded NumPy noise replaced the pydub static/hum generators
+#   3: pitch_shift output realigned with its input
+AUDIO_CACHE_VERSION = 3
+
+
+def cache_key(**params) -> str:
+    """Stable sha256 over the given parameters (order-independent)."""
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentCache:
+    """Directory of blobs named `<key><suffix>`."""
+
+    def __init__(self, directory: Path, suffix: str = ""):
+        self.directory = Path(directory)
+        self.suffix = suffix
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def has(self, key: str) -> bool:
+        """True if a complete, valid blob is cached under `key`."""
+        return is_valid_asset(self.path(key))
+
+    def store(self, key: str, source: Path) -> Path:
+        """Copy `source` into the cache under `key`."""
+        target = self.path(key)
+        if Path(source).resolve() != target.resolve():
+            atomic_copy(source, target)
+        return target
+
+    def materialize(self, key: str, destination: Path) -> Path:
+        """Copy the cached blob for `key` to `destination`."""
+        return atomic_copy(self.path(key), destination)
+
+
+class Manifest:
+    """JSON file mapping output names to the cache key they were built from."""
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                data = json.load(f)
+            self.entries = data.get("entries", {})
+
+    def key_for(self, name: str):
+        entry = self.entries.get(name)
+        return entry.get("key") if entry else None
+
+    def is_current(self, name: str, key: str, output: Path) -> bool:
+        """Built from `key`, present, and (if recorded) still the size it was written at."""
+        if self.key_for(name) != key:
+            return False
+        try:
+            size = Path(output).stat().st_size
+        except OSError:
+            return False
+        return self.entries[name].get("size", size) == size
+
+    def record(self, name: str, key: str, output: Path = None, **extra):
+        """Record `name` as built from `key`; pass `output` to also pin its size."""
+        entry = {"key": key, **extra}
+        if output is not None:
+            entry["size"] = Path(output).stat().st_size
+        self.entries[name] = entry
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": self.VERSION, "entries": self.entries}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        tmp.replace(self.path)
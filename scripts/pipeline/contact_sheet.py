@@ -0,0 +1,118 @@
+"""
+Local HTML contact sheets for picking among generated image candidates.
+
+One page per case, in scripts/.cache/contact-sheets/<case>.html, shows
+every candidate of every prompted evidence image side by side, straight
+from the image cache. Picking one per row fills in a selection file, e.g.
+
+    {"hartwell-thermal.png": 2, "blackwood-floor-plan.png": 0}
+
+which generate-evidence-images.py --select promotes without any API calls.
+"""
+
+import html
+import json
+import os
+from pathlib import Path
+
+from pipeline.images import CONTACT_SHEET_DIR, candidate_key, selected_candidate
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title} - candidates</title>
+<style>
+  body {{ background: #0b0d0c; color: #c8d3cc; font: 14px/1.4 ui-monospace, monospace; margin: 24px; }}
+  h1 {{ font-size: 18px; color: #7cf0a8; }}
+  section {{ border-top: 1px solid #223; padding: 16px 0; }}
+  h2 {{ font-size: 15px; margin: 0 0 4px; }}
+  .prompt {{ color: #8a958f; max-width: 1100px; margin-bottom: 12px; }}
+  .row {{ display: flex; gap: 12px; flex-wrap: wrap; }}
+  label {{ display: block; width: 256px; cursor: pointer; }}
+  label img, .missing {{ width: 256px; height: 256px; object-fit: cover; border: 3px solid #223; }}
+  .missing {{ display: flex; align-items: center; justify-content: center; color: #667; }}
+  input:checked + img {{ border-color: #7cf0a8; }}
+  input {{ display: none; }}
+  textarea {{ width: 100%; max-width: 1100px; height: 140px; background: #111; color: #7cf0a8; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>Pick one image per row, then save the selection and run:<br>
+<code>python3 scripts/generate-evidence-images.py --select {selection_name}</code></p>
+{sections}
+<h2>Selection</h2>
+<textarea id="selection" readonly></textarea>
+<p><a id="download" download="{selection_name}" href="#">Save {selection_name}</a></p>
+<script>
+  function update() {{
+    const picks = {{}};
+    for (const input of document.querySelectorAll("input:checked")) picks[input.name] = Number(input.value);
+    const text = JSON.stringify(picks, null, 2) + "\\n";
+    document.getElementById("selection").value = text;
+    document.getElementById("download").href = "data:application/json," + encodeURIComponent(text);
+  }}
+  document.addEventListener("change", update);
+  update();
+</script>
+</body>
+</html>
+"""
+
+
+def render_contact_sheet(title: str, evidence, cache, manifest, count: int, directory: Path,
+                         selection_name: str) -> str:
+    sections = []
+    for img in evidence:
+        if not img.prompt:
+            continue
+        selected = selected_candidate(img, manifest)
+        tiles = []
+        for index in range(count):
+            key = candidate_key(img.prompt, index)
+            if cache.has(key):
+                src = html.escape(Path(os.path.relpath(cache.path(key), directory)).as_posix())
+                checked = " checked" if index == selected else ""
+                tiles.append(f'<label><input type="radio" name="{html.escape(img.filename)}" value="{index}"'
+                             f'{checked}><img src="{src}" loading="lazy" alt="candidate {index}">'
+                             f'#{index}{" (current)" if index == selected else ""}</label>')
+            else:
+                tiles.append(f'<label><div class="missing">#{index} not generated</div></label>')
+        sections.append(
+            f"<section><h2>{html.escape(img.number)} {html.escape(img.label)} "
+            f"&mdash; {html.escape(img.filename)}</h2>"
+            f'<div class="prompt">{html.escape(img.prompt)}</div>'
+            f'<div class="row">{"".join(tiles)}</div></section>'
+        )
+    return PAGE.format(title=html.escape(title), selection_name=html.escape(selection_name),
+                       sections="\n".join(sections))
+
+
+def write_contact_sheets(registry, cases, cache, manifest, count: int, directory: Path = CONTACT_SHEET_DIR):
+    """One sheet per case number in `cases`; returns the written paths."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for case in registry.cases:
+        if case["case_number"] not in cases:
+            continue
+        name = case["name"].lower()
+        path = directory / f"{name}.html"
+        page = render_contact_sheet(f"Case {case['case_number']}: {case['title']}",
+                                    registry.case(case["case_number"]), cache, manifest, count, directory,
+                                    f"selection-{name}.json")
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(page)
+        tmp.replace(path)
+        written.append(path)
+    return written
+
+
+def load_selection(path: Path) -> dict:
+    """{filename: candidate index} from a selection file."""
+    with open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not all(isinstance(v, int) and v >= 0 for v in data.values()):
+        raise ValueError(f"{path}: expected {{\"<image filename>\": <candidate number>, ...}}")
+    return data
@@ -0,0 +1,112 @@
+"""
+Minimal build graph with fingerprint-based staleness.
+
+Each node has a fingerprint function (computed once its dependencies have
+finished, so it can hash their outputs) and a run function. A node re-runs
+only when its fingerprint differs from the one recorded after its last
+successful run, or when one of its outputs is missing. Ready nodes in the
+same wave run concurrently.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from pipeline import telemetry
+from pipeline.cache import CACHE_ROOT
+
+STATE_PATH = CACHE_ROOT / "pipeline-state.json"
+
+
+@dataclass
+class Node:
+    name: str
+    fingerprint: Callable[[], str]
+    run: Callable[[], None]
+    deps: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+
+
+class Graph:
+    def __init__(self, state_path: Path = STATE_PATH):
+        self.state_path = Path(state_path)
+        self.nodes = {}
+        self.state = {}
+        if self.state_path.exists():
+            with open(self.state_path) as f:
+                self.state = json.load(f)
+
+    def add(self, node: Node) -> Node:
+        self.nodes[node.name] = node
+        return node
+
+    def is_stale(self, node: Node, fingerprint: str) -> bool:
+        return self.state.get(node.name) != fingerprint or not all(Path(p).exists() for p in node.outputs)
+
+    def save(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        tmp.replace(self.state_path)
+
+    def _run_node(self, node: Node):
+        with telemetry.span(node.name):
+            node.run()
+
+    def run(self, workers: int = 4, dry_run: bool = False, on_status=None) -> dict:
+        """Execute stale nodes in dependency order.
+
+        Returns {name: status} with status one of "fresh", "ran", "stale"
+        (dry run), "failed" or "blocked" (a dependency failed).
+        on_status(name, status, error) is called as each node settles.
+        """
+        status = {}
+        remaining = dict(self.nodes)
+
+        def settle(name, result, error=None):
+            status[name] = result
+            if on_status:
+                on_status(name, result, error)
+
+        while remaining:
+            ready = [n for n in remaining.values() if all(d in status for d in n.deps)]
+            if not ready:
+                raise ValueError(f"dependency cycle among: {', '.join(remaining)}")
+
+            to_run = []
+            for node in ready:
+                del remaining[node.name]
+                if any(status[d] in ("failed", "blocked") for d in node.deps):
+                    settle(node.name, "blocked")
+                    continue
+                if dry_run and any(status[d] == "stale" for d in node.deps):
+                    # Can't fingerprint against outputs that haven't been rebuilt yet
+                    settle(node.name, "stale")
+                    continue
+                fingerprint = node.fingerprint()
+                if not self.is_stale(node, fingerprint):
+                    settle(node.name, "fresh")
+                elif dry_run:
+                    settle(node.name, "stale")
+                else:
+                    to_run.append((node, fingerprint))
+
+            run_node = telemetry.profiled(self._run_node)
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                futures = [(node, fingerprint, pool.submit(run_node, node)) for node, fingerprint in to_run]
+                for node, fingerprint, future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        settle(node.name, "failed", e)
+                        continue
+                    self.state[node.name] = fingerprint
+                    settle(node.name, "ran")
+
+            if to_run:
+                self.save()
+
+        return status
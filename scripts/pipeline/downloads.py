@@ -0,0 +1,249 @@
+"""
+Pooled, resumable HTTP downloads for generated assets.
+
+One Downloader is shared by all the workers of a batch. Its requests
+session keeps at most `pool_size` keep-alive connections per host (workers
+wait for a free one instead of opening more), every request has a connect
+and a read timeout, and bodies are streamed to disk in chunks, never held
+in memory:
+
+    downloader = Downloader(pool_size=args.concurrency)
+    downloader.fetch(url, cache.path(key), operation="image.download")
+
+GET downloads land in <output>.download with a small .download.json
+sidecar (URL and ETag/Last-Modified). If the transfer breaks off, the
+partial file is kept and the next attempt sends a Range request, with
+If-Range so a changed file restarts from zero instead of being spliced.
+Other methods (e.g. a TTS POST) write to a per-writer .part file, since
+they can't be resumed.
+
+A finished file must match the announced length, any checksum the caller
+passes (sha256) or the server sends (Content-MD5, x-ms-blob-content-md5,
+x-goog-hash) and validate_asset() before it is renamed into place. A
+checksum mismatch discards the partial file and raises ChecksumMismatch,
+which with_retries() treats as retryable.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from pipeline import telemetry
+from pipeline.cache import InvalidAsset, partial_path, validate_asset
+from pipeline.ratelimit import RETRYABLE_STATUSES, RetryableError
+
+DEFAULT_POOL_SIZE = 8
+CONNECT_TIMEOUT = 10  # seconds
+READ_TIMEOUT = 60     # seconds between bytes, not for the whole body
+CHUNK_SIZE = 64 * 1024
+RESUME_SUFFIX = ".download"
+
+
+class ChecksumMismatch(RetryableError):
+    """A completed download doesn't match its expected digest."""
+
+
+def resume_path(output_path: Path) -> Path:
+    """Stable partial-file name for a resumable download of output_path."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + RESUME_SUFFIX)
+
+
+def _state_path(partial: Path) -> Path:
+    return partial.with_name(partial.name + ".json")
+
+
+def _discard(partial: Path):
+    partial.unlink(missing_ok=True)
+    _state_path(partial).unlink(missing_ok=True)
+
+
+def sweep_downloads(directory: Path, max_age: float) -> int:
+    """Delete resumable partial downloads older than max_age seconds; returns how many."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    cutoff = time.time() - max_age
+    for partial in directory.glob(f"*{RESUME_SUFFIX}"):
+        if partial.stat().st_mtime < cutoff:
+            _discard(partial)
+            removed += 1
+    return removed
+
+
+def _server_md5(headers, whole_body: bool):
+    """Hex MD5 of the whole file, if the server announced one."""
+    value = headers.get("x-ms-blob-content-md5") or (headers.get("Content-MD5") if whole_body else None)
+    if not value:
+        for part in (headers.get("x-goog-hash") or "").split(","):
+            name, _, digest = part.strip().partition("=")
+            if name == "md5":
+                value = digest
+    if not value:
+        return None
+    try:
+        return base64.b64decode(value).hex()
+    except ValueError:
+        return None
+
+
+def _digests(path: Path):
+    sha256, md5 = hashlib.sha256(), hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(chunk)
+            md5.update(chunk)
+    return sha256.hexdigest(), md5.hexdigest()
+
+
+class Downloader:
+    """A pooled requests session that streams responses into validated files."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 headers: dict = None, service: str = "http"):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._requests = requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True,
+                              max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(headers or {})
+        self.timeout = timeout
+        self.service = service
+        self.stats = {"requests": 0, "bytes": 0, "resumed": 0}
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def fetch(self, url: str, output_path: Path, method: str = "GET", expected_size: int = None,
+              sha256: str = None, validate: bool = True, operation: str = "download", attrs: dict = None,
+              **kwargs) -> Path:
+        """Stream `url` into output_path, resuming a previous partial GET.
+
+        Raises RetryableError on 429/5xx, dropped connections and timeouts
+        (keeping a resumable partial), ChecksumMismatch, InvalidAsset for a
+        file that isn't what its name says, and requests.HTTPError otherwise.
+        attrs are added to the telemetry event; other kwargs go to requests.
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        resumable = method.upper() == "GET"
+        partial = resume_path(output_path) if resumable else partial_path(output_path)
+        headers = dict(kwargs.pop("headers", None) or {})
+
+        offset = 0
+        if resumable and partial.exists():
+            try:
+                with open(_state_path(partial)) as f:
+                    state = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                state = {}
+            if state.get("url") == url and partial.stat().st_size > 0:
+                offset = partial.stat().st_size
+                headers["Range"] = f"bytes={offset}-"
+                if state.get("validator"):
+                    headers["If-Range"] = state["validator"]
+            else:
+                _discard(partial)
+
+        with telemetry.api_call(self.service, operation, file=output_path.name, **(attrs or {})) as call:
+            try:
+                with self.session.request(method, url, headers=headers, stream=True, timeout=self.timeout,
+                                          **kwargs) as response:
+                    call["http_status"] = response.status_code
+                    self._count(requests=1)
+                    if response.status_code in RETRYABLE_STATUSES:
+                        retry_after = response.headers.get("Retry-After")
+                        raise RetryableError(
+                            f"{operation} returned {response.status_code}",
+                            status=response.status_code,
+                            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+                        )
+                    if response.status_code == 416:
+                        _discard(partial)
+                        raise RetryableError(f"{operation}: stale partial file, restarting", status=416)
+                    response.raise_for_status()
+
+                    total = None
+                    if response.status_code == 206:
+                        start, _, size = response.headers.get("Content-Range", "").partition(" ")[2].partition("/")
+                        if not start.startswith(f"{offset}-"):
+                            _discard(partial)
+                            raise RetryableError(f"{operation}: server resumed at the wrong offset, restarting")
+                        total = int(size) if size.isdigit() else None
+                        self._count(resumed=1)
+                        call["resumed_from"] = offset
+                    else:
+                        offset = 0
+                        length = response.headers.get("Content-Length")
+                        if length and length.isdigit() and not response.headers.get("Content-Encoding"):
+                            total = int(length)
+                    server_md5 = _server_md5(response.headers, whole_body=response.status_code == 200)
+
+                    if resumable:
+                        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+                        with open(_state_path(partial), "w") as f:
+                            json.dump({"url": url, "validator": validator}, f)
+
+                    call["bytes"] = 0
+                    with open(partial, "ab" if offset else "wb") as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            f.write(chunk)
+                            call["bytes"] += len(chunk)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._count(bytes=call["bytes"])
+            except self._requests.exceptions.HTTPError:
+                _discard(partial)
+                raise
+            except (self._requests.ConnectionError, self._requests.Timeout,
+                    self._requests.exceptions.ChunkedEncodingError) as e:
+                if not resumable:
+                    _discard(partial)
+                raise RetryableError(f"{operation} interrupted: {e}") from e
+
+            self._finish(partial, output_path, expected_size or total, sha256, server_md5, resumable, validate)
+        return output_path
+
+    def _finish(self, partial: Path, output_path: Path, expected_size, sha256, server_md5, resumable: bool,
+                validate: bool):
+        size = partial.stat().st_size
+        if expected_size is not None and size < expected_size and resumable:
+            raise RetryableError(f"{output_path.name}: connection closed at {size} of {expected_size} bytes")
+        try:
+            if sha256 or server_md5:
+                actual_sha256, actual_md5 = _digests(partial)
+                if sha256 and actual_sha256 != sha256:
+                    raise ChecksumMismatch(f"{output_path.name}: sha256 {actual_sha256[:12]}, "
+                                           f"expected {sha256[:12]}")
+                if server_md5 and actual_md5 != server_md5:
+                    raise ChecksumMismatch(f"{output_path.name}: md5 {actual_md5}, server sent {server_md5}")
+            if validate:
+                validate_asset(partial, output_path.suffix, expected_size, name=output_path.name)
+            elif expected_size is not None and size != expected_size:
+                raise InvalidAsset(f"{output_path.name}: {size} of {expected_size} bytes")
+        except (ChecksumMismatch, InvalidAsset):
+            _discard(partial)
+            raise
+        partial.replace(output_path)
+        _state_path(partial).unlink(missing_ok=True)
+
+    def _count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self.stats[name] += amount
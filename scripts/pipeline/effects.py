@@ -0,0 +1,167 @@
+"""
+Vectorized DSP effects for timeline cues.
+
+Every effect takes a float32 (samples, channels) array and returns a new
+one, working on the whole array at once (FFT convolution, a frame-batched
+phase vocoder, elementwise waveshaping), so adding effects to a cue costs a
+few array passes rather than a Python loop over samples or overlays.
+
+Randomness (impulse responses, noise) is seeded, so a cue renders the same
+every time and processed cues can be cached by their parameters.
+"""
+
+from functools import lru_cache
+
+try:
+    from scipy.signal import fftconvolve
+except ImportError:
+    print("Error: numpy, scipy and pydub are required.")
+    print("Run: pip install numpy scipy pydub")
+    exit(1)
+
+from pipeline.mixer import (
+    CHANNELS,
+    SAMPLE_RATE,
+    apply_gain,
+    low_pass,
+    ms_to_samples,
+    np,
+)
+from pipeline.noise import FilteredNoise
+
+PITCH_FFT_SIZE = 2048
+PITCH_HOP = PITCH_FFT_SIZE // 4
+
+
+@lru_cache(maxsize=16)
+def impulse_response(rt60_s: float = 1.5, predelay_ms: float = 20, damping_hz: float = 6000,
+                     early_reflections: int = 6, seed: int = 0, sample_rate: int = SAMPLE_RATE):
+    """Synthetic room impulse response, shape (samples,).
+
+    A few discrete early reflections followed by exponentially decaying
+    noise that falls 60 dB over rt60_s and is low-passed at damping_hz, so
+    the tail darkens like a real room. The result is cached and read-only.
+    """
+    rng = np.random.default_rng(seed)
+    predelay = ms_to_samples(predelay_ms, sample_rate)
+    length = predelay + int(rt60_s * sample_rate)
+    t = np.arange(length - predelay) / sample_rate
+
+    tail = rng.standard_normal(length - predelay) * 10 ** (-3.0 * t / rt60_s)
+    tail = low_pass(tail[:, None].astype(np.float32), damping_hz, sample_rate)[:, 0]
+
+    ir = np.zeros(length, dtype=np.float32)
+    ir[predelay:] = tail * np.float32(0.5)
+    positions = rng.integers(1, predelay + ms_to_samples(40, sample_rate), early_reflections)
+    levels = rng.uniform(0.2, 0.5, early_reflections) * rng.choice([-1.0, 1.0], early_reflections)
+    ir[positions] += levels.astype(np.float32)
+
+    # Unit energy, so `wet` sets the reverb level independent of rt60
+    ir /= np.float32(np.sqrt(np.sum(ir.astype(np.float64) ** 2)) or 1.0)
+    ir.setflags(write=False)
+    return ir
+
+
+def convolution_reverb(audio, rt60_s: float = 1.5, wet: float = 0.3, predelay_ms: float = 20,
+                       damping_hz: float = 6000, seed: int = 0, keep_tail: bool = True,
+                       sample_rate: int = SAMPLE_RATE):
+    """FFT convolution with a generated impulse response.
+
+    wet is the reverb level relative to the dry signal (0-1). With keep_tail
+    the output runs on for the length of the decay; otherwise it is trimmed
+    to the input length.
+    """
+    ir = impulse_response(rt60_s, predelay_ms, damping_hz, seed=seed, sample_rate=sample_rate)
+    reverb = fftconvolve(audio, ir[:, None], axes=0).astype(np.float32)
+    if not keep_tail:
+        reverb = reverb[:audio.shape[0]]
+    out = reverb * np.float32(wet)
+    out[:audio.shape[0]] += audio * np.float32(1.0 - wet)
+    return out
+
+
+def _stft(x, n_fft: int, hop: int, window):
+    padded = np.pad(x, (n_fft, 2 * n_fft))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop]
+    return np.fft.rfft(frames * window, axis=1)
+
+
+def _istft(spectrum, n_fft: int, hop: int, window, length: int, offset: int = None):
+    """Overlap-add frames back to a signal; returns `length` samples from `offset`.
+
+    offset defaults to n_fft, the padding _stft adds in front. A stretched
+    spectrum starts its signal at that padding times the stretch factor.
+    """
+    frames = np.fft.irfft(spectrum, n=n_fft, axis=1) * window
+    n = (frames.shape[0] - 1) * hop + n_fft
+    positions = (np.arange(frames.shape[0])[:, None] * hop + np.arange(n_fft)).ravel()
+    out = np.bincount(positions, weights=frames.ravel(), minlength=n)
+    norm = np.bincount(positions, weights=np.tile(window ** 2, frames.shape[0]), minlength=n)
+    out = out / np.maximum(norm, 1e-8)
+    offset = n_fft if offset is None else offset
+    return out[offset:offset + length]
+
+
+def _time_stretch(x, factor: float, n_fft: int = PITCH_FFT_SIZE, hop: int = PITCH_HOP):
+    """Phase-vocoder stretch of a 1-D signal to `factor` times its length."""
+    window = np.hanning(n_fft)
+    spectrum = _stft(x, n_fft, hop, window)
+    steps = np.arange(0, spectrum.shape[0] - 1, 1.0 / factor)
+    i0 = steps.astype(int)
+    frac = (steps - i0)[:, None]
+
+    magnitude = (1 - frac) * np.abs(spectrum[i0]) + frac * np.abs(spectrum[i0 + 1])
+    expected = 2 * np.pi * hop * np.arange(spectrum.shape[1]) / n_fft
+    delta = np.angle(spectrum[i0 + 1]) - np.angle(spectrum[i0]) - expected
+    delta -= 2 * np.pi * np.round(delta / (2 * np.pi))
+    advance = expected + delta
+    phase = np.angle(spectrum[0]) + np.cumsum(np.vstack([np.zeros_like(advance[:1]), advance[:-1]]), axis=0)
+
+    return _istft(magnitude * np.exp(1j * phase), n_fft, hop, window, int(round(len(x) * factor)),
+                  offset=int(round(n_fft * factor)))
+
+
+def pitch_shift(audio, semitones: float, sample_rate: int = SAMPLE_RATE):
+    """Shift pitch by `semitones` while keeping the duration.
+
+    The signal is time-stretched by the pitch ratio with a phase vocoder and
+    then resampled back to its original length.
+    """
+    if not semitones or not audio.shape[0]:
+        return audio
+    ratio = 2 ** (semitones / 12.0)
+    n = audio.shape[0]
+    out = np.empty_like(audio)
+    for ch in range(audio.shape[1]):
+        stretched = _time_stretch(audio[:, ch].astype(np.float64), ratio)
+        out[:, ch] = np.interp(np.arange(n) * ratio, np.arange(len(stretched)), stretched)
+    return out
+
+
+def saturate(audio, drive_db: float = 12.0, bias: float = 0.1, tone_hz: float = None, mix: float = 1.0,
+             sample_rate: int = SAMPLE_RATE):
+    """Tape-style saturation: asymmetric tanh soft clipping.
+
+    The bias adds even harmonics; tone_hz optionally rolls off the top end
+    the way tape does. Output peak level roughly matches the input.
+    """
+    gain = np.float32(10 ** (drive_db / 20.0))
+    bias = np.float32(bias)
+    shaped = (np.tanh(gain * audio + bias) - np.tanh(bias)) / np.float32(np.tanh(gain))
+    shaped = shaped.astype(np.float32)
+    if tone_hz:
+        shaped = low_pass(shaped, tone_hz, sample_rate)
+    if mix >= 1.0:
+        return shaped
+    return audio * np.float32(1.0 - mix) + shaped * np.float32(mix)
+
+
+def band_noise(duration_ms: float = 1000, low_hz: float = 300, high_hz: float = 3000, volume: float = -20,
+               seed: int = 0, order: int = 4, channels: int = CHANNELS, sample_rate: int = SAMPLE_RATE):
+    """White noise band-passed to [low_hz, high_hz], peak-scaled to `volume` dBFS."""
+    filtered = FilteredNoise(low_hz, high_hz, order=order, seed=seed, channels=channels,
+                             sample_rate=sample_rate).render(duration_ms)
+    peak = float(np.max(np.abs(filtered))) if filtered.size else 0.0
+    if peak:
+        filtered /= peak
+    return apply_gain(filtered, volume)
@@ -0,0 +1,129 @@
+"""
+Diff-based sync of evidence image fields.
+
+The desired state is computed locally from the image map, the files in
+public/evidence and the variants manifest; the diff against the database is
+then applied as one bulk upsert per case.
+
+Evidence rows are identified by (case_number, evidence_number). The live
+schema has no evidence_number column, so it is derived from sort_order as
+"EV-001", "EV-002", ... - the same numbering the seed scripts use.
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ENV_FILE = Path(__file__).parent.parent.parent / ".env.local"
+
+# Columns fetched for each evidence row. The NOT NULL columns (case_id,
+# type, title) are carried through so the upsert payload is a valid insert.
+# All columns are fetched because audio_url is not present in every schema.
+EVIDENCE_COLUMNS = "*"
+SYNCED_FIELDS = ("image_url", "audio_url", "metadata")
+
+
+def evidence_number(record: dict) -> str:
+    if record.get("evidence_number"):
+        return record["evidence_number"]
+    return f"EV-{int(record.get('sort_order') or 0):03d}"
+
+
+@dataclass
+class EvidenceChange:
+    case_number: str
+    evidence_number: str
+    record: dict
+    changes: dict = field(default_factory=dict)
+
+    @property
+    def title(self) -> str:
+        return self.record["title"]
+
+    def row(self) -> dict:
+        """Full upsert payload: identity and NOT NULL columns plus synced fields."""
+        row = {
+            "id": self.record["id"],
+            "case_id": self.record["case_id"],
+            "type": self.record["type"],
+            "title": self.record["title"],
+        }
+        for name in SYNCED_FIELDS:
+            if name in self.changes or name in self.record:
+                row[name] = self.changes.get(name, self.record.get(name))
+        return row
+
+
+@dataclass
+class SyncPlan:
+    changes: list = field(default_factory=list)
+    unchanged: int = 0
+    unmapped: list = field(default_factory=list)   # (case_number, evidence_number, title)
+    missing: list = field(default_factory=list)    # (case_number, evidence_number, filename)
+
+    def by_case(self) -> dict:
+        grouped = {}
+        for change in self.changes:
+            grouped.setdefault(change.case_number, []).append(change)
+        return grouped
+
+
+def compute_plan(cases, records, image_map, existing_images, desired_metadata, base_url,
+                 url_for=None) -> SyncPlan:
+    """Compare database rows with the desired image state.
+
+    cases: rows with id and case_number
+    records: evidence rows with EVIDENCE_COLUMNS
+    image_map: {(case_number, evidence_number): filename}
+    existing_images: set of filenames present on disk
+    desired_metadata: callable(filename) -> dict of metadata keys to set
+    url_for: callable(site URL) -> URL to store, e.g. AssetIndex.versioned;
+        also applied to existing audio_url values
+    """
+    url_for = url_for or (lambda url: url)
+    case_numbers = {case["id"]: case["case_number"] for case in cases}
+    plan = SyncPlan()
+
+    for record in records:
+        key = (case_numbers.get(record["case_id"]), evidence_number(record))
+        filename = image_map.get(key)
+        if filename is None:
+            plan.unmapped.append((*key, record["title"]))
+            continue
+        if filename not in existing_images:
+            plan.missing.append((*key, filename))
+            continue
+
+        changes = {}
+        new_url = url_for(f"{base_url}/{filename}")
+        if record.get("image_url") != new_url:
+            changes["image_url"] = new_url
+        if record.get("audio_url"):
+            audio_url = url_for(record["audio_url"])
+            if audio_url != record["audio_url"]:
+                changes["audio_url"] = audio_url
+
+        metadata = dict(record.get("metadata") or {})
+        updated = {**metadata, **desired_metadata(filename)}
+        if updated != metadata:
+            changes["metadata"] = updated
+
+        if changes:
+            plan.changes.append(EvidenceChange(key[0], key[1], record, changes))
+        else:
+            plan.unchanged += 1
+
+    plan.changes.sort(key=lambda c: (c.case_number or "", c.evidence_number))
+    return plan
+
+
+def load_env_local(env_file: Path = ENV_FILE):
+    """Load .env.local into os.environ; variables already set take precedence."""
+    if not env_file.exists():
+        return
+    with open(env_file) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                os.environ.setdefault(key, value)
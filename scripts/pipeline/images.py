@@ -0,0 +1,107 @@
+"""
+Evidence image generation settings and cache planning.
+
+The DALL-E prompt for every evidence image lives in the asset registry
+(scripts/evidence-registry.json, see pipeline/registry.py). Images are
+keyed by a hash of prompt, model, size and quality; the output
+manifest (public/evidence/.manifest.json) records which key each file was
+generated from. Nothing here needs the OpenAI SDK, so status and planning
+work offline.
+
+With --candidates, several images are generated per prompt. Candidate 0
+is the plain image_key(prompt); candidate i > 0 adds i to the key. All of
+them stay in the cache, and promoting one records "candidate" and the
+prompt's key in the manifest entry, so planning keeps that pick until the
+prompt or settings change.
+"""
+
+from pathlib import Path
+
+from pipeline.cache import CACHE_ROOT, ContentCache, Manifest, cache_key
+from pipeline.registry import load_registry
+
+OUTPUT_DIR = Path(__file__).parent.parent.parent / "public" / "evidence"
+MANIFEST_PATH = OUTPUT_DIR / ".manifest.json"
+IMAGE_CACHE_DIR = CACHE_ROOT / "images"
+CONTACT_SHEET_DIR = CACHE_ROOT / "contact-sheets"
+IMAGE_SIZE = "1024x1024"  # Options: 1024x1024, 1792x1024, 1024x1792
+IMAGE_QUALITY = "standard"  # Options: standard, hd
+MODEL = "dall-e-3"
+
+
+def image_key(prompt: str) -> str:
+    """Cache key for a prompt under the current model settings."""
+    return cache_key(prompt=prompt, model=MODEL, size=IMAGE_SIZE, quality=IMAGE_QUALITY)
+
+
+def candidate_key(prompt: str, index: int = 0) -> str:
+    """Cache key for the index-th candidate image of a prompt."""
+    if index == 0:
+        return image_key(prompt)
+    return cache_key(prompt=prompt, model=MODEL, size=IMAGE_SIZE, quality=IMAGE_QUALITY, candidate=index)
+
+
+def selected_candidate(img, manifest: Manifest) -> int:
+    """The candidate promoted for img's current prompt, 0 if none was."""
+    entry = manifest.entries.get(img.filename) or {}
+    if entry.get("prompt_key") != image_key(img.prompt):
+        return 0
+    return entry.get("candidate", 0)
+
+
+def selected_key(img, manifest: Manifest) -> str:
+    return candidate_key(img.prompt, selected_candidate(img, manifest))
+
+
+def selection_fields(img, manifest: Manifest) -> dict:
+    """Manifest fields that keep a promoted candidate selected when the entry is rewritten."""
+    index = selected_candidate(img, manifest)
+    return {"candidate": index, "prompt_key": image_key(img.prompt)} if index else {}
+
+
+def candidate_jobs(cache: ContentCache, evidence, count: int):
+    """Candidates 0..count-1 of each prompt that aren't cached yet.
+
+    Returns (jobs, indices): jobs maps a candidate key to every entry
+    sharing that prompt, as plan() does; indices maps it to its candidate
+    number.
+    """
+    jobs, indices = {}, {}
+    for img in evidence:
+        if not img.prompt:
+            continue
+        for index in range(count):
+            key = candidate_key(img.prompt, index)
+            if not cache.has(key):
+                jobs.setdefault(key, []).append(img)
+                indices[key] = index
+    return jobs, indices
+
+
+def plan(manifest: Manifest, cache: ContentCache, evidence=None):
+    """Sort evidence images into up-to-date, cached, untracked and to-generate.
+
+    evidence defaults to every registry entry with a prompt; pass
+    registry.case(...) to plan a single case. Returns (current, from_cache,
+    untracked, jobs) where jobs maps a cache key to every entry sharing that
+    prompt, so each distinct prompt is generated once.
+    """
+    if evidence is None:
+        evidence = load_registry().evidence
+    current, from_cache, untracked = [], [], []
+    jobs = {}
+    for img in evidence:
+        if not img.prompt:
+            continue  # template-only evidence
+        key = selected_key(img, manifest)
+        output_path = OUTPUT_DIR / img.filename
+        if manifest.is_current(img.filename, key, output_path):
+            current.append(img)
+        elif output_path.exists() and manifest.key_for(img.filename) is None:
+            # Rendered from a template or generated before the manifest existed
+            untracked.append(img)
+        elif cache.has(key):
+            from_cache.append(img)
+        else:
+            jobs.setdefault(key, []).append(img)
+    return current, from_cache, untracked, jobs
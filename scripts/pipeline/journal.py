@@ -0,0 +1,97 @@
+"""
+Append-only job journal for resumable generation batches.
+
+Each batch (images, tts) keeps a JSON-lines journal under
+scripts/.cache/journal/. Every state change of a job, keyed by its cache
+key, is appended and fsynced before the work it describes moves on:
+
+    started     the API request is about to be sent
+    generated   the API returned a result that still has to be fetched
+                (e.g. a DALL-E image URL, valid for about an hour)
+    done        the blob is in the cache, validated, with its size and sha256
+    failed      retries were exhausted; the error is kept
+
+A killed batch is resumed by simply running it again: jobs that reached
+"done" are served from the cache like any other hit, "generated" jobs with
+a fresh URL are downloaded without paying for a new generation, and only
+"started" jobs are sent again. interrupted() lists what a previous run left
+unfinished, and compact() rewrites the file down to each job's last state.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from pipeline.cache import CACHE_ROOT, file_hash
+
+JOURNAL_DIR = CACHE_ROOT / "journal"
+UNFINISHED = ("started", "generated")
+
+
+class JobJournal:
+    """Last known state of every job in one batch, persisted as JSON lines."""
+
+    def __init__(self, name: str, directory: Path = JOURNAL_DIR):
+        self.path = Path(directory) / f"{name}.jsonl"
+        self.jobs = {}
+        self.lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # a torn final line from a killed write
+                    self.jobs[record["job"]] = record
+
+    def state(self, key: str):
+        record = self.jobs.get(key)
+        return record["state"] if record else None
+
+    def get(self, key: str, field: str, default=None):
+        return (self.jobs.get(key) or {}).get(field, default)
+
+    def record(self, key: str, state: str, **fields):
+        """Append one state change and fsync it before returning."""
+        record = {"job": key, "state": state, "ts": round(time.time(), 3),
+                  **{k: v for k, v in fields.items() if v is not None}}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.jobs[key] = record
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def done(self, key: str, path: Path, **fields):
+        path = Path(path)
+        self.record(key, "done", size=path.stat().st_size, sha256=file_hash(path), **fields)
+
+    def fresh_result(self, key: str, field: str, max_age: float):
+        """`field` of a "generated" record no older than max_age seconds, else None."""
+        record = self.jobs.get(key)
+        if not record or record["state"] != "generated" or time.time() - record["ts"] > max_age:
+            return None
+        return record.get(field)
+
+    def interrupted(self, keys=None) -> list:
+        """Keys (optionally among `keys`) a previous run started but never finished."""
+        wanted = set(keys) if keys is not None else None
+        return [key for key, record in self.jobs.items()
+                if record["state"] in UNFINISHED and (wanted is None or key in wanted)]
+
+    def compact(self):
+        """Rewrite the journal with only the latest record per job."""
+        with self.lock:
+            if not self.jobs:
+                return
+            tmp = self.path.with_suffix(".jsonl.tmp")
+            with open(tmp, "w") as f:
+                for record in self.jobs.values():
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            tmp.replace(self.path)
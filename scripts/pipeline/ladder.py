@@ -0,0 +1,172 @@
+"""
+Bitrate ladder: several encodings of one mix for the player to choose from.
+
+While a timeline is streamed, its normalized blocks are also written once to
+a 16-bit WAV master in scripts/.cache/masters. Every rung of the ladder is
+then encoded from that master by its own ffmpeg process, all running at the
+same time, so adding a rung costs wall time only if it's the slowest one.
+A rung that matches what the streaming encoder already wrote (same codec
+and bitrate as a timeline output) reuses that file instead of encoding it
+again.
+
+The renditions go to the timeline's "ladder" directory next to a manifest,
+<name>.json, listed from the smallest bitrate up:
+
+    {"version": 1, "name": "blackwood-recording", "duration": 150.0,
+     "renditions": [{"url": "/audio/renditions/blackwood-recording-48k.opus?v=…",
+                     "codec": "opus", "mime": "audio/ogg; codecs=\"opus\"",
+                     "bitrate": 48000, "label": "mobile", "bytes": 912345}, ...]}
+
+A player takes the first rendition whose mime it can play (canPlayType) and
+whose bitrate suits the connection, e.g. the "mobile" rung on cellular and
+the largest playable one otherwise. URLs carry the same ?v=<content hash>
+as the asset index, so they can be cached as immutable.
+"""
+
+import json
+import os
+import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pipeline import telemetry
+from pipeline.assets import HASH_LENGTH, PUBLIC_DIR
+from pipeline.cache import CACHE_ROOT, file_hash, partial_path, validate_asset
+from pipeline.mixer import CHANNELS, SAMPLE_RATE, to_pcm16
+
+MASTER_DIR = CACHE_ROOT / "masters"
+
+CODECS = {
+    "opus": {"suffix": ".opus", "format": "opus", "mime": 'audio/ogg; codecs="opus"',
+             "args": ["-c:a", "libopus", "-ar", "48000"]},
+    "aac": {"suffix": ".m4a", "format": "ipod", "mime": 'audio/mp4; codecs="mp4a.40.2"',
+            "args": ["-c:a", "aac", "-movflags", "+faststart"]},
+    "mp3": {"suffix": ".mp3", "format": "mp3", "mime": "audio/mpeg",
+            "args": ["-c:a", "libmp3lame"]},
+}
+
+DEFAULT_LADDER = [
+    {"codec": "opus", "bitrate": "48k", "label": "mobile"},
+    {"codec": "aac", "bitrate": "48k", "label": "mobile"},
+    {"codec": "opus", "bitrate": "96k"},
+    {"codec": "aac", "bitrate": "96k"},
+    {"codec": "mp3", "bitrate": "192k"},
+]
+
+
+def bitrate_bps(bitrate: str) -> int:
+    """"96k" -> 96000"""
+    bitrate = str(bitrate).lower()
+    return int(float(bitrate[:-1]) * 1000) if bitrate.endswith("k") else int(bitrate)
+
+
+def rendition_path(directory: Path, name: str, rendition: dict) -> Path:
+    return Path(directory) / f"{name}-{rendition['bitrate']}{CODECS[rendition['codec']]['suffix']}"
+
+
+def public_url(path: Path) -> str:
+    """Site URL for a file under public/, with its content-hash version."""
+    path = Path(os.path.abspath(path))
+    try:
+        url = "/" + path.relative_to(PUBLIC_DIR).as_posix()
+    except ValueError:
+        url = path.as_posix()
+    return f"{url}?v={file_hash(path)[:HASH_LENGTH]}"
+
+
+class MasterWriter:
+    """Stream blocks into a 16-bit WAV master, renamed into place on close."""
+
+    def __init__(self, path: Path, sample_rate=SAMPLE_RATE, channels=CHANNELS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.temp = partial_path(self.path)
+        self._wav = wave.open(str(self.temp), "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, block):
+        self._wav.writeframes(to_pcm16(block).tobytes())
+
+    def abort(self):
+        self._wav.close()
+        self.temp.unlink(missing_ok=True)
+
+    def close(self):
+        self._wav.close()
+        self.temp.replace(self.path)
+        return []  # the master is an intermediate, not an output
+
+
+def encode_rendition(master: Path, output: Path, codec: str, bitrate: str) -> Path:
+    """Encode one rung from the master with its own ffmpeg process."""
+    spec = CODECS[codec]
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp = partial_path(output)
+    command = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", "-i", str(master),
+               *spec["args"], "-b:a", bitrate, "-f", spec["format"], str(temp)]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg ({codec} {bitrate}) exited with status {result.returncode}: "
+                               f"{result.stderr.strip()}")
+        validate_asset(temp, output.suffix, name=output.name)
+        temp.replace(output)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return output
+
+
+def encode_ladder(master: Path, directory: Path, name: str, renditions=None, duration_ms: int = 0,
+                  existing: dict = None, workers: int = None):
+    """Encode every rung concurrently and write the manifest; returns the written paths.
+
+    existing: {(codec, bitrate): path} already encoded elsewhere, reused as-is
+    """
+    renditions = renditions or DEFAULT_LADDER
+    existing = existing or {}
+    for rendition in renditions:
+        if rendition["codec"] not in CODECS:
+            raise ValueError(f"unknown ladder codec {rendition['codec']!r}; known: {', '.join(CODECS)}")
+
+    jobs = {}
+    for rendition in renditions:
+        key = (rendition["codec"], rendition["bitrate"])
+        if key not in existing:
+            jobs[key] = rendition_path(directory, name, rendition)
+
+    paths = dict(existing)
+    encode = telemetry.profiled(encode_rendition)
+    with telemetry.span("ladder", timeline=name, renditions=len(renditions), encoded=len(jobs)):
+        with ThreadPoolExecutor(max_workers=max(1, workers or len(jobs) or 1)) as pool:
+            futures = {key: pool.submit(encode, master, output, *key) for key, output in jobs.items()}
+            for key, future in futures.items():
+                paths[key] = future.result()
+
+    entries = []
+    for rendition in renditions:
+        path = Path(paths[(rendition["codec"], rendition["bitrate"])])
+        entry = {
+            "url": public_url(path),
+            "codec": rendition["codec"],
+            "mime": CODECS[rendition["codec"]]["mime"],
+            "bitrate": bitrate_bps(rendition["bitrate"]),
+            "bytes": path.stat().st_size,
+        }
+        if rendition.get("label"):
+            entry["label"] = rendition["label"]
+        entries.append(entry)
+    entries.sort(key=lambda e: (e["bitrate"], e["codec"]))
+
+    manifest_path = Path(directory) / f"{name}.json"
+    manifest = {"version": 1, "name": name, "duration": round(duration_ms / 1000, 3), "renditions": entries}
+    tmp = manifest_path.with_name(f".{manifest_path.name}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    tmp.replace(manifest_path)
+    return [Path(p) for key, p in paths.items() if key in jobs] + [manifest_path]
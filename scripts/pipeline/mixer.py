@@ -0,0 +1,145 @@
+"""
+NumPy mixing engine.
+
+Clips are decoded once into float32 arrays shaped (samples, channels) in the
+range [-1, 1]. Cues are summed into a single preallocated output buffer, and
+gain, fades and normalization are applied as whole-array operations, so the
+cost of a mix is linear in its length and cue count instead of copying the
+full buffer for every overlay as pydub does.
+
+The helpers mirror the pydub operations the original Blackwood mix used
+(dB-linear fades, peak normalization to -0.1 dBFS, one-pole low-pass) so a
+render matches the old output within a small tolerance.
+"""
+
+from pathlib import Path
+
+try:
+    import numpy as np
+    from pydub import AudioSegment
+    from scipy.signal import lfilter
+except ImportError:
+    print("Error: numpy, scipy and pydub are required.")
+    print("Run: pip install numpy scipy pydub")
+    exit(1)
+
+SAMPLE_RATE = 44100
+CHANNELS = 1
+FADE_FLOOR_DB = -120.0  # pydub fades start/end at -120 dB
+
+
+def ms_to_samples(ms: float, sample_rate: int = SAMPLE_RATE) -> int:
+    return int(round(ms * sample_rate / 1000.0))
+
+
+def length_ms(audio: "np.ndarray", sample_rate: int = SAMPLE_RATE) -> int:
+    """Duration in whole milliseconds, rounded like len(AudioSegment)."""
+    return int(round(audio.shape[0] * 1000.0 / sample_rate))
+
+
+def silence(duration_ms: float, channels: int = CHANNELS) -> "np.ndarray":
+    return np.zeros((ms_to_samples(duration_ms), channels), dtype=np.float32)
+
+
+def db_to_gain(db: float) -> float:
+    return float(10 ** (db / 20.0))
+
+
+def segment_to_array(segment: "AudioSegment", sample_rate: int = SAMPLE_RATE,
+                     channels: int = CHANNELS) -> "np.ndarray":
+    segment = segment.set_frame_rate(sample_rate).set_channels(channels)
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+    scale = float(1 << (8 * segment.sample_width - 1))
+    return (samples / scale).reshape(-1, channels)
+
+
+def array_to_segment(audio: "np.ndarray", sample_rate: int = SAMPLE_RATE) -> "AudioSegment":
+    """Quantize to 16-bit PCM (with clipping) as a pydub AudioSegment."""
+    pcm = to_pcm16(audio)
+    return AudioSegment(pcm.tobytes(), frame_rate=sample_rate, sample_width=2, channels=audio.shape[1])
+
+
+def to_pcm16(audio: "np.ndarray") -> "np.ndarray":
+    return (np.clip(audio, -1.0, 32767 / 32768) * 32768).astype("<i2")
+
+
+def decode_file(path: Path, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> "np.ndarray":
+    """Decode any ffmpeg-readable file to float32 (samples, channels)."""
+    return segment_to_array(AudioSegment.from_file(path), sample_rate, channels)
+
+
+def apply_gain(audio: "np.ndarray", db: float) -> "np.ndarray":
+    return audio * np.float32(db_to_gain(db)) if db else audio
+
+
+def _fade_curve(n_samples: int, duration_ms: int, sample_rate: int, from_db: float, to_db: float):
+    # pydub steps the gain once per millisecond, linearly in dB
+    step_ms = np.minimum(np.arange(n_samples) * 1000 // sample_rate, duration_ms)
+    db = from_db + (to_db - from_db) * step_ms / max(duration_ms, 1)
+    return (10 ** (db / 20.0)).astype(np.float32)[:, None]
+
+
+def fade_in(audio: "np.ndarray", duration_ms: int, sample_rate: int = SAMPLE_RATE) -> "np.ndarray":
+    n = min(ms_to_samples(duration_ms, sample_rate), audio.shape[0])
+    out = audio.copy()
+    out[:n] *= _fade_curve(n, duration_ms, sample_rate, FADE_FLOOR_DB, 0.0)
+    return out
+
+
+def fade_out(audio: "np.ndarray", duration_ms: int, sample_rate: int = SAMPLE_RATE) -> "np.ndarray":
+    n = min(ms_to_samples(duration_ms, sample_rate), audio.shape[0])
+    out = audio.copy()
+    if n:
+        out[-n:] *= _fade_curve(n, duration_ms, sample_rate, 0.0, FADE_FLOOR_DB)
+    return out
+
+
+def normalize(audio: "np.ndarray", headroom_db: float = 0.1) -> "np.ndarray":
+    """Scale so the peak sits at -headroom_db dBFS (pydub's normalize())."""
+    peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+    if peak == 0.0:
+        return audio
+    return audio * np.float32(db_to_gain(-headroom_db) / peak)
+
+
+def low_pass(audio: "np.ndarray", cutoff_hz: float, sample_rate: int = SAMPLE_RATE) -> "np.ndarray":
+    """One-pole RC low-pass, the same filter as pydub's low_pass_filter()."""
+    rc = 1.0 / (cutoff_hz * 2 * np.pi)
+    dt = 1.0 / sample_rate
+    alpha = dt / (rc + dt)
+    return lfilter([alpha], [1.0, alpha - 1.0], audio, axis=0).astype(np.float32)
+
+
+def echo_reverb(audio: "np.ndarray", delay_ms: int = 50, taps: int = 3, step_db: float = 10.0,
+                sample_rate: int = SAMPLE_RATE) -> "np.ndarray":
+    """Layer `taps` delayed copies, each step_db quieter, trimmed to the input length."""
+    out = audio.copy()
+    for i in range(1, taps + 1):
+        offset = ms_to_samples(delay_ms * i, sample_rate)
+        if offset < audio.shape[0]:
+            out[offset:] += audio[:audio.shape[0] - offset] * np.float32(db_to_gain(-step_db * i))
+    return out
+
+
+class Mix:
+    """Preallocated output buffer that cues are summed into."""
+
+    def __init__(self, duration_ms: float, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS):
+        self.sample_rate = sample_rate
+        self.buffer = np.zeros((ms_to_samples(duration_ms, sample_rate), channels), dtype=np.float32)
+
+    def add(self, audio: "np.ndarray", position_ms: float = 0, gain_db: float = 0.0):
+        """Sum `audio` into the buffer at position_ms; anything past the end is dropped."""
+        start = ms_to_samples(position_ms, self.sample_rate)
+        if start >= self.buffer.shape[0]:
+            return
+        end = min(self.buffer.shape[0], start + audio.shape[0])
+        chunk = audio[:end - start]
+        if gain_db:
+            chunk = chunk * np.float32(db_to_gain(gain_db))
+        self.buffer[start:end] += chunk
+
+    def render(self, end_ms: float = None) -> "np.ndarray":
+        if end_ms is None:
+            return self.buffer
+        return self.buffer[:ms_to_samples(end_ms, self.sample_rate)]
@@ -0,0 +1,167 @@
+"""
+Seeded, block-based noise sources.
+
+Each source is a small stateful stream: read(n) returns the next n samples
+as float32 (n, channels), carrying RNG and filter state across calls, so a
+bed of any length can be generated one block at a time and the blocks join
+seamlessly. render(duration_ms) produces the same samples in one go.
+
+The same seed always gives the same noise, so generated cues and beds are
+reproducible and safe to cache by their parameters.
+
+    white     uniform in [-1, 1]
+    pink      -3 dB/octave (1/f), unit RMS
+    brown     -6 dB/octave (leaky integrator), unit RMS
+    filtered  white noise through a Butterworth low/high/band-pass
+    hum       one-pole low-passed white noise, optionally with a mains tone
+"""
+
+try:
+    from scipy.signal import butter, lfilter, sosfilt
+except ImportError:
+    print("Error: numpy, scipy and pydub are required.")
+    print("Run: pip install numpy scipy pydub")
+    exit(1)
+
+from pipeline.mixer import CHANNELS, SAMPLE_RATE, db_to_gain, ms_to_samples, np
+
+# Paul Kellet's "economy" 1/f filter (pole/zero fit to -3 dB/octave)
+PINK_B = [0.049922035, -0.095993537, 0.050612699, -0.004408786]
+PINK_A = [1.0, -2.494956002, 2.017265875, -0.522189400]
+BROWN_POLE = 0.998
+
+# Default bed levels (dB); streamed beds use the same ones
+NOISE_VOLUME = -20
+HUM_VOLUME = -35
+
+
+def _unit_rms_scale(b, a, n: int = 1 << 16) -> float:
+    """Gain that gives the filter unit output RMS for unit-variance white input."""
+    impulse = np.zeros(n)
+    impulse[0] = 1.0
+    energy = float(np.sum(lfilter(b, a, impulse) ** 2))
+    return 1.0 / np.sqrt(energy) if energy else 1.0
+
+
+class NoiseSource:
+    """Base stream: subclasses turn a block of raw RNG output into noise."""
+
+    def __init__(self, volume: float = 0.0, seed: int = 0, channels: int = CHANNELS,
+                 sample_rate: int = SAMPLE_RATE):
+        self.gain = np.float32(db_to_gain(volume))
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.rng = np.random.default_rng(seed)
+
+    def generate(self, n: int):
+        raise NotImplementedError
+
+    def read(self, n: int):
+        return self.generate(n).astype(np.float32) * self.gain
+
+    def render(self, duration_ms: float):
+        return self.read(ms_to_samples(duration_ms, self.sample_rate))
+
+
+class IIRNoise(NoiseSource):
+    """Gaussian noise through an IIR filter whose state persists between blocks."""
+
+    b = a = None
+    scale = 1.0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.state = np.zeros((max(len(self.a), len(self.b)) - 1, self.channels))
+
+    def generate(self, n: int):
+        noise = self.rng.standard_normal((n, self.channels))
+        filtered, self.state = lfilter(self.b, self.a, noise, axis=0, zi=self.state)
+        return filtered * self.scale
+
+
+class WhiteNoise(NoiseSource):
+    def generate(self, n: int):
+        return self.rng.uniform(-1.0, 1.0, (n, self.channels))
+
+
+class PinkNoise(IIRNoise):
+    b, a = PINK_B, PINK_A
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.scale = _unit_rms_scale(self.b, self.a)
+
+
+class BrownNoise(IIRNoise):
+    b, a = [1.0], [1.0, -BROWN_POLE]
+    scale = float(np.sqrt(1.0 - BROWN_POLE ** 2))
+
+
+class FilteredNoise(NoiseSource):
+    """White noise through a Butterworth filter.
+
+    Give low_hz for a high-pass, high_hz for a low-pass, or both for a
+    band-pass.
+    """
+
+    def __init__(self, low_hz: float = None, high_hz: float = None, order: int = 4, **kwargs):
+        super().__init__(**kwargs)
+        if low_hz and high_hz:
+            self.sos = butter(order, [low_hz, high_hz], btype="bandpass", fs=self.sample_rate, output="sos")
+        elif low_hz:
+            self.sos = butter(order, low_hz, btype="highpass", fs=self.sample_rate, output="sos")
+        elif high_hz:
+            self.sos = butter(order, high_hz, btype="lowpass", fs=self.sample_rate, output="sos")
+        else:
+            raise ValueError("FilteredNoise needs low_hz, high_hz or both")
+        self.state = np.zeros((self.sos.shape[0], 2, self.channels))
+
+    def generate(self, n: int):
+        noise = self.rng.standard_normal((n, self.channels))
+        filtered, self.state = sosfilt(self.sos, noise, axis=0, zi=self.state)
+        return filtered
+
+
+class HumNoise(NoiseSource):
+    """Low rumble: one-pole low-passed white noise (pydub's low_pass_filter).
+
+    mains_hz adds a tone at that frequency plus `harmonics` overtones, each
+    6 dB quieter, mains_db relative to the noise.
+    """
+
+    def __init__(self, cutoff_hz: float = 200, mains_hz: float = None, mains_db: float = -12,
+                 harmonics: int = 3, **kwargs):
+        super().__init__(**kwargs)
+        rc = 1.0 / (cutoff_hz * 2 * np.pi)
+        dt = 1.0 / self.sample_rate
+        self.alpha = dt / (rc + dt)
+        self.state = np.zeros((1, self.channels))
+        self.mains_hz = mains_hz
+        self.mains_gain = db_to_gain(mains_db)
+        self.harmonics = harmonics
+        self.position = 0
+
+    def generate(self, n: int):
+        noise = self.rng.uniform(-1.0, 1.0, (n, self.channels))
+        out, self.state = lfilter([self.alpha], [1.0, self.alpha - 1.0], noise, axis=0, zi=self.state)
+        if self.mains_hz:
+            t = (self.position + np.arange(n)) / self.sample_rate
+            k = np.arange(1, self.harmonics + 2)[:, None]
+            tone = np.sum(db_to_gain(-6) ** (k - 1) * np.sin(2 * np.pi * self.mains_hz * k * t), axis=0)
+            out += (tone * self.mains_gain)[:, None]
+        self.position += n
+        return out
+
+
+SOURCES = {
+    "white": WhiteNoise,
+    "pink": PinkNoise,
+    "brown": BrownNoise,
+    "filtered": FilteredNoise,
+    "hum": HumNoise,
+}
+
+
+def noise(kind: str, duration_ms: float = 1000, volume: float = NOISE_VOLUME, **params):
+    """Render `duration_ms` of one of the SOURCES in a single block."""
+    return SOURCES[kind](volume=volume, **params).render(duration_ms)
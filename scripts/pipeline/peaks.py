@@ -0,0 +1,67 @@
+"""
+Waveform peaks for the audio player.
+
+Peaks are min/max pairs over fixed buckets of samples, at several zoom
+levels, quantized to int8 and written as JSON:
+
+    {"version": 1, "sample_rate": 44100, "length": <samples>,
+     "levels": [{"samples_per_peak": 512, "data": [min0, max0, min1, max1, ...]}, ...]}
+
+They are accumulated block by block from the PCM the streaming renderer
+already produces, one reshape + min/max per level per block.
+"""
+
+import json
+from pathlib import Path
+
+from pipeline.mixer import SAMPLE_RATE, np
+
+LEVELS = (512, 2048, 8192)
+
+
+class PeakBuilder:
+    def __init__(self, sample_rate: int = SAMPLE_RATE, levels=LEVELS):
+        self.sample_rate = sample_rate
+        self.levels = levels
+        self.length = 0
+        self._parts = {spp: [] for spp in levels}
+
+    def add(self, block):
+        """Accumulate one (samples, channels) block.
+
+        Blocks other than the last should be a multiple of every level's
+        bucket size so buckets never straddle two blocks.
+        """
+        high = block.max(axis=1) if block.ndim > 1 else block
+        low = block.min(axis=1) if block.ndim > 1 else block
+        self.length += len(high)
+        for spp in self.levels:
+            full = len(high) // spp * spp
+            mins = [low[:full].reshape(-1, spp).min(axis=1)]
+            maxs = [high[:full].reshape(-1, spp).max(axis=1)]
+            if full < len(high):
+                mins.append(low[full:].min(keepdims=True))
+                maxs.append(high[full:].max(keepdims=True))
+            pairs = np.stack([np.concatenate(mins), np.concatenate(maxs)], axis=1)
+            self._parts[spp].append(np.clip(np.round(pairs * 127), -127, 127).astype(np.int8).ravel())
+
+    def to_dict(self) -> dict:
+        return {
+            "version": 1,
+            "sample_rate": self.sample_rate,
+            "length": self.length,
+            "levels": [
+                {"samples_per_peak": spp,
+                 "data": np.concatenate(self._parts[spp]).tolist() if self._parts[spp] else []}
+                for spp in self.levels
+            ],
+        }
+
+    def write(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        tmp.replace(path)
+        return path
@@ -0,0 +1,99 @@
+"""
+Rate limiting and retry helpers for API-bound pipeline steps.
+"""
+
+import random
+import threading
+import time
+
+from pipeline import telemetry
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    `rate` tokens are added per second up to `burst`; acquire() blocks until
+    a token is available. Replaces fixed sleeps between API calls so that
+    concurrent workers share a single request budget.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, count: float, burst: int = 1) -> "TokenBucket":
+        return cls(count / 60.0, burst)
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RetryableError(Exception):
+    """Raised by a step to request a retry (e.g. on a 429/5xx response)."""
+
+    def __init__(self, message: str, status: int = None, retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def status_of(exc: Exception):
+    """Best-effort HTTP status extraction from SDK and requests exceptions."""
+    for attr in ("status", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, RetryableError):
+        return True
+    return status_of(exc) in RETRYABLE_STATUSES
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2^attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def with_retries(fn, attempts: int = 5, base: float = 1.0, cap: float = 30.0, on_retry=None):
+    """Call fn(), retrying retryable failures with jittered backoff.
+
+    on_retry(attempt, exc, delay) is called before each sleep, if given.
+    Non-retryable errors and the final failure are re-raised.
+    """
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts - 1 or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, base, cap)
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after:
+                delay = max(delay, retry_after)
+            telemetry.emit("retry", operation=getattr(fn, "__qualname__", None), attempt=attempt + 1,
+                           delay=round(delay, 2), error=str(e)[:300], http_status=status_of(e))
+            if on_retry:
+                on_retry(attempt + 1, e, delay)
+            time.sleep(delay)
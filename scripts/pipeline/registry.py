@@ -0,0 +1,125 @@
+"""
+The evidence asset registry.
+
+scripts/evidence-registry.json is the one place that says which evidence
+item gets which asset: cases → evidence (case_number + evidence number,
+database title) → sources (DALL-E prompt, HTML template) → outputs (image
+filename in public/evidence, optional audio in public/audio). The image
+generator, template renderer, variant/index tools and the database updater
+all read it instead of keeping their own lists.
+
+load_registry() parses it once and precomputes the lookups, so picking one
+case's or one file's entries is a dict access rather than a scan:
+
+    registry = load_registry()
+    registry.case("blackwood")                 # all of a case's evidence
+    registry.by_filename["hartwell-thermal.png"]
+    registry.by_number[("0002", "EV-003")]
+    registry.by_content(index)[sha256]         # via the asset index
+"""
+
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+REGISTRY_PATH = Path(__file__).parent.parent / "evidence-registry.json"
+
+
+class RegistryError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Evidence:
+    case_number: str
+    case_name: str
+    number: str          # "EV-001", ... (sort_order within the case)
+    title: str           # database title
+    label: str           # short name used in logs
+    filename: str        # image output in public/evidence
+    prompt: str = None   # DALL-E prompt
+    template: str = None # HTML template in scripts/templates
+    audio: str = None    # audio output in public/audio
+
+    @property
+    def key(self) -> tuple:
+        return self.case_number, self.number
+
+
+@dataclass
+class Registry:
+    cases: list                                       # [{"case_number", "name", "title"}]
+    evidence: tuple
+    by_case: dict = field(default_factory=dict)       # case number or lower-case name -> tuple
+    by_filename: dict = field(default_factory=dict)
+    by_number: dict = field(default_factory=dict)     # (case_number, "EV-001") -> Evidence
+    by_template: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        for case in self.cases:
+            items = tuple(ev for ev in self.evidence if ev.case_number == case["case_number"])
+            self.by_case[case["case_number"]] = items
+            self.by_case[case["name"].lower()] = items
+        for ev in self.evidence:
+            for index, value in ((self.by_filename, ev.filename), (self.by_number, ev.key),
+                                 (self.by_template, ev.template)):
+                if value is None:
+                    continue
+                if value in index:
+                    raise RegistryError(f"{value!r} is registered twice ({index[value].key} and {ev.key})")
+                index[value] = ev
+
+    def case(self, case: str) -> tuple:
+        """Evidence for a case given by number ("0002") or name ("blackwood")."""
+        try:
+            return self.by_case[case if case in self.by_case else case.lower()]
+        except KeyError:
+            known = ", ".join(f"{c['case_number']} ({c['name'].lower()})" for c in self.cases)
+            raise RegistryError(f"unknown case {case!r}; known: {known}") from None
+
+    def select(self, case: str = None) -> tuple:
+        return self.case(case) if case else self.evidence
+
+    def image_map(self, case: str = None) -> dict:
+        """{(case_number, evidence_number): image filename}"""
+        return {ev.key: ev.filename for ev in self.select(case)}
+
+    def by_content(self, index) -> dict:
+        """{sha256: Evidence} for outputs present in an AssetIndex."""
+        from pipeline.assets import PUBLIC_DIR, relative
+
+        found = {}
+        for ev in self.evidence:
+            entry = index.files.get(relative(PUBLIC_DIR / "evidence" / ev.filename))
+            if entry:
+                found[entry["sha256"]] = ev
+        return found
+
+
+def parse_registry(data: dict) -> Registry:
+    cases, evidence = [], []
+    for case in data["cases"]:
+        cases.append({k: case[k] for k in ("case_number", "name", "title")})
+        for item in case["evidence"]:
+            outputs = item.get("outputs", {})
+            if "image" not in outputs:
+                raise RegistryError(f"{case['case_number']}/{item['number']}: no image output")
+            evidence.append(Evidence(
+                case_number=case["case_number"],
+                case_name=case["name"],
+                number=item["number"],
+                title=item["title"],
+                label=item.get("label", item["title"]),
+                filename=outputs["image"],
+                prompt=item.get("prompt"),
+                template=item.get("template"),
+                audio=outputs.get("audio"),
+            ))
+    return Registry(cases, tuple(evidence))
+
+
+@lru_cache(maxsize=4)
+def load_registry(path: Path = REGISTRY_PATH) -> Registry:
+    with open(path) as f:
+        return parse_registry(json.load(f))
@@ -0,0 +1,98 @@
+"""
+Parse an annotated audio script (scripts/audio/*-script.md) into TTS jobs
+and a mix timeline.
+
+The markdown stays readable as a script; mix settings ride along in HTML
+comments:
+
+    <!-- timeline {"name": ..., "outputs": [...], "beds": [...]} -->
+    <!-- speakers {"CHEN": {"voice": "chen", "stability": 0.6, "similarity": 0.8}} -->
+
+    **CHEN:** *(whispering)* Okay... <!-- {"clip": "chen_05_footsteps.mp3", "gap_ms": 1500} -->
+    *[SFX: Static burst]* <!-- {"sfx": "static", "duration_ms": 300, "advance_ms": 500} -->
+
+Dialogue lines become a TTS job (text with stage directions removed, plus
+the speaker's voice settings) and a clip cue; annotated SFX lines become
+generated cues. Unannotated SFX lines are descriptive only.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+AUDIO_DIR = Path(__file__).parent.parent / "audio"
+SCRIPT_GLOB = "*-script.md"
+
+BLOCK_RE = re.compile(r"<!--\s*(timeline|speakers)\s*(\{.*?\})\s*-->", re.DOTALL)
+DIALOGUE_RE = re.compile(r"^\*\*(?P<speaker>[^*]+?):\*\*\s*(?P<text>.*?)\s*(?:<!--\s*(?P<meta>\{.*\})\s*-->)?\s*$")
+SFX_RE = re.compile(r"^\*\[SFX:\s*(?P<desc>[^\]]*)\]\*\s*(?:<!--\s*(?P<meta>\{.*\})\s*-->)?\s*$")
+DIRECTION_RE = re.compile(r"\*\([^)]*\)\*\s*")
+
+CUE_KEYS = ("clip", "sfx", "duration_ms", "volume", "params", "gain_db", "effects", "gap_ms", "advance_ms", "at_ms")
+
+
+class ScriptError(ValueError):
+    pass
+
+
+@dataclass
+class ParsedScript:
+    path: Path
+    jobs: list       # TTS jobs: filename, voice, stability, similarity, text
+    timeline: dict   # timeline document, as accepted by pipeline.timeline
+
+    @property
+    def name(self) -> str:
+        return self.timeline.get("name", self.path.stem)
+
+
+def parse_script(path: Path) -> ParsedScript:
+    path = Path(path)
+    text = path.read_text()
+
+    blocks = {kind: json.loads(body) for kind, body in BLOCK_RE.findall(text)}
+    if "timeline" not in blocks:
+        raise ScriptError(f"{path.name}: missing <!-- timeline {{...}} --> block")
+    speakers = blocks.get("speakers", {})
+
+    jobs = []
+    cues = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        dialogue = DIALOGUE_RE.match(line)
+        sfx = SFX_RE.match(line) if not dialogue else None
+
+        if dialogue and dialogue.group("meta"):
+            meta = json.loads(dialogue.group("meta"))
+            speaker = dialogue.group("speaker").strip()
+            if speaker not in speakers:
+                raise ScriptError(f"{path.name}:{lineno}: no voice settings for speaker {speaker!r}")
+            if "clip" not in meta:
+                raise ScriptError(f"{path.name}:{lineno}: dialogue annotation needs a \"clip\" filename")
+            settings = speakers[speaker]
+            jobs.append({
+                "filename": meta["clip"],
+                "voice": settings["voice"],
+                "stability": meta.get("stability", settings["stability"]),
+                "similarity": meta.get("similarity", settings["similarity"]),
+                "text": DIRECTION_RE.sub("", dialogue.group("text")).strip(),
+            })
+            cues.append({"label": speaker, **{k: meta[k] for k in CUE_KEYS if k in meta}})
+
+        elif sfx and sfx.group("meta"):
+            meta = json.loads(sfx.group("meta"))
+            cues.append({"label": sfx.group("desc").strip(), **{k: meta[k] for k in CUE_KEYS if k in meta}})
+
+    timeline = dict(blocks["timeline"])
+    timeline["cues"] = cues
+    return ParsedScript(path=path, jobs=jobs, timeline=timeline)
+
+
+def find_scripts(directory: Path = AUDIO_DIR):
+    return sorted(Path(directory).glob(SCRIPT_GLOB))
+
+
+def timeline_path(parsed: ParsedScript) -> Path:
+    """Where the compiled timeline for a script lives (next to the script)."""
+    return parsed.path.with_name(parsed.path.name.replace("-script.md", ".timeline.json"))
@@ -0,0 +1,292 @@
+"""
+Streaming, block-based rendering and encoding.
+
+Instead of allocating the whole mix, a timeline is rendered in fixed-size
+blocks: each block sums only the cues that overlap it plus the next slice of
+each ambient bed. A cue's gain and effects are applied only when the blocks
+reach its start, and its processed audio is dropped once they pass its end,
+so only the cues overlapping the current block are held. Peak normalization
+needs the global peak, so the blocks are rendered twice - once to measure,
+once to encode. With an AudioCache the second pass maps the processed cues
+back from disk, and decoded clips are memory-mapped rather than held, so
+peak memory stays flat whatever the recording length; without one, each
+cue is processed once per pass.
+
+If rendering or encoding fails, every ffmpeg process is killed and its
+partial output removed, so nothing half-written is left in public/audio.
+
+The PCM blocks are piped to a single ffmpeg process; its encoded output is
+teed to every output file, so identical outputs are encoded only once. The
+same blocks can feed waveform peaks and an HLS segmenter, so the player can
+start quickly, seek without fetching the whole file and draw a real
+waveform. With a "ladder" directory the blocks are also kept as a WAV master
+that the bitrate ladder is encoded from afterwards (see pipeline/ladder.py).
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+from functools import partial
+from pathlib import Path
+
+from pipeline import telemetry
+from pipeline.ladder import MASTER_DIR, MasterWriter, encode_ladder
+from pipeline.mixer import CHANNELS, SAMPLE_RATE, db_to_gain, ms_to_samples, np, to_pcm16
+from pipeline.noise import HUM_VOLUME, NOISE_VOLUME, SOURCES, HumNoise
+from pipeline.peaks import PeakBuilder
+from pipeline.timeline import GENERATORS, Timeline, layout, prepare_cue
+
+BLOCK_SAMPLES = 1 << 16  # ~1.5s at 44.1kHz; a multiple of every peaks level
+ENCODER_CHUNK = 64 * 1024
+HLS_SEGMENT_SECONDS = 6
+HLS_BITRATE = "128k"
+
+
+class ArrayBed:
+    """Fallback for generators without a streaming form: generate once, then slice."""
+
+    def __init__(self, audio):
+        self.audio = audio
+        self.pos = 0
+
+    def read(self, n: int):
+        block = self.audio[self.pos:self.pos + n]
+        self.pos += n
+        if block.shape[0] < n:
+            block = np.concatenate([block, np.zeros((n - block.shape[0], self.audio.shape[1]), np.float32)])
+        return block
+
+
+# Beds with a block-based source, at their GENERATORS defaults so a bed
+# without a "volume" sounds the same streamed or rendered; anything else is
+# generated whole
+BED_STREAMS = {
+    "hum": partial(HumNoise, volume=HUM_VOLUME),
+    **{kind: partial(SOURCES[kind], volume=NOISE_VOLUME) for kind in ("white", "pink", "brown", "filtered")},
+}
+
+
+def open_beds(timeline: Timeline, end_ms: int, seed: int = 0):
+    beds = []
+    for i, bed in enumerate(timeline.beds):
+        params = {k: v for k, v in bed.items() if k not in ("generator", "label")}
+        params.setdefault("seed", seed + i)
+        if bed["generator"] in BED_STREAMS:
+            beds.append(BED_STREAMS[bed["generator"]](**params))
+        else:
+            beds.append(ArrayBed(GENERATORS[bed["generator"]](end_ms, **params)))
+    return beds
+
+
+def iter_blocks(cues, beds, total_samples: int, block_samples: int = BLOCK_SAMPLES, gain: float = 1.0):
+    """Yield float32 blocks of the mix.
+
+    cues: [(audio or a function returning it, start_sample)] sorted by
+    start_sample. A function is only called once the blocks reach its start,
+    and its audio is released after the block containing its end.
+    """
+    upcoming = iter(cues)
+    following = next(upcoming, None)
+    active = []
+    for block_start in range(0, total_samples, block_samples):
+        n = min(block_samples, total_samples - block_start)
+        block_end = block_start + n
+        block = np.zeros((n, CHANNELS), dtype=np.float32)
+
+        while following is not None and following[1] < block_end:
+            source, start = following
+            active.append((source() if callable(source) else source, start))
+            following = next(upcoming, None)
+
+        for audio, start in active:
+            lo = max(block_start, start)
+            hi = min(block_end, start + len(audio))
+            if hi > lo:
+                block[lo - block_start:hi - block_start] += audio[lo - start:hi - start]
+        active = [(audio, start) for audio, start in active if start + len(audio) > block_end]
+
+        for bed in beds:
+            block += bed.read(n)
+
+        if gain != 1.0:
+            block *= np.float32(gain)
+        yield block
+
+
+def require_ffmpeg():
+    if not shutil.which("ffmpeg"):
+        print("Error: ffmpeg not found on PATH.")
+        exit(1)
+
+
+def pcm_input_args(sample_rate=SAMPLE_RATE, channels=CHANNELS):
+    return ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0"]
+
+
+class Encoder:
+    """One ffmpeg process fed raw PCM; the encoded stream is teed to several files."""
+
+    def __init__(self, outputs, fmt="mp3", bitrate="192k", sample_rate=SAMPLE_RATE, channels=CHANNELS):
+        require_ffmpeg()
+        self.outputs = [Path(output) for output in outputs]
+        self.temps = [o.with_name(f".{o.name}.{os.getpid()}.part") for o in self.outputs]
+        for output in self.outputs:
+            output.parent.mkdir(parents=True, exist_ok=True)
+        self.process = subprocess.Popen(
+            pcm_input_args(sample_rate, channels) + ["-b:a", bitrate, "-f", fmt, "pipe:1"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+        self.bytes_written = 0
+        self._files = [open(temp, "wb") for temp in self.temps]
+        self._reader = threading.Thread(target=self._tee, daemon=True)
+        self._reader.start()
+
+    def _tee(self):
+        for chunk in iter(lambda: self.process.stdout.read(ENCODER_CHUNK), b""):
+            for f in self._files:
+                f.write(chunk)
+            self.bytes_written += len(chunk)
+
+    def write(self, block):
+        self.process.stdin.write(to_pcm16(block).tobytes())
+
+    def abort(self):
+        """Kill ffmpeg and delete the partial outputs."""
+        self.process.kill()
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self._reader.join()
+        self.process.wait()
+        for f in self._files:
+            f.close()
+        for temp in self.temps:
+            temp.unlink(missing_ok=True)
+
+    def close(self):
+        self.process.stdin.close()
+        self._reader.join()
+        code = self.process.wait()
+        for f in self._files:
+            f.close()
+        if code != 0:
+            for temp in self.temps:
+                temp.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg exited with status {code}")
+        for temp, output in zip(self.temps, self.outputs):
+            temp.replace(output)
+        return self.outputs
+
+
+class HlsEncoder:
+    """ffmpeg HLS segmenter: AAC segments plus a VOD index.m3u8 in `directory`.
+
+    Segments are written to a temporary sibling directory that replaces the
+    old one only once the encode has succeeded.
+    """
+
+    def __init__(self, directory: Path, bitrate=HLS_BITRATE, segment_seconds=HLS_SEGMENT_SECONDS,
+                 sample_rate=SAMPLE_RATE, channels=CHANNELS):
+        require_ffmpeg()
+        self.directory = Path(directory)
+        self.temp = self.directory.with_name(f".{self.directory.name}.{os.getpid()}.part")
+        shutil.rmtree(self.temp, ignore_errors=True)
+        self.temp.mkdir(parents=True)
+        self.process = subprocess.Popen(
+            pcm_input_args(sample_rate, channels) + [
+                "-c:a", "aac", "-b:a", bitrate,
+                "-f", "hls", "-hls_time", str(segment_seconds), "-hls_playlist_type", "vod",
+                "-hls_segment_filename", str(self.temp / "segment-%03d.ts"),
+                str(self.temp / "index.m3u8"),
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def write(self, block):
+        self.process.stdin.write(to_pcm16(block).tobytes())
+
+    def abort(self):
+        """Kill ffmpeg and delete the partial segments."""
+        self.process.kill()
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.wait()
+        shutil.rmtree(self.temp, ignore_errors=True)
+
+    def close(self):
+        self.process.stdin.close()
+        code = self.process.wait()
+        if code != 0:
+            shutil.rmtree(self.temp, ignore_errors=True)
+            raise RuntimeError(f"ffmpeg (hls) exited with status {code}")
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.temp.replace(self.directory)
+        return [self.directory / "index.m3u8"]
+
+
+def stream_timeline(timeline: Timeline, loader, block_samples: int = BLOCK_SAMPLES, seed: int = 0):
+    """Render and encode a timeline block by block; returns (outputs, duration_ms)."""
+    with telemetry.span("decode", timeline=timeline.name, cues=len(timeline.cues)):
+        placed, end = layout(timeline, loader)
+    if timeline.max_duration_ms is not None:
+        end = min(end, timeline.max_duration_ms)
+    total = ms_to_samples(end)
+
+    # Gain and effects run inside iter_blocks, when each cue is reached
+    cues = sorted(((partial(prepare_cue, cue, source, source_key, loader.cache), ms_to_samples(start))
+                   for cue, source, source_key, start in placed), key=lambda c: c[1])
+    del placed
+
+    gain = 1.0
+    if timeline.normalize:
+        with telemetry.span("measure", timeline=timeline.name):
+            peak = 0.0
+            for block in iter_blocks(cues, open_beds(timeline, end, seed), total, block_samples):
+                peak = max(peak, float(np.max(np.abs(block))) if block.size else 0.0)
+        if peak > 0:
+            gain = db_to_gain(-0.1) / peak
+
+    by_format = {}
+    for output in timeline.outputs:
+        by_format.setdefault(output.suffix.lstrip(".") or "mp3", []).append(output)
+
+    with telemetry.span("encode", timeline=timeline.name, duration_ms=end) as attrs:
+        encoders = []
+        try:
+            for fmt, outputs in by_format.items():
+                encoders.append(Encoder(outputs, fmt, timeline.bitrate))
+            if timeline.hls:
+                encoders.append(HlsEncoder(timeline.hls))
+            if timeline.ladder:
+                encoders.append(MasterWriter(MASTER_DIR / f"{timeline.name}.wav"))
+            peaks = PeakBuilder() if timeline.peaks else None
+
+            for block in iter_blocks(cues, open_beds(timeline, end, seed), total, block_samples, gain):
+                for encoder in encoders:
+                    encoder.write(block)
+                if peaks:
+                    peaks.add(block)
+
+            written = []
+            for encoder in encoders:
+                written.extend(encoder.close())
+        except BaseException:
+            # Already-closed encoders have nothing left to remove
+            for encoder in encoders:
+                encoder.abort()
+            raise
+        if peaks:
+            written.append(peaks.write(timeline.peaks))
+        attrs["bytes"] = sum(e.bytes_written for e in encoders if isinstance(e, Encoder))
+
+    if timeline.ladder:
+        # The main MP3 output doubles as the ladder's rung at the same bitrate
+        existing = {("mp3", timeline.bitrate): by_format["mp3"][0]} if "mp3" in by_format else {}
+        written.extend(encode_ladder(MASTER_DIR / f"{timeline.name}.wav", timeline.ladder, timeline.name,
+                                     timeline.renditions, end, existing))
+    return written, end
@@ -0,0 +1,222 @@
+"""
+Structured run telemetry as JSON lines.
+
+Script runs append events to scripts/.cache/telemetry/events.jsonl (or the
+file named by $SPECTER_TELEMETRY; set it to "off" to disable). Each line is
+one JSON object with a timestamp, run id, script name and event type:
+
+    run     start (with argv) and end (with total seconds) of a script
+    span    a named stage - layout, effects, encode, fetch, upsert, ... -
+            with its duration, status and parent span
+    api     one external call: service, operation, latency, HTTP status,
+            bytes transferred
+    retry   a retried call: attempt, backoff delay, error
+    cache   a cache lookup: which cache, hit or miss
+
+so a slow run can be attributed to the API, decoding or encoding after the
+fact, e.g. `jq 'select(.type == "span")' scripts/.cache/telemetry/events.jsonl`.
+
+profile(stage) wraps a stage in pyinstrument (when installed) or cProfile
+and writes the report under scripts/.cache/profiles/; the scripts expose it
+as --profile. Both profilers only see the calling thread, so jobs handed to
+a thread pool are submitted as profiled(job): each call runs under its own
+cProfile.Profile, and the calls are merged into a separate
+<script>-<stage>-<time>-workers.prof report.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from pipeline.cache import CACHE_ROOT
+
+TELEMETRY_PATH = CACHE_ROOT / "telemetry" / "events.jsonl"
+PROFILES_DIR = CACHE_ROOT / "profiles"
+DISABLED = ("0", "off", "false", "no")
+
+RUN_ID = uuid.uuid4().hex[:12]
+
+_lock = threading.Lock()
+_local = threading.local()
+_run = {"script": None, "started": None}
+_workers = {"active": False, "stats": None}  # profiled() jobs of the current profile()
+_workers_lock = threading.Lock()
+
+
+def destination():
+    value = os.environ.get("SPECTER_TELEMETRY", "")
+    if value.lower() in DISABLED:
+        return None
+    return Path(value) if value else TELEMETRY_PATH
+
+
+def script_name() -> str:
+    return _run["script"] or (Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else "python")
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def emit(event_type: str, **fields):
+    """Append one event; never raises, so telemetry can't break a run."""
+    path = destination()
+    if path is None:
+        return
+    record = {"ts": round(time.time(), 3), "run": RUN_ID, "script": script_name(), "type": event_type}
+    stack = _stack()
+    if stack and "parent" not in fields:
+        record["span"] = stack[-1]
+    record.update({k: v for k, v in fields.items() if v is not None})
+    line = json.dumps(record, default=str) + "\n"
+    try:
+        with _lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a") as f:
+                f.write(line)
+    except OSError:
+        pass
+
+
+def start_run(script: str = None):
+    """Record the start of a script run and, at exit, its total duration."""
+    if _run["started"] is not None:
+        return
+    _run["script"] = script or script_name()
+    _run["started"] = time.perf_counter()
+    emit("run", event="start", argv=sys.argv[1:], pid=os.getpid())
+    atexit.register(lambda: emit("run", event="end", seconds=round(time.perf_counter() - _run["started"], 3)))
+
+
+def _error_fields(exc: Exception) -> dict:
+    from pipeline.ratelimit import status_of
+
+    return {"error": f"{type(exc).__name__}: {exc}"[:300], "http_status": status_of(exc)}
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a stage. The yielded dict can be filled with extra attributes."""
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    stack.append(name)
+    start = time.perf_counter()
+    fields = {"status": "ok"}
+    try:
+        yield attrs
+    except Exception as e:
+        fields = {"status": "error", **_error_fields(e)}
+        raise
+    finally:
+        stack.pop()
+        # A value the caller set (e.g. http_status) wins over the one derived from the error
+        emit("span", name=name, parent=parent, seconds=round(time.perf_counter() - start, 4),
+             **{**fields, **attrs})
+
+
+@contextmanager
+def api_call(service: str, operation: str, **attrs):
+    """Time one external API call; set attrs["bytes"] / attrs["http_status"] inside."""
+    start = time.perf_counter()
+    fields = {"status": "ok"}
+    try:
+        yield attrs
+    except Exception as e:
+        fields = {"status": "error", **_error_fields(e)}
+        raise
+    finally:
+        emit("api", service=service, operation=operation,
+             latency=round(time.perf_counter() - start, 4), **{**fields, **attrs})
+
+
+def cache(name: str, hit: bool, **attrs):
+    emit("cache", cache=name, result="hit" if hit else "miss", **attrs)
+
+
+def profiled(job):
+    """Wrap a worker-thread job so that an active profile() covers it.
+
+    Outside profile() the job is called as-is.
+    """
+    @functools.wraps(job)
+    def run(*args, **kwargs):
+        if not _workers["active"]:
+            return job(*args, **kwargs)
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return job(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with _workers_lock:
+                if _workers["stats"] is None:
+                    _workers["stats"] = pstats.Stats(profiler)
+                else:
+                    _workers["stats"].add(profiler)
+    return run
+
+
+@contextmanager
+def profile(stage: str, enabled: bool = True):
+    """Profile the enclosed block and write the report to PROFILES_DIR.
+
+    Jobs run through profiled() inside the block go to a second, merged
+    -workers.prof report.
+    """
+    if not enabled:
+        yield
+        return
+
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    base = PROFILES_DIR / f"{script_name()}-{stage}-{time.strftime('%Y%m%d-%H%M%S')}"
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        Profiler = None
+
+    _workers.update(active=True, stats=None)
+    try:
+        if Profiler:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                path = base.with_suffix(".html")
+                path.write_text(profiler.output_html())
+        else:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                path = base.with_suffix(".prof")
+                profiler.dump_stats(path)
+    finally:
+        with _workers_lock:
+            _workers["active"] = False
+            workers, _workers["stats"] = _workers["stats"], None
+
+    print(f"Profile written: {path}" + ("" if Profiler else "  (view with: python3 -m pstats or snakeviz)"))
+    emit("profile", stage=stage, path=str(path))
+    if workers is not None:
+        path = base.with_name(f"{base.name}-workers.prof")
+        workers.dump_stats(path)
+        print(f"Worker profile written: {path}  (view with: python3 -m pstats or snakeviz)")
+        emit("profile", stage=stage, path=str(path), threads="workers")
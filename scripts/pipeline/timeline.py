@@ -0,0 +1,261 @@
+"""
+Declarative audio timelines.
+
+A timeline file (JSON, or YAML when PyYAML is installed) describes a
+recording as a list of cues - voice clips or generated SFX - with gaps,
+per-cue effects and ambient beds:
+
+    {
+      "name": "blackwood-recording",
+      "clips_dir": "clips",
+      "max_duration_ms": 150000,
+      "outputs": ["../../public/audio/blackwood-recording.mp3"],
+      "peaks": "../../public/audio/blackwood-recording.peaks.json",
+      "hls": "../../public/audio/blackwood-recording",
+      "ladder": "../../public/audio/renditions",
+      "beds": [{"generator": "hum", "volume": -40}],
+      "cues": [
+        {"clip": "chen_01_intro.mp3", "gap_ms": 1500},
+        {"sfx": "static", "duration_ms": 300, "volume": -15, "advance_ms": 500},
+        {"clip": "elderly_whisper.mp3", "gain_db": -3,
+         "effects": [{"type": "reverb", "delay_ms": 80}], "gap_ms": 300}
+      ]
+    }
+
+Cues play back to back: each starts where the previous one advanced to
+(or at "at_ms"), and the playhead moves on by "advance_ms" if given,
+otherwise by the unprocessed source length plus "gap_ms". Generated cues
+take "duration_ms" and "volume", plus any generator-specific "params". Paths are
+relative to the timeline file. Effects and generators are looked up in the
+EFFECTS and GENERATORS registries below. "ladder" adds Opus/AAC/MP3
+renditions and a manifest for the player; "renditions" overrides the default
+rungs (see pipeline/ladder.py).
+
+When an AudioCache is passed, decoded clips and processed cues (source plus
+gain and effects) are cached on disk by content hash, so a re-render only
+reprocesses the cues whose parameters or source changed.
+"""
+
+import json
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+
+from pipeline.cache import AUDIO_CACHE_VERSION, cache_key
+from pipeline.effects import band_noise, convolution_reverb, pitch_shift, saturate
+from pipeline.mixer import (
+    CHANNELS,
+    SAMPLE_RATE,
+    Mix,
+    apply_gain,
+    decode_file,
+    echo_reverb,
+    fade_in,
+    fade_out,
+    length_ms,
+    low_pass,
+    normalize,
+    silence,
+)
+from pipeline.noise import HUM_VOLUME, HumNoise, WhiteNoise, noise
+
+AUDIO_DIR = Path(__file__).parent.parent / "audio"
+TIMELINE_GLOBS = ("*.timeline.json", "*.timeline.yaml", "*.timeline.yml")
+
+
+def static_burst(duration_ms=500, volume=-20, seed=0):
+    """Static/interference burst with short fades."""
+    burst = WhiteNoise(volume=volume, seed=seed).render(duration_ms)
+    return fade_out(fade_in(burst, 50), 50)
+
+
+def ambient_hum(duration_ms=1000, volume=HUM_VOLUME, cutoff_hz=200, seed=0, **params):
+    """Low-passed noise bed (see pipeline.noise.HumNoise)."""
+    return HumNoise(volume=volume, cutoff_hz=cutoff_hz, seed=seed, **params).render(duration_ms)
+
+
+GENERATORS = {
+    "static": static_burst,
+    "hum": ambient_hum,
+    "band_noise": band_noise,
+    "white": partial(noise, "white"),
+    "pink": partial(noise, "pink"),
+    "brown": partial(noise, "brown"),
+    "filtered": partial(noise, "filtered"),
+}
+
+# Each effect takes the cue audio plus its parameters and returns new audio.
+# "reverb" is the original three-tap echo ("decay" is accepted for
+# compatibility but ignored); "convolution_reverb" is a real room reverb.
+EFFECTS = {
+    "gain": lambda audio, db: apply_gain(audio, db),
+    "reverb": lambda audio, delay_ms=50, decay=None, taps=3: echo_reverb(audio, delay_ms, taps),
+    "convolution_reverb": convolution_reverb,
+    "pitch_shift": pitch_shift,
+    "saturate": saturate,
+    "fade_in": lambda audio, ms: fade_in(audio, ms),
+    "fade_out": lambda audio, ms: fade_out(audio, ms),
+    "low_pass": lambda audio, cutoff_hz: low_pass(audio, cutoff_hz),
+}
+
+
+@dataclass
+class Timeline:
+    name: str
+    path: Path
+    clips_dir: Path
+    cues: list
+    beds: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    max_duration_ms: int = None
+    bitrate: str = "192k"
+    normalize: bool = True
+    peaks: Path = None   # waveform peaks JSON for the player
+    hls: Path = None     # directory for segmented audio + index.m3u8
+    ladder: Path = None  # directory for the bitrate ladder + its manifest
+    renditions: list = None  # [{"codec", "bitrate", "label"?}], default ladder.DEFAULT_LADDER
+
+
+def load_timeline(path: Path) -> Timeline:
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                print("Error: PyYAML is required for YAML timelines.")
+                print("Run: pip install pyyaml")
+                exit(1)
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    base = path.parent
+    return Timeline(
+        name=data.get("name", path.name.split(".")[0]),
+        path=path,
+        clips_dir=base / data.get("clips_dir", "."),
+        cues=data["cues"],
+        beds=data.get("beds", []),
+        outputs=[base / output for output in data.get("outputs", [])],
+        max_duration_ms=data.get("max_duration_ms"),
+        bitrate=data.get("bitrate", "192k"),
+        normalize=data.get("normalize", True),
+        peaks=base / data["peaks"] if data.get("peaks") else None,
+        hls=base / data["hls"] if data.get("hls") else None,
+        ladder=base / data["ladder"] if data.get("ladder") else None,
+        renditions=data.get("renditions"),
+    )
+
+
+def find_timelines(directory: Path = AUDIO_DIR):
+    return sorted(path for pattern in TIMELINE_GLOBS for path in Path(directory).glob(pattern))
+
+
+class ClipLoader:
+    """Decodes each clip file once, shared across every timeline in a run.
+
+    With an AudioCache, decoded PCM also persists across runs.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._loaded = {}
+
+    def key(self, path: Path) -> str:
+        path = Path(path).resolve()
+        if not path.exists():
+            return cache_key(kind="missing", path=str(path))
+        if self.cache:
+            return self.cache.source_key(path, sample_rate=SAMPLE_RATE, channels=CHANNELS)
+        return cache_key(kind="file", path=str(path))
+
+    def load(self, path: Path):
+        path = Path(path).resolve()
+        if path not in self._loaded:
+            if not path.exists():
+                print(f"Warning: {path.name} not found")
+                self._loaded[path] = silence(1000)
+            elif self.cache:
+                self._loaded[path] = self.cache.get_or_build(self.key(path), lambda: decode_file(path))
+            else:
+                self._loaded[path] = decode_file(path)
+        return self._loaded[path]
+
+
+def apply_effects(audio, effects):
+    for effect in effects:
+        params = dict(effect)
+        audio = EFFECTS[params.pop("type")](audio, **params)
+    return audio
+
+
+def cue_source(cue: dict, timeline: Timeline, loader: ClipLoader):
+    """Unprocessed audio for a cue (decoded clip or generated SFX) and its cache key."""
+    if "clip" in cue:
+        path = timeline.clips_dir / cue["clip"]
+        return loader.load(path), loader.key(path)
+    params = {k: v for k, v in cue.items() if k in ("duration_ms", "volume")}
+    params.update(cue.get("params", {}))
+    key = cache_key(kind="sfx", version=AUDIO_CACHE_VERSION, generator=cue["sfx"], **params)
+    build = lambda: GENERATORS[cue["sfx"]](**params)  # noqa: E731
+    audio = loader.cache.get_or_build(key, build) if loader.cache else build()
+    return audio, key
+
+
+def layout(timeline: Timeline, loader: ClipLoader):
+    """Place every cue; returns ([(cue, source, source_key, start_ms), ...], end_ms)."""
+    placed = []
+    pos = 0
+    for cue in timeline.cues:
+        source, source_key = cue_source(cue, timeline, loader)
+        start = cue.get("at_ms", pos)
+        placed.append((cue, source, source_key, start))
+        if "advance_ms" in cue:
+            pos = start + cue["advance_ms"]
+        else:
+            pos = start + length_ms(source) + cue.get("gap_ms", 0)
+    return placed, pos
+
+
+def process_cue(cue: dict, source):
+    """Apply a cue's gain and effects to its source audio."""
+    audio = source
+    if cue.get("gain_db"):
+        audio = apply_gain(audio, cue["gain_db"])
+    return apply_effects(audio, cue.get("effects", []))
+
+
+def prepare_cue(cue: dict, source, source_key: str, cache=None):
+    """Processed cue audio, served from the cache when one is given."""
+    if cache and (cue.get("gain_db") or cue.get("effects")):
+        key = cache_key(kind="cue", version=AUDIO_CACHE_VERSION, source=source_key,
+                        gain_db=cue.get("gain_db", 0), effects=cue.get("effects", []))
+        return cache.get_or_build(key, lambda: process_cue(cue, source))
+    return process_cue(cue, source)
+
+
+def render_timeline(timeline: Timeline, loader: ClipLoader):
+    """Render a timeline to a float32 (samples, channels) array."""
+    placed, end = layout(timeline, loader)
+    if timeline.max_duration_ms is not None:
+        end = min(end, timeline.max_duration_ms)
+
+    mix = Mix(end)
+    for cue, source, source_key, start in placed:
+        mix.add(prepare_cue(cue, source, source_key, loader.cache), start)
+
+    for i, bed in enumerate(timeline.beds):
+        params = {k: v for k, v in bed.items() if k not in ("generator", "label")}
+        params.setdefault("seed", i)
+        build = lambda: GENERATORS[bed["generator"]](end, **params)  # noqa: E731
+        if loader.cache:
+            key = cache_key(kind="bed", version=AUDIO_CACHE_VERSION, generator=bed["generator"],
+                            duration_ms=end, **params)
+            mix.add(loader.cache.get_or_build(key, build), 0)
+        else:
+            mix.add(build(), 0)
+
+    audio = mix.render()
+    return normalize(audio) if timeline.normalize else audio
+
@@ -0,0 +1,250 @@
+"""
+ElevenLabs text-to-speech jobs with a content-addressed clip cache.
+
+A job is a dict with filename, voice (role name), stability, similarity and
+text. Clips are keyed by (text, voice_id, model_id, stability, similarity):
+outputs live in scripts/audio/clips/, blobs in scripts/.cache/tts/, and
+scripts/audio/clips/.manifest.json records which key (and voice_id) each
+clip was generated from.
+
+Clips are fetched through a pooled Downloader (pipeline/downloads.py) that
+POSTs to the REST endpoint directly, so a batch reuses a few keep-alive
+connections with timeouts instead of one SDK request each. The SDK client
+(make_client) is only used for listing voices.
+
+Audio is streamed into a temp file that must pass validate_asset() before
+it is renamed into the cache, and each job's progress goes to the "tts"
+job journal, so a killed batch leaves no half-written clip behind and the
+next run only regenerates what never finished.
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from pipeline import telemetry
+from pipeline.cache import (
+    CACHE_ROOT,
+    ContentCache,
+    InvalidAsset,
+    Manifest,
+    cache_key,
+    sweep_partials,
+)
+from pipeline.journal import JobJournal
+from pipeline.ratelimit import TokenBucket, with_retries
+
+CLIPS_DIR = Path(__file__).parent.parent / "audio" / "clips"
+MANIFEST_PATH = CLIPS_DIR / ".manifest.json"
+TTS_CACHE_DIR = CACHE_ROOT / "tts"
+
+API_BASE_URL = "https://api.elevenlabs.io"
+MODEL_ID = "eleven_multilingual_v2"
+OUTPUT_FORMAT = "mp3_44100_128"
+DEFAULT_CONCURRENCY = 3
+DEFAULT_RATE_PER_MINUTE = 60
+MAX_ATTEMPTS = 5
+
+_print_lock = threading.Lock()
+
+
+def log(message: str):
+    """Print from worker threads without interleaving lines."""
+    with _print_lock:
+        print(message, flush=True)
+
+
+def require_api_key() -> str:
+    api_key = os.environ.get("ELEVENLABS_API_KEY")
+    if not api_key:
+        print("=" * 60)
+        print("ELEVENLABS_API_KEY not set!")
+        print("")
+        print("Please run:")
+        print("  export ELEVENLABS_API_KEY='your-api-key-here'")
+        print("=" * 60)
+        sys.exit(1)
+    return api_key
+
+
+def make_client():
+    """Create the ElevenLabs client; the SDK is only imported when it's needed."""
+    api_key = require_api_key()
+    try:
+        from elevenlabs.client import ElevenLabs
+    except ImportError:
+        print("Error: elevenlabs package not installed.")
+        print("Run: pip install elevenlabs")
+        sys.exit(1)
+    return ElevenLabs(api_key=api_key, base_url=os.environ.get("ELEVENLABS_BASE_URL"))
+
+
+def make_downloader(pool_size: int = DEFAULT_CONCURRENCY):
+    """A pooled session authenticated for the TTS endpoint."""
+    api_key = require_api_key()
+    try:
+        import requests  # noqa: F401  (used by the Downloader)
+    except ImportError:
+        print("Error: requests package not installed.")
+        print("Run: pip install requests")
+        sys.exit(1)
+    from pipeline.downloads import Downloader
+
+    return Downloader(pool_size=max(1, pool_size), headers={"xi-api-key": api_key}, service="elevenlabs")
+
+
+def clip_key(job: dict, voice_id: str) -> str:
+    return cache_key(text=job["text"], voice_id=voice_id, model_id=MODEL_ID,
+                     stability=job["stability"], similarity=job["similarity"])
+
+
+def voice_for(job: dict, voices: dict, manifest: Manifest):
+    """Voice ID for a job: the one given for its role, else the one it was last generated with."""
+    if voices.get(job["voice"]):
+        return voices[job["voice"]]
+    entry = manifest.entries.get(job["filename"]) or {}
+    return entry.get("voice_id")
+
+
+def is_stale(job: dict, voices: dict, manifest: Manifest) -> bool:
+    voice_id = voice_for(job, voices, manifest)
+    if voice_id is None:
+        return not (CLIPS_DIR / job["filename"]).exists()
+    return not manifest.is_current(job["filename"], clip_key(job, voice_id), CLIPS_DIR / job["filename"])
+
+
+def synthesize(downloader, job: dict, voice_id: str, output_path: Path) -> Path:
+    """Generate one clip, streaming the audio chunks to output_path.
+
+    output_path is only replaced once the whole stream arrived and looks
+    like a valid MP3.
+    """
+    log(f"\nGenerating: {job['filename']}")
+    log(f"  Text: {job['text'][:50]}...")
+
+    base_url = (os.environ.get("ELEVENLABS_BASE_URL") or API_BASE_URL).rstrip("/")
+    downloader.fetch(
+        f"{base_url}/v1/text-to-speech/{voice_id}",
+        output_path,
+        method="POST",
+        operation="text_to_speech.convert",
+        attrs={"clip": job["filename"], "characters": len(job["text"])},
+        params={"output_format": OUTPUT_FORMAT},
+        json={
+            "text": job["text"],
+            "model_id": MODEL_ID,
+            "voice_settings": {
+                "stability": job["stability"],
+                "similarity_boost": job["similarity"],
+                "style": 0.0,
+                "use_speaker_boost": True,
+            },
+        },
+    )
+
+    log(f"  ✓ Saved: {job['filename']}")
+    return output_path
+
+
+def generate_batch(downloader_factory, jobs, voices: dict, concurrency: int = DEFAULT_CONCURRENCY,
+                   rate_per_minute: float = DEFAULT_RATE_PER_MINUTE, force: bool = False, adopt: bool = False):
+    """Generate clips whose cache key changed, in parallel.
+
+    downloader_factory(concurrency) is only called if something actually
+    needs generating.
+    Existing clips with no manifest entry are left alone (or recorded as-is
+    with adopt=True). Returns (generated, cached, failed) counts.
+    """
+    manifest = Manifest(MANIFEST_PATH)
+    cache = ContentCache(TTS_CACHE_DIR, suffix=".mp3")
+    journal = JobJournal("tts")
+    sweep_partials(TTS_CACHE_DIR)
+    sweep_partials(CLIPS_DIR)
+
+    pending = {}
+    cached = 0
+    failed = 0
+    for job in jobs:
+        voice_id = voice_for(job, voices, manifest)
+        output_path = CLIPS_DIR / job["filename"]
+        if voice_id is None:
+            log(f"  ✗ No voice ID for role {job['voice']!r} ({job['filename']})")
+            failed += 1
+            continue
+        key = clip_key(job, voice_id)
+        if not force and manifest.is_current(job["filename"], key, output_path):
+            telemetry.cache("tts", True, clip=job["filename"], source="output")
+            cached += 1
+        elif not force and output_path.exists() and manifest.key_for(job["filename"]) is None:
+            if not adopt:
+                log(f"Skipping untracked clip {job['filename']} (run with --adopt to track it)")
+                cached += 1
+                continue
+            try:
+                cache.store(key, output_path)
+            except InvalidAsset as e:
+                log(f"  ✗ Not adopting {e}")
+                failed += 1
+                continue
+            manifest.record(job["filename"], key, output_path, text=job["text"], voice_id=voice_id)
+            cached += 1
+        elif not force and cache.has(key):
+            telemetry.cache("tts", True, clip=job["filename"], source="cache")
+            cache.materialize(key, output_path)
+            manifest.record(job["filename"], key, output_path, text=job["text"], voice_id=voice_id)
+            cached += 1
+        else:
+            telemetry.cache("tts", False, clip=job["filename"])
+            pending.setdefault(key, []).append((job, voice_id))
+    manifest.save()
+
+    log(f"Unchanged/cached: {cached}, to generate: {len(pending)}")
+    resumed = journal.interrupted(pending)
+    if resumed:
+        log(f"Resuming {len(resumed)} clips interrupted in a previous run")
+    if not pending:
+        return 0, cached, failed
+
+    downloader = downloader_factory(concurrency)
+    bucket = TokenBucket.per_minute(rate_per_minute, burst=max(1, concurrency))
+    TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    def run(key, job, voice_id):
+        def attempt():
+            bucket.acquire()
+            synthesize(downloader, job, voice_id, cache.path(key))
+
+        def on_retry(attempt_no, error, delay):
+            log(f"  ↻ Retry {attempt_no} for {job['filename']} in {delay:.1f}s ({error})")
+
+        journal.record(key, "started", file=job["filename"])
+        try:
+            with_retries(attempt, attempts=MAX_ATTEMPTS, on_retry=on_retry)
+        except Exception as e:
+            journal.record(key, "failed", file=job["filename"], error=str(e)[:300])
+            raise
+        journal.done(key, cache.path(key), file=job["filename"])
+
+    generated = 0
+    run = telemetry.profiled(run)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(run, key, *entries[0]): key for key, entries in pending.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                log(f"  ✗ Failed: {pending[key][0][0]['filename']}: {e}")
+                failed += len(pending[key])
+                continue
+            for job, voice_id in pending[key]:
+                output = cache.materialize(key, CLIPS_DIR / job["filename"])
+                manifest.record(job["filename"], key, output, text=job["text"], voice_id=voice_id)
+                generated += 1
+            manifest.save()
+    journal.compact()
+    downloader.close()
+
+    return generated, cached, failed
@@ -0,0 +1,152 @@
+"""
+Responsive image variants for public/evidence.
+
+Each source PNG is resized to a few widths and encoded as WebP (and AVIF
+when the installed Pillow supports it), plus a tiny blurred WebP
+placeholder inlined as a data URI. Results are recorded in a manifest that
+update-evidence-images.py copies into evidence.metadata.
+
+Variants are written through atomic_write(), so a killed build never leaves
+a truncated file under its final name, and variants_exist() validates them
+rather than trusting their presence. prune_variants() removes files the
+manifest no longer lists (e.g. after WIDTHS or the formats change).
+"""
+
+import base64
+import io
+import json
+from pathlib import Path
+
+from pipeline.cache import atomic_write, is_valid_asset
+
+EVIDENCE_DIR = Path(__file__).parent.parent.parent / "public" / "evidence"
+VARIANTS_DIR = EVIDENCE_DIR / "variants"
+VARIANTS_MANIFEST = EVIDENCE_DIR / ".variants.json"
+BASE_URL = "/evidence"
+
+WIDTHS = (320, 640, 1024, 1600)
+QUALITY = {"webp": 80, "avif": 55}
+PLACEHOLDER_WIDTH = 16
+
+
+def require_pillow():
+    """Import Pillow on first use, so the manifest helpers work without it."""
+    try:
+        from PIL import Image, ImageFilter, features
+    except ImportError:
+        print("Error: Pillow not installed.")
+        print("Run: pip install Pillow")
+        exit(1)
+
+    try:
+        import pillow_avif  # noqa: F401  (registers the AVIF plugin on older Pillow)
+    except ImportError:
+        pass
+    return Image, ImageFilter, features
+
+
+def avif_supported() -> bool:
+    Image, _, features = require_pillow()
+    try:
+        return bool(features.check("avif"))
+    except ValueError:
+        return "AVIF" in Image.SAVE
+
+
+def output_formats():
+    return ("avif", "webp") if avif_supported() else ("webp",)
+
+
+def target_widths(source_width: int):
+    """Configured widths smaller than the source, plus the source width itself."""
+    widths = [w for w in WIDTHS if w < source_width]
+    widths.append(min(source_width, WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def placeholder_data_uri(image: "Image.Image") -> str:
+    Image, ImageFilter, _ = require_pillow()
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    tiny = image.resize((PLACEHOLDER_WIDTH, height), Image.LANCZOS)
+    tiny = tiny.filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    tiny.save(buffer, format="WEBP", quality=40)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def build_variants(source: str, source_hash: str, formats, output_dir: str = None) -> dict:
+    """Encode every width/format of one source image.
+
+    Runs inside a worker process, so it takes and returns plain data.
+    """
+    Image, _, _ = require_pillow()
+    source = Path(source)
+    output_dir = Path(output_dir) if output_dir else VARIANTS_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as opened:
+        image = opened.convert("RGBA" if opened.mode in ("RGBA", "LA", "P") else "RGB")
+
+    entry = {
+        "source_hash": source_hash,
+        "width": image.width,
+        "height": image.height,
+        "placeholder": placeholder_data_uri(image.convert("RGB")),
+        "sources": {fmt: [] for fmt in formats},
+    }
+
+    for width in target_widths(image.width):
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            name = f"{source.stem}-{width}.{fmt}"
+            path = output_dir / name
+            with atomic_write(path) as f:
+                resized.save(f, format=fmt.upper(), quality=QUALITY[fmt])
+            entry["sources"][fmt].append({
+                "url": f"{BASE_URL}/variants/{name}",
+                "width": width,
+                "height": height,
+                "bytes": path.stat().st_size,
+            })
+
+    return entry
+
+
+def variants_exist(entry: dict) -> bool:
+    for variants in entry.get("sources", {}).values():
+        for variant in variants:
+            if not is_valid_asset(VARIANTS_DIR / Path(variant["url"]).name):
+                return False
+    return True
+
+
+def prune_variants(images: dict, directory: Path = VARIANTS_DIR) -> list:
+    """Delete variant files no manifest entry lists; returns their names."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    listed = {Path(variant["url"]).name
+              for entry in images.values()
+              for variants in entry.get("sources", {}).values()
+              for variant in variants}
+    removed = []
+    for path in sorted(directory.iterdir()):
+        if path.is_file() and path.name not in listed:
+            path.unlink()
+            removed.append(path.name)
+    return removed
+
+
+def load_manifest(path: Path = VARIANTS_MANIFEST) -> dict:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f).get("images", {})
+
+
+def save_manifest(images: dict, path: Path = VARIANTS_MANIFEST):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"version": 1, "images": images}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    tmp.replace(path)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+SPECTER Audio Timeline Renderer
+Renders one or more declarative timeline files (see pipeline/timeline.py).
+
+Usage:
+    python3 scripts/render-audio.py scripts/audio/blackwood.timeline.json
+    python3 scripts/render-audio.py --all [--profile]
+
+--all renders every scripts/audio/*.timeline.json in one pass; clips used by
+several timelines are decoded only once. Decoded clips and processed cues
+are cached in scripts/.cache/audio/ so re-renders only redo changed cues;
+pass --no-cache to bypass it. --profile writes a profile of each mix
+(see pipeline/telemetry.py). Mixes are rendered and encoded in fixed-size
+blocks, so memory stays flat however long the recording is.
+
+Requirements:
+    pip install numpy scipy pydub  (and ffmpeg on PATH)
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from pipeline import telemetry
+from pipeline.audio_cache import AudioCache
+from pipeline.streaming import stream_timeline
+from pipeline.timeline import AUDIO_DIR, ClipLoader, find_timelines, load_timeline
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Render SPECTER audio timelines")
+    parser.add_argument("timelines", nargs="*", type=Path, help="timeline files to render")
+    parser.add_argument("--all", action="store_true", help=f"render every timeline in {AUDIO_DIR}")
+    parser.add_argument("--no-cache", action="store_true", help="decode and process every cue from scratch")
+    parser.add_argument("--profile", action="store_true", help="profile each mix")
+    args = parser.parse_args()
+    if not args.timelines and not args.all:
+        parser.error("give one or more timeline files, or --all")
+    return args
+
+
+def main():
+    args = parse_args()
+    telemetry.start_run()
+    paths = find_timelines() if args.all else args.timelines
+
+    print("=" * 60)
+    print("SPECTER Audio Timeline Renderer")
+    print("=" * 60)
+    print(f"Timelines: {len(paths)}")
+
+    cache = None if args.no_cache else AudioCache()
+    loader = ClipLoader(cache)
+    rendered = 0
+    for path in paths:
+        timeline = load_timeline(path)
+        print(f"\n[{timeline.name}] {len(timeline.cues)} cues")
+        started = time.perf_counter()
+        with telemetry.profile(f"mix-{timeline.name}", args.profile):
+            outputs, duration_ms = stream_timeline(timeline, loader)
+        for output in outputs:
+            print(f"  ✓ {output}")
+        print(f"  Duration: {duration_ms / 1000:.1f}s, rendered in {time.perf_counter() - started:.1f}s")
+        if cache:
+            print(f"  Cache: {cache.stats()}")
+        rendered += 1
+
+    print("\n" + "=" * 60)
+    print("RENDER COMPLETE")
+    print("=" * 60)
+    print(f"Rendered: {rendered}")
+
+
+if __name__ == "__main__":
+    main()
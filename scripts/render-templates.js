@@ -5,7 +5,10 @@
  *
  * Usage:
  *   npm install puppeteer
- *   node scripts/render-templates.js
+ *   node scripts/render-templates.js [case]   # e.g. 0002 or blackwood
+ *
+ * Which template renders which evidence image comes from the asset
+ * registry (scripts/evidence-registry.json).
  */
 
 const puppeteer = require('puppeteer');
@@ -15,27 +18,27 @@ const fs = require('fs');
 const TEMPLATES_DIR = path.join(__dirname, 'templates');
 const OUTPUT_DIR = path.join(__dirname, '..', 'public', 'evidence');
 
-// Map template files to output filenames
-const TEMPLATE_MAP = {
-  'police-report.html': 'hartwell-police-report.png',
-  'property-records.html': 'hartwell-property-records.png',
-  'emma-drawing.html': 'hartwell-emma-drawing.png',
-  'thermal-imaging.html': 'hartwell-thermal.png',
-  'missing-person.html': 'hartwell-missing-person.png',
-  'cia-memo.html': 'blackwood-cia-memo.png',
-  'newspaper-1923.html': 'millbrook-newspaper-1923.png',
-  'threshold-charter.html': 'millbrook-threshold-charter.png',
-  // Add more mappings as templates are created
-  'audio-waveform.html': 'blackwood-waveform.png',
-  'sanitarium.html': 'blackwood-sanitarium.png',
-  'chen-id.html': 'blackwood-chen-id.png',
-  'coordinates-map.html': 'blackwood-coordinates-map.png',
-  'hypnotherapy-notes.html': 'blackwood-hypnotherapy-notes.png',
-  'timeline.html': 'millbrook-timeline.png',
-  'carver-notes.html': 'millbrook-carver-notes.png',
-  'ward-journal.html': 'millbrook-ward-journal.png',
-  'case-file-1973.html': 'millbrook-1973-case-file.png',
-};
+const REGISTRY_PATH = path.join(__dirname, 'evidence-registry.json');
+
+// Map template files to output filenames, optionally for one case
+function loadTemplateMap(caseFilter) {
+  const registry = JSON.parse(fs.readFileSync(REGISTRY_PATH, 'utf8'));
+  const cases = registry.cases.filter((c) =>
+    !caseFilter || c.case_number === caseFilter || c.name.toLowerCase() === caseFilter.toLowerCase());
+  if (cases.length === 0) {
+    const known = registry.cases.map((c) => `${c.case_number} (${c.name.toLowerCase()})`).join(', ');
+    throw new Error(`Unknown case ${caseFilter}; known: ${known}`);
+  }
+  const map = {};
+  for (const c of cases) {
+    for (const evidence of c.evidence) {
+      if (evidence.template) {
+        map[evidence.template] = evidence.outputs.image;
+      }
+    }
+  }
+  return map;
+}
 
 async function renderTemplate(browser, templateFile, outputFile) {
   const templatePath = path.join(TEMPLATES_DIR, templateFile);
@@ -91,11 +94,17 @@ async function renderTemplate(browser, templateFile, outputFile) {
 }
 
 async function main() {
+  const caseFilter = process.argv[2];
+  const TEMPLATE_MAP = loadTemplateMap(caseFilter);
+
   console.log('='.repeat(60));
   console.log('SPECTER Evidence Image Renderer');
   console.log('='.repeat(60));
   console.log(`Templates: ${TEMPLATES_DIR}`);
   console.log(`Output: ${OUTPUT_DIR}`);
+  if (caseFilter) {
+    console.log(`Case: ${caseFilter}`);
+  }
   console.log('');
 
   // Ensure output directory exists
@@ -105,7 +114,8 @@ async function main() {
 
   // Get list of available templates
   const availableTemplates = fs.readdirSync(TEMPLATES_DIR)
-    .filter(f => f.endsWith('.html'));
+    .filter(f => f.endsWith('.html'))
+    .filter(f => !caseFilter || TEMPLATE_MAP[f]);
 
   console.log(`Found ${availableTemplates.length} templates\n`);
 
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+SPECTER asset pipeline CLI
+One entry point for the asset scripts.
+
+Usage:
+    python3 scripts/specter.py status           # per-stage summary of what is stale
+    python3 scripts/specter.py plan             # what a full build would do (API calls, cost)
+    python3 scripts/specter.py diff             # which prompts and voice lines changed
+    python3 scripts/specter.py <step> [ARGS...] # run a step, e.g. `images --yes`
+
+Steps:
+    images    generate-evidence-images.py
+    variants  build-image-variants.py
+    sync      update-evidence-images.py
+    tts       generate-audio.py
+    audio     audio-pipeline.py
+    render    render-audio.py
+    assets    index-assets.py
+
+status, plan and diff only read manifests and hash local files; they import
+no SDKs, need no credentials and work offline. Steps are run in-process, so
+the heavy imports (openai, elevenlabs, numpy, Pillow, supabase) happen only
+once a step actually needs them.
+"""
+
+import difflib
+import json
+import os
+import runpy
+import sys
+from pathlib import Path
+
+from pipeline.assets import AssetIndex
+from pipeline.cache import ContentCache, Manifest, file_hash
+from pipeline.images import IMAGE_CACHE_DIR, IMAGE_QUALITY, OUTPUT_DIR, plan, selected_key
+from pipeline.images import MANIFEST_PATH as IMAGE_MANIFEST
+from pipeline.registry import load_registry
+from pipeline.script_parser import find_scripts, parse_script, timeline_path
+from pipeline.tts import CLIPS_DIR, clip_key, is_stale, voice_for
+from pipeline.tts import MANIFEST_PATH as CLIP_MANIFEST
+from pipeline.variants import load_manifest, variants_exist
+
+SCRIPTS_DIR = Path(__file__).parent
+
+STEPS = {
+    "images": "generate-evidence-images.py",
+    "variants": "build-image-variants.py",
+    "sync": "update-evidence-images.py",
+    "tts": "generate-audio.py",
+    "audio": "audio-pipeline.py",
+    "render": "render-audio.py",
+    "assets": "index-assets.py",
+}
+
+# DALL-E 3 pricing per image
+IMAGE_COST = 0.080 if IMAGE_QUALITY == "hd" else 0.040
+
+
+def env_voices():
+    return {
+        key[len("ELEVENLABS_VOICE_"):].lower(): value
+        for key, value in os.environ.items() if key.startswith("ELEVENLABS_VOICE_")
+    }
+
+
+def image_plan():
+    return plan(Manifest(IMAGE_MANIFEST), ContentCache(IMAGE_CACHE_DIR, suffix=".png"))
+
+
+def stale_variants():
+    manifest = load_manifest()
+    stale = []
+    for source in sorted(OUTPUT_DIR.glob("*.png")):
+        entry = manifest.get(source.name)
+        if not entry or entry["source_hash"] != file_hash(source) or not variants_exist(entry):
+            stale.append(source.name)
+    return stale
+
+
+def stale_clips(parsed, voices):
+    manifest = Manifest(CLIP_MANIFEST)
+    return [job for job in parsed.jobs if is_stale(job, voices, manifest)]
+
+
+def compiled_text(parsed) -> str:
+    document = {"_generated_from": parsed.path.name, **parsed.timeline}
+    return json.dumps(document, indent=2, ensure_ascii=False) + "\n"
+
+
+def audio_graph_status(script_paths, voices):
+    """Dry-run the audio build graph from audio-pipeline.py."""
+    module = runpy.run_path(str(SCRIPTS_DIR / STEPS["audio"]), run_name="audio_pipeline")
+    args = type("Args", (), {"concurrency": 1, "rate": 1.0})()
+    graph = module["build_graph"](script_paths, voices, args)
+    return graph.run(dry_run=True)
+
+
+def cmd_status():
+    current, from_cache, untracked, jobs = image_plan()
+    print(f"images    {len(current)} current, {len(from_cache)} in cache, {len(untracked)} untracked, "
+          f"{sum(len(v) for v in jobs.values())} to generate")
+    print(f"variants  {len(stale_variants())} sources need variants")
+
+    voices = env_voices()
+    scripts = find_scripts()
+    for script_path in scripts:
+        parsed = parse_script(script_path)
+        stale = stale_clips(parsed, voices)
+        print(f"tts       {parsed.name}: {len(parsed.jobs) - len(stale)} current, {len(stale)} stale")
+    for name, result in audio_graph_status(scripts, voices).items():
+        print(f"audio     {name}: {result}")
+
+    index = AssetIndex().scan()
+    print(f"assets    {len(index.files)} files, {len(index.invalid())} invalid, "
+          f"{len(index.duplicates())} duplicate groups")
+
+
+def cmd_plan():
+    current, from_cache, untracked, jobs = image_plan()
+    print("images:")
+    if not jobs and not from_cache:
+        print("  nothing to do")
+    for img in from_cache:
+        print(f"  restore  {img.filename} (from cache)")
+    for imgs in jobs.values():
+        print(f"  generate {', '.join(img.filename for img in imgs)}")
+    if jobs:
+        print(f"  → {len(jobs)} API calls, estimated ${len(jobs) * IMAGE_COST:.2f}")
+
+    stale = stale_variants()
+    print("variants:")
+    print(f"  build {len(stale)} sources" if stale else "  nothing to do")
+
+    voices = env_voices()
+    scripts = find_scripts()
+    print("tts:")
+    for script_path in scripts:
+        parsed = parse_script(script_path)
+        manifest = Manifest(CLIP_MANIFEST)
+        stale = stale_clips(parsed, voices)
+        for job in stale:
+            voice_id = voice_for(job, voices, manifest)
+            note = "" if voice_id else f" (needs a voice ID for role {job['voice']!r})"
+            print(f"  generate {job['filename']}{note}")
+        characters = sum(len(job["text"]) for job in stale)
+        print(f"  → {parsed.name}: {len(stale)} API calls, {characters} characters" if stale
+              else f"  {parsed.name}: nothing to do")
+
+    print("audio:")
+    for name, result in audio_graph_status(scripts, voices).items():
+        if result != "fresh":
+            print(f"  run      {name}")
+
+
+def cmd_diff():
+    manifest = Manifest(IMAGE_MANIFEST)
+    print("images:")
+    changed = False
+    for img in load_registry().evidence:
+        if not img.prompt:
+            continue
+        recorded = manifest.key_for(img.filename)
+        output_path = OUTPUT_DIR / img.filename
+        if recorded is None:
+            reason = "untracked" if output_path.exists() else "new"
+        elif recorded != selected_key(img, manifest):
+            reason = "prompt or settings changed"
+        elif not output_path.exists():
+            reason = "file missing"
+        else:
+            continue
+        changed = True
+        print(f"  {img.filename}: {reason}")
+    if not changed:
+        print("  no changes")
+
+    voices = env_voices()
+    clips = Manifest(CLIP_MANIFEST)
+    for script_path in find_scripts():
+        parsed = parse_script(script_path)
+        print(f"tts ({parsed.path.name}):")
+        changed = False
+        for job in parsed.jobs:
+            entry = clips.entries.get(job["filename"])
+            voice_id = voice_for(job, voices, clips)
+            if entry is None:
+                if (CLIPS_DIR / job["filename"]).exists():
+                    continue  # untracked clip; generate-audio.py --adopt records it
+                print(f"  + {job['filename']}: {job['text']}")
+            elif voice_id and entry["key"] != clip_key(job, voice_id):
+                if entry.get("text") != job["text"]:
+                    print(f"  ~ {job['filename']}:")
+                    print(f"      - {entry.get('text')}")
+                    print(f"      + {job['text']}")
+                else:
+                    print(f"  ~ {job['filename']}: voice settings changed")
+            else:
+                continue
+            changed = True
+        if not changed:
+            print("  no changes")
+
+        compiled = timeline_path(parsed)
+        old = compiled.read_text().splitlines(keepends=True) if compiled.exists() else []
+        delta = list(difflib.unified_diff(old, compiled_text(parsed).splitlines(keepends=True),
+                                          str(compiled.name), f"{compiled.name} (from script)"))
+        print(f"timeline ({compiled.name}):")
+        print("".join("  " + line for line in delta).rstrip() if delta else "  no changes")
+
+
+COMMANDS = {
+    "status": cmd_status,
+    "plan": cmd_plan,
+    "diff": cmd_diff,
+}
+
+
+def usage():
+    print(__doc__.strip())
+    sys.exit(2)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        usage()
+    command, rest = sys.argv[1], sys.argv[2:]
+    if command in COMMANDS:
+        COMMANDS[command]()
+    elif command in STEPS:
+        script = SCRIPTS_DIR / STEPS[command]
+        sys.argv = [str(script)] + rest
+        runpy.run_path(str(script), run_name="__main__")
+    else:
+        print(f"Unknown command: {command}\n")
+        usage()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,66 +4,105 @@ SPECTER Evidence Image Database Updater
 Updates the Supabase database with image URLs for evidence items.
 
 Usage:
-    python3 scripts/update-evidence-images.py
-
-This script maps the generated images to their corresponding evidence records
-and updates the image_url field in the database.
+    python3 scripts/update-evidence-images.py [--dry-run] [--case CASE]
+
+This script maps the generated images to their corresponding evidence records,
+keyed by (case_number, evidence_number) as listed in the asset registry
+(scripts/evidence-registry.json), and updates the image_url field in
+the database. If build-image-variants.py has been run, the responsive variants
+and blur placeholder for each image are stored under metadata.image as well.
+
+The full diff is computed locally and written with one bulk upsert per case;
+--dry-run prints the diff without writing. Image, variant and audio URLs
+are stored with a ?v=<content hash> suffix from the asset index
+(pipeline/assets.py), so vercel.json can serve them as immutable and a
+regenerated file gets a new URL. --base-url (or setting
+NEXT_PUBLIC_SUPABASE_URL, which wins over .env.local) points it at a local
+PostgREST-compatible stand-in such as scripts/fake-services.py.
 """
 
+import argparse
+import json
 import os
 from pathlib import Path
 
-try:
-    from supabase import create_client, Client
-except ImportError:
-    print("Error: supabase package not installed.")
-    print("Run: pip install supabase")
-    exit(1)
+from pipeline import telemetry
+from pipeline.assets import AssetIndex
+from pipeline.evidence_sync import EVIDENCE_COLUMNS, SyncPlan, compute_plan, load_env_local
+from pipeline.registry import RegistryError, load_registry
 
 # Configuration
 EVIDENCE_DIR = Path(__file__).parent.parent / "public" / "evidence"
 BASE_URL = "/evidence"  # Relative URL for Next.js public folder
-
-# Mapping of evidence titles to image filenames
-EVIDENCE_IMAGE_MAP = {
-    # Case #1: The Hartwell Incident
-    "Initial Police Report": "hartwell-police-report.png",
-    "Property Records": "hartwell-property-records.png",
-    "Interview: Emma Hartwell (Age 7)": "hartwell-emma-drawing.png",
-    "Thermal Imaging Analysis": "hartwell-thermal.png",
-    "Missing Person Report (2013)": "hartwell-missing-person.png",
-
-    # Case #2: The Blackwood Recording
-    "Audio Recording - Full Transcript": "blackwood-waveform.png",
-    "Blackwood Sanitarium - Historical Records": "blackwood-sanitarium.png",
-    "Marcus Chen - Background Check": "blackwood-chen-id.png",
-    "Coordinates Analysis": "blackwood-coordinates-map.png",
-    "Declassified CIA Memo (Partial)": "blackwood-cia-memo.png",
-    "Chen Hypnotherapy Session Notes": "blackwood-hypnotherapy-notes.png",
-
-    # Case #3: The Millbrook Disappearances
-    "Victim List & Timeline": "millbrook-timeline.png",
-    "1923 Newspaper Archive": "millbrook-newspaper-1923.png",
-    "Richard Carver's Research Notes": "millbrook-carver-notes.png",
-    "Elizabeth Ward's Journal": "millbrook-ward-journal.png",
-    "Chief Thorn's 1973 Case File": "millbrook-1973-case-file.png",
-    "Threshold Society Charter (1823)": "millbrook-threshold-charter.png",
-}
+VARIANTS_MANIFEST = EVIDENCE_DIR / ".variants.json"
+
+
+def load_variants():
+    """Read the variants manifest written by build-image-variants.py, if any."""
+    if not VARIANTS_MANIFEST.exists():
+        return {}
+    with open(VARIANTS_MANIFEST) as f:
+        return json.load(f).get("images", {})
+
+
+def image_metadata(entry: dict, url_for) -> dict:
+    """The subset of a variants manifest entry the frontend needs."""
+    return {
+        "width": entry["width"],
+        "height": entry["height"],
+        "placeholder": entry["placeholder"],
+        "sources": {
+            fmt: [{"url": url_for(v["url"]), "width": v["width"]} for v in variants]
+            for fmt, variants in entry["sources"].items()
+        },
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sync evidence image URLs and metadata to Supabase")
+    parser.add_argument("--dry-run", action="store_true", help="print the diff without writing anything")
+    parser.add_argument("--case", help="only sync this case (number or name, e.g. 0002 or blackwood)")
+    parser.add_argument("--base-url", help="Supabase-compatible URL, e.g. fake-services.py "
+                                           "(default: NEXT_PUBLIC_SUPABASE_URL)")
+    return parser.parse_args()
+
+
+def print_plan(plan: SyncPlan):
+    """Diff report, grouped by case."""
+    for case_number, changes in plan.by_case().items():
+        print(f"[Case {case_number}]")
+        for change in changes:
+            print(f"  ~ {change.evidence_number} {change.title}")
+            for name in ("image_url", "audio_url"):
+                if name in change.changes:
+                    print(f"      {name}: {change.record.get(name)} → {change.changes[name]}")
+            if "metadata" in change.changes:
+                before = change.record.get("metadata") or {}
+                keys = sorted(k for k, v in change.changes["metadata"].items() if before.get(k) != v)
+                print(f"      metadata: {', '.join(keys)}")
+    for case_number, number, filename in plan.missing:
+        print(f"✗ Image not found: {filename} (for: {case_number}/{number})")
+    for case_number, number, title in plan.unmapped:
+        print(f"⚠ No image mapping for: {case_number}/{number} {title}")
 
 
 def main():
-    # Load environment variables from .env.local
-    env_file = Path(__file__).parent.parent / ".env.local"
-    if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key] = value
+    args = parse_args()
+    telemetry.start_run()
+
+    registry = load_registry()
+    try:
+        image_map = registry.image_map(args.case)
+    except RegistryError as e:
+        print(f"Error: {e}")
+        exit(1)
+    case_numbers = {case_number for case_number, _ in image_map}
+
+    # Load environment variables from .env.local (already set ones, e.g. from fake-services.py, win)
+    load_env_local()
 
     # Get Supabase credentials
-    supabase_url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    supabase_url = args.base_url or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
     supabase_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
 
     if not supabase_url or not supabase_key:
@@ -71,13 +110,21 @@ def main():
         print("Make sure .env.local contains NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY")
         exit(1)
 
-    # Initialize Supabase client
-    supabase: Client = create_client(supabase_url, supabase_key)
+    # Initialize Supabase client (imported here so --help works without it)
+    try:
+        from supabase import create_client
+    except ImportError:
+        print("Error: supabase package not installed.")
+        print("Run: pip install supabase")
+        exit(1)
+    supabase = create_client(supabase_url, supabase_key)
 
     print("=" * 60)
     print("SPECTER Evidence Image Database Updater")
     print("=" * 60)
     print(f"Evidence directory: {EVIDENCE_DIR}")
+    if args.dry_run:
+        print("Mode: dry run (no changes will be written)")
     print()
 
     # Check which images exist
@@ -85,60 +132,68 @@ def main():
     if EVIDENCE_DIR.exists():
         existing_images = {f.name for f in EVIDENCE_DIR.glob("*.png")}
 
+    variants = load_variants()
+    with telemetry.span("index"):
+        index = AssetIndex().scan()
+        if not args.dry_run:
+            index.write_versions()
+
     print(f"Found {len(existing_images)} images in evidence folder")
+    print(f"Found {len(variants)} images with responsive variants")
     print()
 
-    # Fetch all evidence from database
-    response = supabase.table("evidence").select("id, title, image_url").execute()
-    evidence_records = response.data
+    # Fetch cases and all evidence in two requests
+    with telemetry.api_call("supabase", "select cases"):
+        cases = supabase.table("cases").select("id, case_number").execute().data
+    with telemetry.api_call("supabase", "select evidence") as call:
+        evidence_records = supabase.table("evidence").select(EVIDENCE_COLUMNS).execute().data
+        call["rows"] = len(evidence_records)
+
+    if args.case:
+        cases = [case for case in cases if case["case_number"] in case_numbers]
+        case_ids = {case["id"] for case in cases}
+        evidence_records = [record for record in evidence_records if record["case_id"] in case_ids]
 
-    print(f"Found {len(evidence_records)} evidence records in database")
+    print(f"Found {len(evidence_records)} evidence records in {len(cases)} cases")
     print()
 
-    # Update records
+    def desired_metadata(filename):
+        if filename in variants:
+            return {"image": image_metadata(variants[filename], index.versioned)}
+        return {}
+
+    with telemetry.span("plan"):
+        plan = compute_plan(cases, evidence_records, image_map, existing_images,
+                            desired_metadata, BASE_URL, url_for=index.versioned)
+    print_plan(plan)
+
+    # Apply one bulk upsert per case
     updated = 0
-    skipped = 0
-    missing = 0
-
-    for record in evidence_records:
-        title = record["title"]
-        current_url = record["image_url"]
-
-        if title not in EVIDENCE_IMAGE_MAP:
-            print(f"⚠ No image mapping for: {title}")
-            continue
-
-        filename = EVIDENCE_IMAGE_MAP[title]
-        new_url = f"{BASE_URL}/{filename}"
-
-        # Check if image file exists
-        if filename not in existing_images:
-            print(f"✗ Image not found: {filename} (for: {title})")
-            missing += 1
-            continue
-
-        # Check if already has correct URL
-        if current_url == new_url:
-            skipped += 1
-            continue
-
-        # Update the record
-        try:
-            supabase.table("evidence").update({"image_url": new_url}).eq("id", record["id"]).execute()
-            print(f"✓ Updated: {title}")
-            print(f"  → {new_url}")
-            updated += 1
-        except Exception as e:
-            print(f"✗ Failed to update {title}: {e}")
+    failed = 0
+    if not args.dry_run:
+        for case_number, changes in plan.by_case().items():
+            try:
+                with telemetry.api_call("supabase", "upsert evidence", case=case_number, rows=len(changes)):
+                    supabase.table("evidence").upsert([c.row() for c in changes], on_conflict="id").execute()
+                print(f"✓ Case {case_number}: updated {len(changes)} records")
+                updated += len(changes)
+            except Exception as e:
+                print(f"✗ Case {case_number}: failed to update {len(changes)} records: {e}")
+                failed += len(changes)
 
     # Summary
     print()
     print("=" * 60)
-    print("UPDATE COMPLETE")
+    print("DRY RUN COMPLETE" if args.dry_run else "UPDATE COMPLETE")
     print("=" * 60)
-    print(f"Updated: {updated}")
-    print(f"Skipped (already set): {skipped}")
-    print(f"Missing images: {missing}")
+    if args.dry_run:
+        print(f"Would update: {len(plan.changes)}")
+    else:
+        print(f"Updated: {updated}")
+        print(f"Failed: {failed}")
+    print(f"Skipped (already set): {plan.unchanged}")
+    print(f"Missing images: {len(plan.missing)}")
+    print(f"Unmapped records: {len(plan.unmapped)}")
 
     if updated > 0:
         print("\nNext steps:")